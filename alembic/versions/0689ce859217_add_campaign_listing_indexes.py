@@ -0,0 +1,58 @@
+"""add campaign listing indexes
+
+Revision ID: 0689ce859217
+Revises: 920c53b2e861
+Create Date: 2026-10-19 18:41:07.902311
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0689ce859217"
+down_revision: Union[str, None] = "920c53b2e861"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination of the super admin listing, newest first
+    op.create_index("ix_campaigns_created_at_id", "campaigns", ["created_at", "id"])
+
+    # Admin listing: DEFAULT campaigns plus their own CUSTOM ones
+    op.create_index(
+        "ix_campaigns_type_created_at_id",
+        "campaigns",
+        ["campaign_type", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_campaigns_created_by_type_created_at_id",
+        "campaigns",
+        ["created_by", "campaign_type", "created_at", "id"],
+    )
+
+    op.create_index(
+        "ix_campaigns_status_created_at_id",
+        "campaigns",
+        ["status", "created_at", "id"],
+    )
+
+    # Name prefix filter (LIKE 'prefix%')
+    op.create_index(
+        "ix_campaigns_name_pattern",
+        "campaigns",
+        ["name"],
+        postgresql_ops={"name": "varchar_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_campaigns_name_pattern", table_name="campaigns")
+    op.drop_index("ix_campaigns_status_created_at_id", table_name="campaigns")
+    op.drop_index("ix_campaigns_created_by_type_created_at_id", table_name="campaigns")
+    op.drop_index("ix_campaigns_type_created_at_id", table_name="campaigns")
+    op.drop_index("ix_campaigns_created_at_id", table_name="campaigns")
@@ -0,0 +1,39 @@
+"""add campaign history timeline index
+
+Revision ID: 136e6ebd450f
+Revises: ce8ceae74a2d
+Create Date: 2026-10-19 19:52:13.406217
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "136e6ebd450f"
+down_revision: Union[str, None] = "ce8ceae74a2d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination of a campaign's history, newest first. Covers the
+    # lookups of the single-column index it replaces.
+    op.create_index(
+        "ix_campaign_history_campaign_id_created_at_id",
+        "campaign_history",
+        ["campaign_id", "created_at", "id"],
+    )
+    op.drop_index("ix_campaign_history_campaign_id", table_name="campaign_history")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_campaign_history_campaign_id", "campaign_history", ["campaign_id"]
+    )
+    op.drop_index(
+        "ix_campaign_history_campaign_id_created_at_id", table_name="campaign_history"
+    )
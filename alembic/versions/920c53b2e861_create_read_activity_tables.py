@@ -0,0 +1,46 @@
+"""create read activity tables
+
+Revision ID: 920c53b2e861
+Revises: cdd7bd2d9376
+Create Date: 2026-10-19 18:02:13.547120
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "920c53b2e861"
+down_revision: Union[str, None] = "cdd7bd2d9376"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "campaign_read_activity",
+        sa.Column("campaign_id", sa.BigInteger(), nullable=False),
+        sa.Column("granularity", sa.String(10), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("reads", sa.BigInteger(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("campaign_id", "granularity", "bucket_start"),
+        sa.ForeignKeyConstraint(["campaign_id"], ["campaigns.id"], ondelete="CASCADE"),
+    )
+
+    op.create_table(
+        "practice_read_activity",
+        sa.Column("practice_id", sa.BigInteger(), nullable=False),
+        sa.Column("granularity", sa.String(10), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("reads", sa.BigInteger(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("practice_id", "granularity", "bucket_start"),
+        sa.ForeignKeyConstraint(["practice_id"], ["practices.id"], ondelete="CASCADE"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("practice_read_activity")
+    op.drop_table("campaign_read_activity")
@@ -0,0 +1,45 @@
+"""add practice members index
+
+Revision ID: 9985edbcca31
+Revises: f5b813b52e38
+Create Date: 2026-10-19 22:08:26.604713
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9985edbcca31"
+down_revision: Union[str, None] = "f5b813b52e38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination of a practice's members by user id. Covers the
+    # lookups of the single-column index it replaces.
+    op.create_index(
+        "ix_practice_user_assignments_practice_id_user_id",
+        "practice_user_assignments",
+        ["practice_id", "user_id"],
+    )
+    op.drop_index(
+        "ix_practice_user_assignments_practice_id",
+        table_name="practice_user_assignments",
+    )
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_practice_user_assignments_practice_id",
+        "practice_user_assignments",
+        ["practice_id"],
+    )
+    op.drop_index(
+        "ix_practice_user_assignments_practice_id_user_id",
+        table_name="practice_user_assignments",
+    )
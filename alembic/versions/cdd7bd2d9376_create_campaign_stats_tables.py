@@ -0,0 +1,54 @@
+"""create campaign stats tables
+
+Revision ID: cdd7bd2d9376
+Revises: 9dcea3fc5fb6
+Create Date: 2026-10-19 17:20:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "cdd7bd2d9376"
+down_revision: Union[str, None] = "9dcea3fc5fb6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "campaign_stats",
+        sa.Column("campaign_id", sa.BigInteger(), nullable=False),
+        sa.Column("delivered_count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("read_count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("deleted_count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("last_delivered_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("reconciled_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.PrimaryKeyConstraint("campaign_id"),
+        sa.ForeignKeyConstraint(["campaign_id"], ["campaigns.id"], ondelete="CASCADE"),
+    )
+
+    op.create_table(
+        "campaign_read_latency",
+        sa.Column("campaign_id", sa.BigInteger(), nullable=False),
+        sa.Column("bucket", sa.Integer(), nullable=False),
+        sa.Column("reads", sa.BigInteger(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("campaign_id", "bucket"),
+        sa.ForeignKeyConstraint(["campaign_id"], ["campaigns.id"], ondelete="CASCADE"),
+    )
+
+    # Used by the nightly reconciliation to aggregate messages per campaign
+    op.create_index("ix_user_messages_campaign_id", "user_messages", ["campaign_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_messages_campaign_id", table_name="user_messages")
+    op.drop_table("campaign_read_latency")
+    op.drop_table("campaign_stats")
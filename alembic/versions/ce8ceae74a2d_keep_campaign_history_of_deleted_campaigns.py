@@ -0,0 +1,40 @@
+"""keep campaign history of deleted campaigns
+
+Revision ID: ce8ceae74a2d
+Revises: 0689ce859217
+Create Date: 2026-10-19 19:26:48.114903
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "ce8ceae74a2d"
+down_revision: Union[str, None] = "0689ce859217"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The cascade removed the DELETED entry together with the campaign
+    op.drop_constraint(
+        "campaign_history_campaign_id_fkey", "campaign_history", type_="foreignkey"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "DELETE FROM campaign_history WHERE campaign_id NOT IN (SELECT id FROM campaigns)"
+    )
+    op.create_foreign_key(
+        "campaign_history_campaign_id_fkey",
+        "campaign_history",
+        "campaigns",
+        ["campaign_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
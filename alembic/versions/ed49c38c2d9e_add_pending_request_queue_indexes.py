@@ -0,0 +1,64 @@
+"""add pending request queue indexes
+
+Revision ID: ed49c38c2d9e
+Revises: 136e6ebd450f
+Create Date: 2026-10-19 21:04:37.518290
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "ed49c38c2d9e"
+down_revision: Union[str, None] = "136e6ebd450f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination of a practice admin's queue, oldest first
+    op.create_index(
+        "ix_user_registration_requests_status_role_practice_created_at_id",
+        "user_registration_requests",
+        ["status", "requested_role", "desired_practice_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_role_change_requests_status_role_practice_requested_at_id",
+        "role_change_requests",
+        ["status", "requested_role", "practice_id", "requested_at", "id"],
+    )
+
+    # Super admin queue, across practices
+    op.create_index(
+        "ix_user_registration_requests_status_role_created_at_id",
+        "user_registration_requests",
+        ["status", "requested_role", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_role_change_requests_status_role_requested_at_id",
+        "role_change_requests",
+        ["status", "requested_role", "requested_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_role_change_requests_status_role_requested_at_id",
+        table_name="role_change_requests",
+    )
+    op.drop_index(
+        "ix_user_registration_requests_status_role_created_at_id",
+        table_name="user_registration_requests",
+    )
+    op.drop_index(
+        "ix_role_change_requests_status_role_practice_requested_at_id",
+        table_name="role_change_requests",
+    )
+    op.drop_index(
+        "ix_user_registration_requests_status_role_practice_created_at_id",
+        table_name="user_registration_requests",
+    )
@@ -0,0 +1,33 @@
+"""add users session expiry index
+
+Revision ID: f5b813b52e38
+Revises: ed49c38c2d9e
+Create Date: 2026-10-19 21:41:52.170384
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f5b813b52e38"
+down_revision: Union[str, None] = "ed49c38c2d9e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Range scans of the session sweeper; logged out users are left out
+    op.create_index(
+        "ix_users_session_expires_at",
+        "users",
+        ["session_expires_at"],
+        postgresql_where=sa.text("session_expires_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_session_expires_at", table_name="users")
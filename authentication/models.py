@@ -4,9 +4,9 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from django.utils import timezone
-import bcrypt
 from datetime import timedelta
 from .mixins import AuthenticationMixin
+from .passwords import check_password, hash_password, needs_rehash
 
 Base = declarative_base()
 
@@ -36,14 +36,19 @@ class User(Base, AuthenticationMixin):
         "Campaign", back_populates="creator", foreign_keys="[Campaign.created_by]"
     )
 
+    # Practice ids of the user's assignments, carried by the request
+    # principal (see authentication.principal); None when not loaded
+    assigned_practice_ids = None
+
     def set_password(self, raw_password):
-        hashed = bcrypt.hashpw(raw_password.encode("utf-8"), bcrypt.gensalt())
-        self.password = hashed.decode("utf-8")
+        self.password = hash_password(raw_password)
 
     def check_password(self, raw_password):
-        return bcrypt.checkpw(
-            raw_password.encode("utf-8"), self.password.encode("utf-8")
-        )
+        return check_password(raw_password, self.password)
+
+    def password_needs_rehash(self):
+        """Check if the password hash uses an outdated work factor"""
+        return needs_rehash(self.password)
 
     def update_session_expiry(self):
         """Update session expiry time to 24 hours from now"""
@@ -63,7 +68,9 @@ class UserRegistrationRequest(Base):
 
     id = Column(BigInteger, primary_key=True)
     user_id = Column(BigInteger, ForeignKey("users.id"), nullable=False)
-    desired_practice_id = Column(BigInteger, ForeignKey("practices.id"), nullable=False)
+    desired_practice_id = Column(
+        BigInteger, ForeignKey("practices.id", ondelete="CASCADE"), nullable=False
+    )
     requested_role = Column(String(50), nullable=False)
     status = Column(String(20), default="PENDING")  # PENDING, APPROVED, REJECTED
     reviewed_by = Column(BigInteger, ForeignKey("users.id"), nullable=True)
@@ -85,7 +92,7 @@ class RoleChangeRequest(Base):
 
     id = Column(BigInteger, primary_key=True)
     user_id = Column(BigInteger, ForeignKey("users.id"))
-    practice_id = Column(BigInteger, ForeignKey("practices.id"))
+    practice_id = Column(BigInteger, ForeignKey("practices.id", ondelete="CASCADE"))
     current_role = Column(String(50), nullable=False)
     requested_role = Column(String(50), nullable=False)
     status = Column(String(20), default="PENDING")  # PENDING, APPROVED, REJECTED
@@ -0,0 +1,84 @@
+# authentication/passwords.py
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+import bcrypt
+from django.conf import settings
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def bcrypt_rounds() -> int:
+    """Work factor of new password hashes"""
+    return int(settings.BCRYPT_ROUNDS)
+
+
+def hashing_workers() -> int:
+    """Threads verifying passwords, the configured count or the available cores"""
+    configured = getattr(settings, "PASSWORD_HASHING_WORKERS", None)
+    if configured not in (None, ""):
+        return int(configured)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # bcrypt releases the GIL, so hashes run in parallel on separate cores;
+    # the pool bounds how many run at once however many requests log in
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=hashing_workers(), thread_name_prefix="bcrypt"
+                )
+    return _executor
+
+
+def hash_password(raw_password: str) -> str:
+    hashed = bcrypt.hashpw(
+        raw_password.encode("utf-8"), bcrypt.gensalt(rounds=bcrypt_rounds())
+    )
+    return hashed.decode("utf-8")
+
+
+def check_password(raw_password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(raw_password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+def needs_rehash(hashed: str) -> bool:
+    """Whether a hash ($2b$<rounds>$...) uses another work factor than configured"""
+    try:
+        return int(hashed.split("$")[2]) != bcrypt_rounds()
+    except (IndexError, ValueError):
+        return True
+
+
+def submit_check_password(raw_password: str, hashed: str) -> Future:
+    """Verify a password on the bounded hashing pool"""
+    return _get_executor().submit(check_password, raw_password, hashed)
+
+
+def verify_password(raw_password: str, hashed: str) -> bool:
+    """Verify a password on the hashing pool, blocking until it is done"""
+    return submit_check_password(raw_password, hashed).result()
+
+
+def submit_hash_password(raw_password: str) -> Future:
+    """Hash a password on the bounded hashing pool"""
+    return _get_executor().submit(hash_password, raw_password)
+
+
+async def ahash_password(raw_password: str) -> str:
+    """Hash a password on the hashing pool without blocking the event loop"""
+    return await asyncio.wrap_future(submit_hash_password(raw_password))
+
+
+async def averify_password(raw_password: str, hashed: str) -> bool:
+    """Verify a password on the hashing pool without blocking the event loop"""
+    return await asyncio.wrap_future(submit_check_password(raw_password, hashed))
@@ -0,0 +1,138 @@
+# authentication/principal.py
+from datetime import timedelta
+from typing import Iterable, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from sqlalchemy.orm import Session
+from .models import User
+from practices.models import PracticeUserAssignment
+from utils.db_session import get_db_session
+
+
+PRINCIPAL_TTL = 60  # seconds
+
+# Columns of the cached snapshot; never the password hash
+PRINCIPAL_FIELDS = (
+    "id",
+    "username",
+    "full_name",
+    "email",
+    "role",
+    "is_approved",
+    "is_active",
+    "last_login",
+    "session_expires_at",
+    "created_at",
+    "updated_at",
+    "assigned_practice_ids",
+)
+
+_MISSING = object()
+
+
+def _principal_key(user_id: int) -> str:
+    return f"principal:{user_id}"
+
+
+def load_principal(user_id: int) -> Optional[User]:
+    """
+    Snapshot of a user for authentication, from the cache or from one query.
+
+    The returned User is transient: it is not attached to a session and
+    carries only PRINCIPAL_FIELDS, including the practices the user is
+    assigned to.
+    """
+    fields = cache.get(_principal_key(user_id))
+    if fields is None:
+        with get_db_session() as session:
+            rows = (
+                session.query(User, PracticeUserAssignment.practice_id)
+                .outerjoin(
+                    PracticeUserAssignment, PracticeUserAssignment.user_id == User.id
+                )
+                .filter(User.id == user_id)
+                .order_by(PracticeUserAssignment.id)
+                .all()
+            )
+            if not rows:
+                return None
+            user = rows[0][0]
+            user.assigned_practice_ids = [
+                practice_id for _, practice_id in rows if practice_id is not None
+            ]
+            fields = _snapshot(user)
+        cache.set(_principal_key(user_id), fields, PRINCIPAL_TTL)
+    return User(**fields)
+
+
+def resolve_principal(request) -> Optional[User]:
+    """
+    The user of the request's session, resolved once per request and shared
+    by the middleware and DRF authentication.
+    """
+    # DRF wraps the Django request; memoise on the underlying one
+    request = getattr(request, "_request", request)
+    principal = getattr(request, "_principal", _MISSING)
+    if principal is _MISSING:
+        user_id = request.session.get("user_id")
+        principal = load_principal(user_id) if user_id else None
+        request._principal = principal
+    return principal
+
+
+def extend_session(user: User) -> None:
+    """
+    Slide the user's session expiry to SESSION_COOKIE_AGE from now. The row
+    is only written when that moves the expiry by more than
+    SESSION_REFRESH_THRESHOLD, so most requests leave the database alone.
+    """
+    expires_at = timezone.now() + timedelta(seconds=settings.SESSION_COOKIE_AGE)
+    threshold = timedelta(seconds=settings.SESSION_REFRESH_THRESHOLD)
+    if not user.session_expires_at or expires_at - user.session_expires_at < threshold:
+        return
+
+    with get_db_session() as session:
+        # A session ended meanwhile by logout stays ended
+        session.query(User).filter(
+            User.id == user.id, User.session_expires_at.isnot(None)
+        ).update({User.session_expires_at: expires_at}, synchronize_session=False)
+        session.commit()
+    user.session_expires_at = expires_at
+    cache.set(_principal_key(user.id), _snapshot(user), PRINCIPAL_TTL)
+
+
+def assigned_practice_id(db_session: Session, user: User) -> Optional[int]:
+    """
+    The practice a user is assigned to, their first assignment. Taken from
+    the principal when it carries its assignments, so resolving it for the
+    request's own user costs no query.
+    """
+    if user.assigned_practice_ids is not None:
+        return user.assigned_practice_ids[0] if user.assigned_practice_ids else None
+    return (
+        db_session.query(PracticeUserAssignment.practice_id)
+        .filter(PracticeUserAssignment.user_id == user.id)
+        .order_by(PracticeUserAssignment.id)
+        .limit(1)
+        .scalar()
+    )
+
+
+def invalidate_principal(user_id: int) -> None:
+    """
+    Drop the cached snapshot of a user. Call after committing a change to
+    a cached column, such as the role, approval, activation or session
+    expiry, after a password change, or after the user's practice
+    assignments change.
+    """
+    cache.delete(_principal_key(user_id))
+
+
+def invalidate_principals(user_ids: Iterable[int]) -> None:
+    """Drop the cached snapshots of several users at once"""
+    cache.delete_many([_principal_key(user_id) for user_id in user_ids])
+
+
+def _snapshot(user: User) -> dict:
+    return {name: getattr(user, name) for name in PRINCIPAL_FIELDS}
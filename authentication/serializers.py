@@ -1,12 +1,13 @@
 from rest_framework import serializers
 from .models import User, UserRoles, UserRegistrationRequest, RoleChangeRequest
-from utils.db_session import get_db_session
 from django.utils import timezone
-from practices.models import Practice
 from practices.serializers import PracticeSerializer
+from utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 
 class SignupSerializer(serializers.Serializer):
+    # Whether the username, email and practice are available is checked in
+    # one query by UserRegistrationRequestService.register
     username = serializers.CharField(max_length=255)
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
@@ -30,28 +31,6 @@ class SignupSerializer(serializers.Serializer):
 
         return converted_role
 
-    def validate_username(self, value):
-        with get_db_session() as session:
-            user = session.query(User).filter(User.username == value).first()
-            if user:
-                raise serializers.ValidationError("Username already exists")
-        return value
-
-    def validate_email(self, value):
-        with get_db_session() as session:
-            user = session.query(User).filter(User.email == value).first()
-            if user:
-                raise serializers.ValidationError("Email already exists")
-        return value
-
-    def validate_desired_practice_id(self, value):
-        if value:
-            with get_db_session() as session:
-                practice = session.query(Practice).filter(Practice.id == value).first()
-                if not practice:
-                    raise serializers.ValidationError("Practice not found")
-        return value
-
     def validate_role(self, value):
         if value not in [UserRoles.ADMIN, UserRoles.PRACTICE_USER]:
             raise serializers.ValidationError("Invalid role")
@@ -126,3 +105,35 @@ class RoleChangeRequestSerializer(serializers.Serializer):
     rejection_reason = serializers.CharField(read_only=True, allow_null=True)
     user = UserSerializer(read_only=True)
     practice = PracticeSerializer(read_only=True)
+
+
+class PendingRequestQuerySerializer(serializers.Serializer):
+    """
+    Pagination parameters of the pending request queues, one cursor per
+    queue and a page size shared by both
+    """
+
+    registration_cursor = serializers.CharField(required=False)
+    role_change_cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(
+        required=False, min_value=1, max_value=MAX_PAGE_SIZE, default=DEFAULT_PAGE_SIZE
+    )
+
+
+class BulkRequestApprovalSerializer(serializers.Serializer):
+    """
+    Validates the requests of a bulk approval
+    """
+
+    request_type = serializers.ChoiceField(choices=["registration", "role_change"])
+    request_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=1000
+    )
+
+
+class BulkRequestRejectionSerializer(BulkRequestApprovalSerializer):
+    """
+    Validates the requests and reason of a bulk rejection
+    """
+
+    reason = serializers.CharField(max_length=500)
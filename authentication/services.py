@@ -1,17 +1,94 @@
 # authentication/services.py
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import exists, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 from .models import User, UserRoles, UserRegistrationRequest, RoleChangeRequest
+from .principal import (
+    assigned_practice_id,
+    invalidate_principal,
+    invalidate_principals,
+)
 from practices.models import PracticeUserAssignment, Practice
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import (
+    AuthenticationFailed,
+    PermissionDenied,
+    ValidationError,
+)
+from utils.eager_loading import eager_load_options
+from utils.pagination import DEFAULT_PAGE_SIZE, paginate_keyset
 from typing import Union
 
 
+# Constraints a concurrent signup can violate, by the field they guard
+SIGNUP_CONSTRAINTS = {
+    "uq_users_username": "username",
+    "uq_users_email": "email",
+    "fk_registration_request_practice": "desired_practice_id",
+}
+
+
 class UserRegistrationRequestService:
     def __init__(self, db_session: Session):
         self.db = db_session
 
+    def register(
+        self, user: User, practice_id: int, requested_role: str
+    ) -> UserRegistrationRequest:
+        """
+        Sign a user up: one query checks the username, email and practice
+        together, then the user and their registration request are written
+        in one transaction. A concurrent signup with the same username or
+        email that passes the check is caught by the unique constraints.
+        """
+        username_taken, email_taken, practice_active = self.db.execute(
+            select(
+                exists().where(User.username == user.username),
+                exists().where(User.email == user.email),
+                exists().where(Practice.id == practice_id, Practice.is_active == True),
+            )
+        ).one()
+        errors = self._signup_errors(
+            username_taken, email_taken, not practice_active
+        )
+        if errors:
+            raise ValidationError(errors)
+
+        request = UserRegistrationRequest(
+            user=user,
+            desired_practice_id=practice_id,
+            requested_role=requested_role,
+            status="PENDING",
+        )
+        try:
+            self.db.add(request)
+            self.db.commit()
+            return request
+        except IntegrityError as e:
+            self.db.rollback()
+            # The message quotes the conflicting value, so only the name of
+            # the violated constraint tells which field it guards
+            diag = getattr(e.orig, "diag", None)
+            field = SIGNUP_CONSTRAINTS.get(getattr(diag, "constraint_name", None))
+            errors = self._signup_errors(
+                field == "username", field == "email", field == "desired_practice_id"
+            )
+            raise ValidationError(errors or f"Failed to sign up: {str(e.orig)}")
+
+    def _signup_errors(
+        self, username_taken: bool, email_taken: bool, practice_missing: bool
+    ) -> Dict[str, List[str]]:
+        errors = {}
+        if username_taken:
+            errors["username"] = ["Username already exists"]
+        if email_taken:
+            errors["email"] = ["Email already exists"]
+        if practice_missing:
+            errors["desired_practice_id"] = ["Practice not found or inactive"]
+        return errors
+
     def create_request(
         self, user_id: int, practice_id: int, requested_role: str
     ) -> UserRegistrationRequest:
@@ -39,66 +116,94 @@ class UserRegistrationRequestService:
             self.db.rollback()
             raise ValidationError(f"Failed to create request: {str(e)}")
 
-    def get_admin_pending_requests(self, admin_practice_id: int) -> dict:
-        """Get all pending requests for a specific practice admin"""
+    def get_admin_pending_requests(
+        self,
+        admin_practice_id: int,
+        params: Optional[Dict[str, Any]] = None,
+        load: Iterable[str] = (),
+    ) -> dict:
+        """One page of each pending practice user queue of a practice admin"""
         try:
-            # Get practice users registration requests
-            registration_requests = (
-                self.db.query(UserRegistrationRequest)
-                .filter(
-                    UserRegistrationRequest.desired_practice_id == admin_practice_id,
+            return self._pending_queues(
+                [
                     UserRegistrationRequest.status == "PENDING",
                     UserRegistrationRequest.requested_role == UserRoles.PRACTICE_USER,
-                )
-                .all()
-            )
-
-            # Get role change requests within the practice
-            role_changes = (
-                self.db.query(RoleChangeRequest)
-                .filter(
-                    RoleChangeRequest.practice_id == admin_practice_id,
+                    UserRegistrationRequest.desired_practice_id == admin_practice_id,
+                ],
+                [
                     RoleChangeRequest.status == "PENDING",
                     RoleChangeRequest.requested_role == UserRoles.PRACTICE_USER,
-                )
-                .all()
+                    RoleChangeRequest.practice_id == admin_practice_id,
+                ],
+                params or {},
+                load,
             )
-
-            return {
-                "registration_requests": registration_requests,
-                "role_change_requests": role_changes,
-            }
+        except ValidationError:
+            raise
         except Exception as e:
             raise ValidationError(f"Failed to fetch admin requests: {str(e)}")
 
-    def get_super_admin_pending_requests(self) -> dict:
-        """Get all pending admin role requests for super admin"""
+    def get_super_admin_pending_requests(
+        self, params: Optional[Dict[str, Any]] = None, load: Iterable[str] = ()
+    ) -> dict:
+        """One page of each pending admin role queue for super admin"""
         try:
-            registration_requests = (
-                self.db.query(UserRegistrationRequest)
-                .filter(
+            return self._pending_queues(
+                [
                     UserRegistrationRequest.status == "PENDING",
                     UserRegistrationRequest.requested_role == UserRoles.ADMIN,
-                )
-                .all()
-            )
-
-            role_changes = (
-                self.db.query(RoleChangeRequest)
-                .filter(
+                ],
+                [
                     RoleChangeRequest.status == "PENDING",
                     RoleChangeRequest.requested_role == UserRoles.ADMIN,
-                )
-                .all()
+                ],
+                params or {},
+                load,
             )
-
-            return {
-                "registration_requests": registration_requests,
-                "role_change_requests": role_changes,
-            }
+        except ValidationError:
+            raise
         except Exception as e:
             raise ValidationError(f"Failed to fetch super admin requests: {str(e)}")
 
+    def _pending_queues(
+        self,
+        registration_filters: List[Any],
+        role_change_filters: List[Any],
+        params: Dict[str, Any],
+        load: Iterable[str],
+    ) -> dict:
+        """
+        Both queues oldest first, each paginated by its own cursor along the
+        (status, requested_role[, practice], date, id) indexes. The
+        relationships in `load` are fetched with the page, not per row.
+        """
+        limit = params.get("limit") or DEFAULT_PAGE_SIZE
+        registration_requests, registration_cursor = paginate_keyset(
+            self.db.query(UserRegistrationRequest)
+            .filter(*registration_filters)
+            .options(*eager_load_options(UserRegistrationRequest, load)),
+            [
+                (UserRegistrationRequest.created_at, False),
+                (UserRegistrationRequest.id, False),
+            ],
+            cursor=params.get("registration_cursor"),
+            limit=limit,
+        )
+        role_changes, role_change_cursor = paginate_keyset(
+            self.db.query(RoleChangeRequest)
+            .filter(*role_change_filters)
+            .options(*eager_load_options(RoleChangeRequest, load)),
+            [(RoleChangeRequest.requested_at, False), (RoleChangeRequest.id, False)],
+            cursor=params.get("role_change_cursor"),
+            limit=limit,
+        )
+        return {
+            "registration_requests": registration_requests,
+            "registration_next_cursor": registration_cursor,
+            "role_change_requests": role_changes,
+            "role_change_next_cursor": role_change_cursor,
+        }
+
     def create_role_change_request(
         self, user_id: int, practice_id: int, requested_role: str
     ) -> RoleChangeRequest:
@@ -184,6 +289,7 @@ class UserRegistrationRequestService:
 
             self.db.add(assignment)
             self.db.commit()
+            invalidate_principal(user_id)
             self.db.refresh(assignment)
             return assignment
         except Exception as e:
@@ -230,6 +336,7 @@ class UserRegistrationRequestService:
             request.reviewed_at = func.now()
 
             self.db.commit()
+            invalidate_principal(request.user_id)
             self.db.refresh(request)
             return request
         except Exception as e:
@@ -258,3 +365,171 @@ class UserRegistrationRequestService:
         except Exception as e:
             self.db.rollback()
             raise ValidationError(f"Failed to reject request: {str(e)}")
+
+    def approve_requests(
+        self, request_type: str, request_ids: List[int], reviewer: User
+    ) -> List[Union[UserRegistrationRequest, RoleChangeRequest]]:
+        """
+        Approve several pending requests in one transaction. Users are
+        updated with one UPDATE per requested role, new practice assignments
+        with one multi-row INSERT and the requests with one UPDATE. Nothing
+        is approved unless every request may be.
+        """
+        model = self._request_model(request_type)
+        requests = self._reviewable_requests(model, request_ids, reviewer)
+        user_ids = {request.user_id for request in requests}
+        try:
+            user_ids_by_role: Dict[str, List[int]] = {}
+            for request in requests:
+                user_ids_by_role.setdefault(request.requested_role, []).append(
+                    request.user_id
+                )
+            for role, role_user_ids in user_ids_by_role.items():
+                values = {"role": role}
+                if model is UserRegistrationRequest:
+                    values["is_approved"] = True
+                self.db.execute(
+                    update(User).where(User.id.in_(role_user_ids)).values(**values)
+                )
+
+            if model is UserRegistrationRequest:
+                wanted = {
+                    (request.user_id, request.desired_practice_id)
+                    for request in requests
+                }
+                existing = set(
+                    self.db.query(
+                        PracticeUserAssignment.user_id,
+                        PracticeUserAssignment.practice_id,
+                    ).filter(
+                        PracticeUserAssignment.user_id.in_(
+                            {user_id for user_id, _ in wanted}
+                        )
+                    )
+                )
+                assignments = [
+                    {"user_id": user_id, "practice_id": practice_id}
+                    for user_id, practice_id in sorted(wanted - existing)
+                ]
+                if assignments:
+                    self.db.execute(insert(PracticeUserAssignment), assignments)
+
+            self.db.execute(
+                update(model)
+                .where(model.id.in_([request.id for request in requests]))
+                .values(status="APPROVED", reviewed_by=reviewer.id)
+            )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise ValidationError(f"Failed to approve requests: {str(e)}")
+
+        invalidate_principals(user_ids)
+        return requests
+
+    def reject_requests(
+        self, request_type: str, request_ids: List[int], reviewer: User, reason: str
+    ) -> List[Union[UserRegistrationRequest, RoleChangeRequest]]:
+        """Reject several pending requests with one UPDATE"""
+        model = self._request_model(request_type)
+        requests = self._reviewable_requests(model, request_ids, reviewer)
+        try:
+            self.db.execute(
+                update(model)
+                .where(model.id.in_([request.id for request in requests]))
+                .values(
+                    status="REJECTED", reviewed_by=reviewer.id, rejection_reason=reason
+                )
+            )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise ValidationError(f"Failed to reject requests: {str(e)}")
+        return requests
+
+    def _request_model(self, request_type: str):
+        if request_type == "registration":
+            return UserRegistrationRequest
+        if request_type == "role_change":
+            return RoleChangeRequest
+        raise ValidationError(f"Invalid request type: {request_type}")
+
+    def _reviewable_requests(
+        self, model, request_ids: List[int], reviewer: User
+    ) -> List[Union[UserRegistrationRequest, RoleChangeRequest]]:
+        """
+        Load the requests with one query and check them all: admins may
+        only review practice user requests of their own practice, and only
+        pending requests can be reviewed.
+        """
+        request_ids = list(dict.fromkeys(request_ids))
+        if reviewer.role == UserRoles.SUPER_ADMIN:
+            scope = []
+        elif reviewer.role == UserRoles.ADMIN:
+            practice_id = assigned_practice_id(self.db, reviewer)
+            if not practice_id:
+                raise ValidationError("Admin not assigned to any practice")
+            practice_column = (
+                model.desired_practice_id
+                if model is UserRegistrationRequest
+                else model.practice_id
+            )
+            scope = [
+                practice_column == practice_id,
+                model.requested_role == UserRoles.PRACTICE_USER,
+            ]
+        else:
+            raise PermissionDenied("Insufficient permissions")
+
+        requests = (
+            self.db.query(model)
+            .options(*eager_load_options(model, ("user", "practice")))
+            .filter(model.id.in_(request_ids), *scope)
+            .order_by(model.id)
+            .all()
+        )
+        found = {request.id for request in requests}
+        missing = [request_id for request_id in request_ids if request_id not in found]
+        if missing:
+            raise ValidationError(
+                "Requests not found: " + ", ".join(str(pk) for pk in missing)
+            )
+        reviewed = [request.id for request in requests if request.status != "PENDING"]
+        if reviewed:
+            raise ValidationError(
+                "Requests already reviewed: " + ", ".join(str(pk) for pk in reviewed)
+            )
+        return requests
+
+
+class LoginService:
+    """
+    Checks a user's standing and starts their session. Password checks are
+    left to the caller, which runs them and any rehash on the bcrypt pool.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def get_user(self, username: str) -> Optional[User]:
+        return self.db.query(User).filter(User.username == username).first()
+
+    def check_standing(self, user: User) -> None:
+        if not user.is_active:
+            raise AuthenticationFailed("Account is disabled")
+        if not user.is_approved:
+            raise AuthenticationFailed("Account is pending approval")
+
+    def complete_login(self, user: User, new_hash: Optional[str] = None) -> User:
+        """
+        Record the login, storing new_hash when the caller rehashed the
+        verified password because its cost changed
+        """
+        user = self.db.merge(user)
+        if new_hash is not None:
+            user.password = new_hash
+        user.last_login = datetime.utcnow()
+        user.update_session_expiry()
+        self.db.commit()
+        invalidate_principal(user.id)
+        return user
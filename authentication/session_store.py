@@ -0,0 +1,31 @@
+# authentication/session_store.py
+import time
+from django.conf import settings
+from django.contrib.sessions.backends.cache import SessionStore as CacheSessionStore
+
+
+REFRESHED_AT_KEY = "_refreshed_at"
+
+
+class SessionStore(CacheSessionStore):
+    """
+    Sessions kept in the shared Redis cache, without any database table.
+    Settings fall back to the cached_db backend when no Redis is configured.
+
+    SESSION_SAVE_EVERY_REQUEST slides the expiry on every request; here an
+    unchanged session is only written back once it was last written more
+    than SESSION_REFRESH_THRESHOLD seconds ago. The cached entry can
+    therefore lapse up to that long before the session cookie does.
+    """
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        if not must_create and not self.modified and not self._refresh_due():
+            return
+        self._get_session(no_load=must_create)[REFRESHED_AT_KEY] = int(time.time())
+        super().save(must_create)
+
+    def _refresh_due(self) -> bool:
+        refreshed_at = self.get(REFRESHED_AT_KEY, 0)
+        return time.time() - refreshed_at >= settings.SESSION_REFRESH_THRESHOLD
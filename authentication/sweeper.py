@@ -0,0 +1,104 @@
+# authentication/sweeper.py
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy import column, delete, select, table, update
+from sqlalchemy.orm import Session
+from .models import User
+from .principal import invalidate_principals
+
+
+SWEEP_BATCH_SIZE = 1000
+# Bound on the batches of one run; what is left is swept by the next run
+SWEEP_MAX_BATCHES = 100
+
+# Sessions now live in the cache, but django_session still holds the rows
+# of the database backend and is not mapped by SQLAlchemy
+django_session = table(
+    "django_session", column("session_key"), column("expire_date")
+)
+
+
+class SessionSweepService:
+    """
+    Removes expired sessions and clears expired User.session_expires_at.
+
+    Work is done in batches, each its own short transaction: a batch picks
+    the oldest expired rows along the expiry index, skipping rows other
+    transactions hold, and deletes or updates them by key. No lock is held
+    across batches, so requests never wait on a sweep for long.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def sweep(
+        self,
+        now: datetime,
+        batch_size: int = SWEEP_BATCH_SIZE,
+        max_batches: int = SWEEP_MAX_BATCHES,
+    ) -> Dict[str, int]:
+        """Returns the rows removed or cleared by this run"""
+        sessions_deleted, session_batches = self._in_batches(
+            lambda: self._delete_expired_sessions(now, batch_size),
+            batch_size,
+            max_batches,
+        )
+        expiries_cleared, expiry_batches = self._in_batches(
+            lambda: self._clear_expired_users(now, batch_size),
+            batch_size,
+            max_batches,
+        )
+        return {
+            "sessions_deleted": sessions_deleted,
+            "expiries_cleared": expiries_cleared,
+            "batches": session_batches + expiry_batches,
+        }
+
+    def _in_batches(self, batch, batch_size: int, max_batches: int):
+        total = 0
+        for batches in range(1, max_batches + 1):
+            try:
+                count = batch()
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            total += count
+            if count < batch_size:
+                return total, batches
+        return total, max_batches
+
+    def _delete_expired_sessions(self, now: datetime, batch_size: int) -> int:
+        expired = (
+            select(django_session.c.session_key)
+            .where(django_session.c.expire_date < now)
+            .order_by(django_session.c.expire_date)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = self.db.execute(
+            delete(django_session).where(
+                django_session.c.session_key.in_(expired.scalar_subquery())
+            )
+        )
+        return result.rowcount
+
+    def _clear_expired_users(self, now: datetime, batch_size: int) -> int:
+        expired = (
+            select(User.id)
+            .where(User.session_expires_at < now)
+            .order_by(User.session_expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        user_ids: List[int] = list(
+            self.db.execute(
+                update(User)
+                .where(User.id.in_(expired.scalar_subquery()))
+                .values(session_expires_at=None)
+                .returning(User.id)
+                .execution_options(synchronize_session=False)
+            ).scalars()
+        )
+        invalidate_principals(user_ids)
+        return len(user_ids)
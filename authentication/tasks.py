@@ -0,0 +1,20 @@
+from core.celery import app
+from datetime import datetime, timezone
+from utils.db_session import get_db_session
+from .sweeper import SessionSweepService
+
+
+@app.task
+def sweep_expired_sessions():
+    """Delete expired sessions and clear expired user session expiries"""
+    with get_db_session() as session:
+        try:
+            swept = SessionSweepService(session).sweep(datetime.now(timezone.utc))
+            print(
+                f"Swept {swept['sessions_deleted']} expired sessions and cleared "
+                f"{swept['expiries_cleared']} session expiries "
+                f"in {swept['batches']} batches"
+            )
+            return swept
+        except Exception as e:
+            print(f"Error sweeping expired sessions: {str(e)}")
@@ -1,10 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AuthViewSet
+from .views import AuthViewSet, login
 
 router = DefaultRouter()
 router.register(r"", AuthViewSet, basename="auth")
 
 urlpatterns = [
+    # Async view, outside the router so it is not wrapped in a sync APIView
+    path("login/", login, name="auth-login"),
     path("", include(router.urls)),
 ]
@@ -3,7 +3,6 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from datetime import datetime
 from .serializers import (
     SignupSerializer,
     LoginSerializer,
@@ -11,14 +10,24 @@ from .serializers import (
     ChangePasswordSerializer,
     UserRegistrationRequestSerializer,
     RoleChangeRequestSerializer,
+    PendingRequestQuerySerializer,
+    BulkRequestApprovalSerializer,
+    BulkRequestRejectionSerializer,
 )
 from .models import User, UserRegistrationRequest, RoleChangeRequest, UserRoles
-from practices.models import PracticeUserAssignment
 from rest_framework.exceptions import ValidationError
 from django.middleware.csrf import get_token
 from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
+import json
 from utils.db_session import get_db_session
-from .services import UserRegistrationRequestService
+from utils.eager_loading import load_plan
+from .services import LoginService, UserRegistrationRequestService
+from .passwords import ahash_password, averify_password
+from .principal import assigned_practice_id, invalidate_principal
 
 
 class AuthViewSet(viewsets.ViewSet):
@@ -32,16 +41,11 @@ class AuthViewSet(viewsets.ViewSet):
         if serializer.is_valid():
             try:
                 with get_db_session() as session:
-                    # Create user without role
+                    # Create user without role, with their registration request
                     user = serializer.create(serializer.validated_data)
-                    session.add(user)
-                    session.commit()
-                    session.refresh(user)
-
-                    # Create registration request
                     request_service = UserRegistrationRequestService(session)
-                    registration_request = request_service.create_request(
-                        user_id=user.id,
+                    request_service.register(
+                        user,
                         practice_id=serializer.validated_data["desired_practice_id"],
                         requested_role=serializer.validated_data["requested_role"],
                     )
@@ -53,52 +57,8 @@ class AuthViewSet(viewsets.ViewSet):
                         },
                         status=status.HTTP_201_CREATED,
                     )
-            except Exception as e:
-                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-    @action(detail=False, methods=["post"], permission_classes=[AllowAny])
-    def login(self, request):
-        serializer = LoginSerializer(data=request.data)
-        if serializer.is_valid():
-            try:
-                with get_db_session() as session:
-                    user = (
-                        session.query(User)
-                        .filter(User.username == serializer.validated_data["username"])
-                        .first()
-                    )
-
-                    if not user or not user.check_password(
-                        serializer.validated_data["password"]
-                    ):
-                        return Response(
-                            {"error": "Invalid credentials"},
-                            status=status.HTTP_401_UNAUTHORIZED,
-                        )
-
-                    if not user.is_active:
-                        return Response(
-                            {"error": "Account is disabled"},
-                            status=status.HTTP_401_UNAUTHORIZED,
-                        )
-
-                    if not user.is_approved:
-                        return Response(
-                            {"error": "Account is pending approval"},
-                            status=status.HTTP_401_UNAUTHORIZED,
-                        )
-
-                    # Update session data
-                    user.last_login = datetime.utcnow()
-                    user.update_session_expiry()
-                    session.commit()
-
-                    # Set session data
-                    request.session["user_id"] = user.id
-                    request.session.set_expiry(86400)  # 24 hours in seconds
-
-                    return Response(UserSerializer(user).data)
+            except ValidationError as e:
+                return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
             except Exception as e:
                 return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -115,6 +75,7 @@ class AuthViewSet(viewsets.ViewSet):
                 if user:
                     user.session_expires_at = None
                     session.commit()
+                    invalidate_principal(user.id)
             request.session.flush()
             return Response({"message": "Logged out successfully"})
         except Exception as e:
@@ -142,6 +103,7 @@ class AuthViewSet(viewsets.ViewSet):
 
                     user.set_password(serializer.validated_data["new_password"])
                     session.commit()
+                    invalidate_principal(user.id)
 
                     return Response({"message": "Password updated successfully"})
             except Exception as e:
@@ -163,27 +125,30 @@ class AuthViewSet(viewsets.ViewSet):
 
     @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
     def pending_request(self, request):
+        query = PendingRequestQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             with get_db_session() as session:
                 service = UserRegistrationRequestService(session)
+                load = load_plan(UserRegistrationRequestSerializer)
 
                 if request.user.role == UserRoles.SUPER_ADMIN:
-                    requests = service.get_super_admin_pending_requests()
-                elif request.user.role == UserRoles.ADMIN:
-                    practice_assignment = (
-                        session.query(PracticeUserAssignment)
-                        .filter(PracticeUserAssignment.user_id == request.user.id)
-                        .first()
+                    requests = service.get_super_admin_pending_requests(
+                        query.validated_data, load
                     )
+                elif request.user.role == UserRoles.ADMIN:
+                    admin_practice_id = assigned_practice_id(session, request.user)
 
-                    if not practice_assignment:
+                    if not admin_practice_id:
                         return Response(
                             {"error": "Admin not assigned to any practice"},
                             status=status.HTTP_400_BAD_REQUEST,
                         )
 
                     requests = service.get_admin_pending_requests(
-                        practice_assignment.practice_id
+                        admin_practice_id, query.validated_data, load
                     )
                 else:
                     return Response(
@@ -196,9 +161,13 @@ class AuthViewSet(viewsets.ViewSet):
                         "registration_requests": UserRegistrationRequestSerializer(
                             requests["registration_requests"], many=True
                         ).data,
+                        "registration_next_cursor": requests[
+                            "registration_next_cursor"
+                        ],
                         "role_change_requests": RoleChangeRequestSerializer(
                             requests["role_change_requests"], many=True
                         ).data,
+                        "role_change_next_cursor": requests["role_change_next_cursor"],
                     }
                 )
 
@@ -215,13 +184,9 @@ class AuthViewSet(viewsets.ViewSet):
         try:
             with get_db_session() as session:
                 # Get user's practice
-                practice_assignment = (
-                    session.query(PracticeUserAssignment)
-                    .filter(PracticeUserAssignment.user_id == request.user.id)
-                    .first()
-                )
+                practice_id = assigned_practice_id(session, request.user)
 
-                if not practice_assignment:
+                if not practice_id:
                     return Response(
                         {"error": "User not assigned to any practice"},
                         status=status.HTTP_400_BAD_REQUEST,
@@ -230,7 +195,7 @@ class AuthViewSet(viewsets.ViewSet):
                 service = UserRegistrationRequestService(session)
                 role_request = service.create_role_change_request(
                     user_id=request.user.id,
-                    practice_id=practice_assignment.practice_id,
+                    practice_id=practice_id,
                     requested_role=serializer.validated_data["requested_role"],
                 )
 
@@ -253,13 +218,9 @@ class AuthViewSet(viewsets.ViewSet):
         try:
             with get_db_session() as session:
                 if request.user.role == UserRoles.ADMIN:
-                    practice_assignment = (
-                        session.query(PracticeUserAssignment)
-                        .filter(PracticeUserAssignment.user_id == request.user.id)
-                        .first()
-                    )
+                    admin_practice_id = assigned_practice_id(session, request.user)
 
-                    if not practice_assignment:
+                    if not admin_practice_id:
                         return Response(
                             {"error": "Admin not assigned to any practice"},
                             status=status.HTTP_400_BAD_REQUEST,
@@ -271,7 +232,7 @@ class AuthViewSet(viewsets.ViewSet):
                         req = session.query(UserRegistrationRequest).get(int(pk))
                         practice_id = req.desired_practice_id if req else None
 
-                    if not req or practice_id != practice_assignment.practice_id:
+                    if not req or practice_id != admin_practice_id:
                         return Response(
                             {"error": "Request not found"},
                             status=status.HTTP_404_NOT_FOUND,
@@ -308,13 +269,9 @@ class AuthViewSet(viewsets.ViewSet):
         try:
             with get_db_session() as session:
                 if request.user.role == UserRoles.ADMIN:
-                    practice_assignment = (
-                        session.query(PracticeUserAssignment)
-                        .filter(PracticeUserAssignment.user_id == request.user.id)
-                        .first()
-                    )
+                    admin_practice_id = assigned_practice_id(session, request.user)
 
-                    if not practice_assignment:
+                    if not admin_practice_id:
                         return Response(
                             {"error": "Admin not assigned to any practice"},
                             status=status.HTTP_400_BAD_REQUEST,
@@ -325,7 +282,7 @@ class AuthViewSet(viewsets.ViewSet):
                     else:
                         req = session.query(UserRegistrationRequest).get(int(pk))
 
-                    if not req or req.desired_practice_id != practice_assignment.practice_id:
+                    if not req or req.desired_practice_id != admin_practice_id:
                         return Response(
                             {"error": "Request not found"},
                             status=status.HTTP_404_NOT_FOUND,
@@ -360,3 +317,128 @@ class AuthViewSet(viewsets.ViewSet):
 
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[IsAuthenticated],
+        url_path="approve",
+    )
+    def bulk_approve(self, request):
+        """Approve several pending requests of one type in one transaction"""
+        serializer = BulkRequestApprovalSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with get_db_session() as session:
+                service = UserRegistrationRequestService(session)
+                requests = service.approve_requests(
+                    serializer.validated_data["request_type"],
+                    serializer.validated_data["request_ids"],
+                    request.user,
+                )
+                return Response(
+                    self._review_serializer(serializer)(requests, many=True).data
+                )
+        except PermissionDenied as e:
+            return Response({"error": str(e)}, status=status.HTTP_403_FORBIDDEN)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[IsAuthenticated],
+        url_path="reject",
+    )
+    def bulk_reject(self, request):
+        """Reject several pending requests of one type with one reason"""
+        serializer = BulkRequestRejectionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with get_db_session() as session:
+                service = UserRegistrationRequestService(session)
+                requests = service.reject_requests(
+                    serializer.validated_data["request_type"],
+                    serializer.validated_data["request_ids"],
+                    request.user,
+                    serializer.validated_data["reason"],
+                )
+                return Response(
+                    self._review_serializer(serializer)(requests, many=True).data
+                )
+        except PermissionDenied as e:
+            return Response({"error": str(e)}, status=status.HTTP_403_FORBIDDEN)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    def _review_serializer(self, serializer):
+        return (
+            UserRegistrationRequestSerializer
+            if serializer.validated_data["request_type"] == "registration"
+            else RoleChangeRequestSerializer
+        )
+
+
+def _get_login_user(username):
+    with get_db_session() as session:
+        return LoginService(session).get_user(username)
+
+
+def _complete_login(user, new_hash):
+    with get_db_session() as session:
+        service = LoginService(session)
+        service.check_standing(user)
+        return UserSerializer(service.complete_login(user, new_hash)).data
+
+
+@csrf_exempt
+@require_POST
+async def login(request):
+    """
+    Log a user in. The bcrypt check runs on the bounded hashing pool and is
+    awaited, so under ASGI a burst of logins does not hold up other
+    requests; under WSGI Django runs this view in its own event loop.
+    """
+    try:
+        if request.content_type == "application/json":
+            data = json.loads(request.body or b"{}")
+        else:
+            data = request.POST
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+    serializer = LoginSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+
+    try:
+        user = await sync_to_async(_get_login_user)(
+            serializer.validated_data["username"]
+        )
+        if not user or not await averify_password(
+            serializer.validated_data["password"], user.password
+        ):
+            return JsonResponse({"error": "Invalid credentials"}, status=401)
+
+        # A hash with an outdated work factor is replaced, hashed on the
+        # same pool as the check
+        new_hash = (
+            await ahash_password(serializer.validated_data["password"])
+            if user.password_needs_rehash()
+            else None
+        )
+        user_data = await sync_to_async(_complete_login)(user, new_hash)
+    except AuthenticationFailed as e:
+        return JsonResponse({"error": str(e.detail)}, status=401)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    # Set session data
+    await request.session.aset("user_id", user.id)
+    await request.session.aset_expiry(86400)  # 24 hours in seconds
+
+    return JsonResponse(user_data)
@@ -0,0 +1,377 @@
+# campaigns/analytics.py
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Any
+from sqlalchemy import case, extract, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from .models import (
+    Campaign,
+    CampaignPracticeAssociation,
+    CampaignReadActivity,
+    CampaignReadLatency,
+    CampaignStats,
+    PracticeReadActivity,
+)
+from usermessages.models import UserMessage
+from practices.models import PracticeUserAssignment
+from rest_framework.exceptions import ValidationError
+
+
+# Upper bounds (seconds) of the first-read latency histogram buckets
+READ_LATENCY_BUCKETS = (
+    60,
+    5 * 60,
+    15 * 60,
+    30 * 60,
+    60 * 60,
+    3 * 60 * 60,
+    6 * 60 * 60,
+    12 * 60 * 60,
+    24 * 60 * 60,
+    3 * 24 * 60 * 60,
+    7 * 24 * 60 * 60,
+)
+OVERFLOW_BUCKET = -1
+LATENCY_PERCENTILES = (50, 90, 99)
+RECONCILE_BATCH_SIZE = 500
+
+READ_ACTIVITY_GRANULARITIES = {
+    "HOUR": timedelta(hours=1),
+    "DAY": timedelta(days=1),
+}
+MAX_SERIES_POINTS = 1000
+
+
+def latency_bucket(seconds: float) -> int:
+    """Return the histogram bucket a first-read latency falls into"""
+    for bound in READ_LATENCY_BUCKETS:
+        if seconds <= bound:
+            return bound
+    return OVERFLOW_BUCKET
+
+
+def latency_percentiles(
+    histogram: Dict[int, int], percentiles: Iterable[int] = LATENCY_PERCENTILES
+) -> Dict[str, Optional[int]]:
+    """
+    Estimate latency percentiles from a bucket histogram.
+
+    Each percentile is reported as the upper bound of the bucket it falls in,
+    None when there are no reads yet or when it lands in the overflow bucket.
+    """
+    ordered = sorted(
+        histogram.items(),
+        key=lambda item: float("inf") if item[0] == OVERFLOW_BUCKET else item[0],
+    )
+    total = sum(count for _, count in ordered)
+    result = {}
+    for percentile in percentiles:
+        key = f"p{percentile}"
+        if not total:
+            result[key] = None
+            continue
+
+        threshold = total * percentile / 100.0
+        cumulative = 0
+        result[key] = None
+        for bucket, count in ordered:
+            cumulative += count
+            if cumulative >= threshold:
+                result[key] = None if bucket == OVERFLOW_BUCKET else bucket
+                break
+    return result
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def bucket_start(value: datetime, granularity: str) -> datetime:
+    """Truncate a timestamp to the start of its UTC hour or day bucket"""
+    value = _as_utc(value).replace(minute=0, second=0, microsecond=0)
+    if granularity == "DAY":
+        value = value.replace(hour=0)
+    return value
+
+
+class CampaignStatsService:
+    """
+    Maintains the campaign_stats rollup.
+
+    The record_* methods only stage statements on the caller's session so the
+    rollup is committed atomically with the message change that caused it.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def record_delivery(
+        self, campaign_id: int, count: int, delivered_at: datetime
+    ) -> None:
+        if not count:
+            return
+        self._increment(
+            campaign_id, delivered_count=count, last_delivered_at=delivered_at
+        )
+
+    def record_read(
+        self, campaign_id: int, delivered_at: Optional[datetime], read_at: datetime
+    ) -> None:
+        self._increment(campaign_id, read_count=1)
+
+        if delivered_at is None:
+            return
+        latency = (_as_utc(read_at) - _as_utc(delivered_at)).total_seconds()
+        stmt = pg_insert(CampaignReadLatency).values(
+            campaign_id=campaign_id, bucket=latency_bucket(max(latency, 0)), reads=1
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["campaign_id", "bucket"],
+            set_={"reads": CampaignReadLatency.reads + stmt.excluded.reads},
+        )
+        self.db.execute(stmt)
+
+    def record_delete(self, campaign_id: int) -> None:
+        self._increment(campaign_id, deleted_count=1)
+
+    def get_stats(self, campaign_id: int) -> Dict[str, Any]:
+        try:
+            stats = self.db.query(CampaignStats).get(campaign_id)
+            histogram = dict(
+                self.db.query(CampaignReadLatency.bucket, CampaignReadLatency.reads)
+                .filter(CampaignReadLatency.campaign_id == campaign_id)
+                .all()
+            )
+        except Exception as e:
+            raise ValidationError(f"Failed to fetch campaign stats: {str(e)}")
+
+        delivered = stats.delivered_count if stats else 0
+        read = stats.read_count if stats else 0
+        return {
+            "campaign_id": campaign_id,
+            "delivered_count": delivered,
+            "read_count": read,
+            "deleted_count": stats.deleted_count if stats else 0,
+            "read_rate": round(read / delivered, 4) if delivered else 0.0,
+            "first_read_latency": latency_percentiles(histogram),
+            "last_delivered_at": stats.last_delivered_at if stats else None,
+            "reconciled_at": stats.reconciled_at if stats else None,
+        }
+
+    def reconcile(self, campaign_ids: Optional[List[int]] = None) -> int:
+        """
+        Rebuild the rollup from user_messages, in batches of campaigns so that
+        no single transaction holds locks for long. Returns the number of
+        campaigns reconciled.
+        """
+        if campaign_ids is None:
+            campaign_ids = [
+                row[0]
+                for row in self.db.query(Campaign.id)
+                .filter(Campaign.status == "COMPLETED")
+                .order_by(Campaign.id)
+                .all()
+            ]
+
+        reconciled = 0
+        for start in range(0, len(campaign_ids), RECONCILE_BATCH_SIZE):
+            batch = campaign_ids[start : start + RECONCILE_BATCH_SIZE]
+            try:
+                self._reconcile_batch(batch)
+                self.db.commit()
+                reconciled += len(batch)
+            except Exception as e:
+                self.db.rollback()
+                raise ValidationError(f"Failed to reconcile campaign stats: {str(e)}")
+        return reconciled
+
+    def _reconcile_batch(self, campaign_ids: List[int]) -> None:
+        now = datetime.now(timezone.utc)
+        totals = (
+            self.db.query(
+                UserMessage.campaign_id,
+                func.count(UserMessage.id),
+                func.sum(case((UserMessage.is_read == True, 1), else_=0)),
+                func.sum(case((UserMessage.is_deleted == True, 1), else_=0)),
+                func.max(UserMessage.created_at),
+            )
+            .filter(UserMessage.campaign_id.in_(campaign_ids))
+            .group_by(UserMessage.campaign_id)
+            .all()
+        )
+
+        # Epoch difference rather than EXTRACT of an interval, which only
+        # PostgreSQL has
+        latency = extract("epoch", UserMessage.read_at) - extract(
+            "epoch", UserMessage.created_at
+        )
+        bucket = case(
+            *[(latency <= bound, bound) for bound in READ_LATENCY_BUCKETS],
+            else_=OVERFLOW_BUCKET,
+        ).label("latency_bucket")
+        buckets = (
+            self.db.query(UserMessage.campaign_id, bucket, func.count(UserMessage.id))
+            .filter(
+                UserMessage.campaign_id.in_(campaign_ids),
+                UserMessage.read_at.isnot(None),
+            )
+            .group_by(UserMessage.campaign_id, literal_column("latency_bucket"))
+            .all()
+        )
+
+        self.db.query(CampaignReadLatency).filter(
+            CampaignReadLatency.campaign_id.in_(campaign_ids)
+        ).delete(synchronize_session=False)
+
+        for campaign_id, delivered, read, deleted, last_delivered_at in totals:
+            stmt = pg_insert(CampaignStats).values(
+                campaign_id=campaign_id,
+                delivered_count=delivered,
+                read_count=read or 0,
+                deleted_count=deleted or 0,
+                last_delivered_at=last_delivered_at,
+                reconciled_at=now,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["campaign_id"],
+                set_={
+                    "delivered_count": stmt.excluded.delivered_count,
+                    "read_count": stmt.excluded.read_count,
+                    "deleted_count": stmt.excluded.deleted_count,
+                    "last_delivered_at": stmt.excluded.last_delivered_at,
+                    "reconciled_at": stmt.excluded.reconciled_at,
+                    "updated_at": func.now(),
+                },
+            )
+            self.db.execute(stmt)
+
+        if buckets:
+            self.db.execute(
+                pg_insert(CampaignReadLatency),
+                [
+                    {"campaign_id": campaign_id, "bucket": bucket, "reads": count}
+                    for campaign_id, bucket, count in buckets
+                ],
+            )
+
+    def _increment(self, campaign_id: int, **values) -> None:
+        counters = {
+            key: value for key, value in values.items() if key.endswith("_count")
+        }
+        stmt = pg_insert(CampaignStats).values(campaign_id=campaign_id, **values)
+        set_ = {
+            key: getattr(CampaignStats, key) + stmt.excluded[key] for key in counters
+        }
+        if "last_delivered_at" in values:
+            set_["last_delivered_at"] = stmt.excluded.last_delivered_at
+        set_["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(index_elements=["campaign_id"], set_=set_)
+        self.db.execute(stmt)
+
+
+class ReadActivityService:
+    """
+    Maintains hourly and daily read counts per campaign and per practice.
+
+    Series are answered from the bucket rows alone; user_messages is only
+    touched to resolve the reader's practice when a read is recorded.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def record_read(self, campaign_id: int, user_id: int, read_at: datetime) -> None:
+        practice_id = (
+            self.db.query(PracticeUserAssignment.practice_id)
+            .join(
+                CampaignPracticeAssociation,
+                CampaignPracticeAssociation.practice_id
+                == PracticeUserAssignment.practice_id,
+            )
+            .filter(
+                PracticeUserAssignment.user_id == user_id,
+                CampaignPracticeAssociation.campaign_id == campaign_id,
+            )
+            .limit(1)
+            .scalar()
+        )
+
+        buckets = [
+            {"granularity": granularity, "bucket_start": bucket_start(read_at, granularity)}
+            for granularity in READ_ACTIVITY_GRANULARITIES
+        ]
+        self._increment(
+            CampaignReadActivity,
+            "campaign_id",
+            [dict(bucket, campaign_id=campaign_id) for bucket in buckets],
+        )
+        if practice_id:
+            self._increment(
+                PracticeReadActivity,
+                "practice_id",
+                [dict(bucket, practice_id=practice_id) for bucket in buckets],
+            )
+
+    def campaign_series(
+        self, campaign_id: int, granularity: str, start: datetime, end: datetime
+    ) -> List[Dict[str, Any]]:
+        return self._series(
+            CampaignReadActivity.campaign_id, campaign_id, granularity, start, end
+        )
+
+    def practice_series(
+        self, practice_id: int, granularity: str, start: datetime, end: datetime
+    ) -> List[Dict[str, Any]]:
+        return self._series(
+            PracticeReadActivity.practice_id, practice_id, granularity, start, end
+        )
+
+    def _series(
+        self, key_column, key: int, granularity: str, start: datetime, end: datetime
+    ) -> List[Dict[str, Any]]:
+        if granularity not in READ_ACTIVITY_GRANULARITIES:
+            raise ValidationError(f"Unsupported granularity: {granularity}")
+
+        step = READ_ACTIVITY_GRANULARITIES[granularity]
+        first = bucket_start(start, granularity)
+        last = bucket_start(end, granularity)
+        if first > last:
+            raise ValidationError("Start of the range must be before its end")
+        if (last - first) // step + 1 > MAX_SERIES_POINTS:
+            raise ValidationError(
+                f"Range too large, at most {MAX_SERIES_POINTS} buckets can be returned"
+            )
+
+        model = key_column.class_
+        try:
+            rows = dict(
+                self.db.query(model.bucket_start, model.reads)
+                .filter(
+                    key_column == key,
+                    model.granularity == granularity,
+                    model.bucket_start >= first,
+                    model.bucket_start <= last,
+                )
+                .all()
+            )
+        except Exception as e:
+            raise ValidationError(f"Failed to fetch read activity: {str(e)}")
+
+        rows = {_as_utc(bucket): reads for bucket, reads in rows.items()}
+        series = []
+        current = first
+        while current <= last:
+            series.append({"bucket_start": current, "reads": rows.get(current, 0)})
+            current += step
+        return series
+
+    def _increment(self, model, key: str, rows: List[Dict[str, Any]]) -> None:
+        stmt = pg_insert(model).values([dict(row, reads=1) for row in rows])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key, "granularity", "bucket_start"],
+            set_={"reads": model.reads + stmt.excluded.reads},
+        )
+        self.db.execute(stmt)
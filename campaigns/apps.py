@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class CampaignsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'campaigns'
+
+    def ready(self):
+        from utils.cache import require_shared_cache
+
+        # Campaign and practice listings are cached in versioned namespaces
+        require_shared_cache()
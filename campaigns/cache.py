@@ -0,0 +1,73 @@
+# campaigns/cache.py
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from django.core.cache import cache
+from utils.cache import get_version, bump_version, versioned_key
+from utils.pagination import merge_keyset_pages, DEFAULT_PAGE_SIZE
+
+CAMPAIGN_LIST_NAMESPACE = "campaign-list"
+CAMPAIGN_LIST_TTL = 300
+
+
+def invalidate_campaign_lists() -> None:
+    """
+    Drop every cached campaign listing. Call after the change is committed,
+    so a reader can never cache pre-commit rows under the new version.
+    """
+    bump_version(CAMPAIGN_LIST_NAMESPACE)
+
+
+class CampaignListCache:
+    """
+    Serialized campaign listing pages, cached per listing scope.
+
+    A page is assembled from the scopes of the user (e.g. the DEFAULT
+    campaigns shared by all admins plus the admin's own CUSTOM ones); each
+    scope's page is cached on its own so the shared part is reused across
+    users. Keys embed a namespace version that every campaign write bumps.
+    """
+
+    def __init__(self, service, serializer_class, load: Iterable[str] = ()):
+        self.service = service
+        self.serializer_class = serializer_class
+        self.load = tuple(load)
+
+    def page(
+        self, scopes: List[Tuple[str, Any]], params: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        # Read the version before the rows, a concurrent write then only
+        # ever lands fresh data under an already obsolete version
+        version = get_version(CAMPAIGN_LIST_NAMESPACE)
+        pages = [
+            self._scope_page(version, name, predicate, params)
+            for name, predicate in scopes
+        ]
+        return merge_keyset_pages(
+            pages,
+            params.get("limit") or DEFAULT_PAGE_SIZE,
+            self.service.sort_descending(params),
+        )
+
+    def _scope_page(
+        self, version: int, name: str, predicate, params: Dict[str, Any]
+    ) -> Tuple[List[Tuple[List[Any], Dict[str, Any]]], bool]:
+        key = versioned_key(
+            CAMPAIGN_LIST_NAMESPACE,
+            version,
+            self.serializer_class.__name__,
+            name,
+            sorted(params.items()),
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        entries, has_more = self.service.page_scope(predicate, params, self.load)
+        cached = (
+            [
+                (sort_values, dict(self.serializer_class(campaign).data))
+                for sort_values, campaign in entries
+            ],
+            has_more,
+        )
+        cache.set(key, cached, CAMPAIGN_LIST_TTL)
+        return cached
@@ -0,0 +1,264 @@
+# campaigns/delivery.py
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from django.conf import settings
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from .models import Campaign
+from .templating import CompiledTemplate, compile_template, render_batch
+from usermessages.models import UserMessage
+from authentication.models import User
+from practices.models import Practice, PracticeUserAssignment
+
+
+DELIVERY_BATCH_SIZE = 5000
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def render_workers() -> int:
+    """Render processes to use, the configured count or the available cores"""
+    configured = getattr(settings, "CAMPAIGN_RENDER_WORKERS", None)
+    if configured not in (None, ""):
+        return int(configured)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    # Started on the first personalised batch and kept for the life of the
+    # process, so spawned workers import Django and the app only once. Its
+    # size is fixed then and it is never replaced, so a delivery running in
+    # another thread never submits to a pool that was shut down under it.
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned rather than forked, so workers never share the open
+            # database connection of the delivering process
+            _pool = ProcessPoolExecutor(
+                max_workers=render_workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+class CampaignDeliveryService:
+    """
+    Fans a campaign out into user messages.
+
+    Recipients are streamed in batches of columns holding only the fields
+    the content's placeholders use. Personalised batches are rendered in a
+    process pool while the delivering process keeps reading recipients and
+    writing finished batches with multi-row INSERTs.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def deliver(
+        self,
+        campaign: Campaign,
+        delivered_at: datetime,
+        batch_size: int = DELIVERY_BATCH_SIZE,
+        workers: Optional[int] = None,
+    ) -> int:
+        """Stage one message per recipient and return how many were staged"""
+        return self.deliver_many([campaign], delivered_at, batch_size, workers)[
+            campaign.id
+        ]
+
+    def deliver_many(
+        self,
+        campaigns: Sequence[Campaign],
+        delivered_at: datetime,
+        batch_size: int = DELIVERY_BATCH_SIZE,
+        workers: Optional[int] = None,
+    ) -> Dict[int, int]:
+        """
+        Stage the messages of several campaigns in one pipeline and return
+        the recipient count per campaign id. Campaigns with the same
+        practices and roles share one pass over their audience.
+        """
+        templates = {
+            campaign.id: compile_template(campaign.content) for campaign in campaigns
+        }
+        groups: Dict[Tuple[FrozenSet[int], FrozenSet[str]], List[Campaign]] = {}
+        for campaign in campaigns:
+            targeting = (
+                frozenset(a.practice_id for a in campaign.practice_associations),
+                frozenset(campaign.target_roles),
+            )
+            groups.setdefault(targeting, []).append(campaign)
+
+        delivered = dict.fromkeys(templates, 0)
+        for campaign_id, user_ids, contents in _render(
+            self._render_jobs(groups.values(), templates, batch_size),
+            render_workers() if workers is None else workers,
+        ):
+            self._write_batch(campaign_id, user_ids, contents, delivered_at)
+            delivered[campaign_id] += len(user_ids)
+        return delivered
+
+    def _render_jobs(
+        self,
+        groups: Iterable[List[Campaign]],
+        templates: Dict[int, CompiledTemplate],
+        batch_size: int,
+    ) -> Iterator[Tuple[int, CompiledTemplate, List[int], Dict[str, List[str]]]]:
+        for group in groups:
+            fields = tuple(
+                dict.fromkeys(
+                    field
+                    for campaign in group
+                    for field in templates[campaign.id].fields
+                )
+            )
+            for user_ids, columns in self.iter_recipient_batches(
+                group[0], fields, batch_size
+            ):
+                for campaign in group:
+                    yield campaign.id, templates[campaign.id], user_ids, columns
+
+    def iter_recipient_batches(
+        self,
+        campaign: Campaign,
+        fields: Sequence[str] = (),
+        batch_size: int = DELIVERY_BATCH_SIZE,
+    ) -> Iterator[Tuple[List[int], Dict[str, List[str]]]]:
+        """
+        Yield (user ids, {field: values}) for the active, approved users of
+        the targeted practices and roles, ordered by user id.
+        """
+        practice_ids = [assoc.practice_id for assoc in campaign.practice_associations]
+        stmt = (
+            select(
+                User.id,
+                *[self._field_column(field, practice_ids) for field in fields],
+            )
+            .where(
+                User.id.in_(
+                    select(PracticeUserAssignment.user_id).where(
+                        PracticeUserAssignment.practice_id.in_(practice_ids)
+                    )
+                ),
+                User.role.in_(campaign.target_roles),
+                User.is_active == True,
+                User.is_approved == True,
+            )
+            .order_by(User.id)
+        )
+
+        result = self.db.execute(
+            stmt.execution_options(stream_results=True, yield_per=batch_size)
+        )
+        for partition in result.partitions():
+            columns = list(zip(*partition))
+            yield list(columns[0]), {
+                field: list(values) for field, values in zip(fields, columns[1:])
+            }
+
+    def _field_column(self, field: str, practice_ids: List[int]):
+        """Column expression of a placeholder, never NULL"""
+        if field == "practice.name":
+            # The recipient's practice is the first one the campaign targets
+            value = (
+                select(Practice.name)
+                .join(
+                    PracticeUserAssignment,
+                    PracticeUserAssignment.practice_id == Practice.id,
+                )
+                .where(
+                    PracticeUserAssignment.user_id == User.id,
+                    Practice.id.in_(practice_ids),
+                )
+                .order_by(Practice.id)
+                .limit(1)
+                .scalar_subquery()
+            )
+        else:
+            value = getattr(User, field.split(".", 1)[1])
+        return func.coalesce(value, "").label(field.replace(".", "_"))
+
+    def _write_batch(
+        self,
+        campaign_id: int,
+        user_ids: Sequence[int],
+        contents: Sequence[str],
+        delivered_at: datetime,
+    ) -> None:
+        self.db.execute(
+            insert(UserMessage),
+            [
+                {
+                    "user_id": user_id,
+                    "campaign_id": campaign_id,
+                    "content": content,
+                    "created_at": delivered_at,
+                }
+                for user_id, content in zip(user_ids, contents)
+            ],
+        )
+
+
+def _render(
+    jobs: Iterator[Tuple[int, CompiledTemplate, List[int], Dict[str, List[str]]]],
+    workers: int,
+) -> Iterable[Tuple[int, List[int], List[str]]]:
+    """
+    Render (campaign id, template, user ids, columns) jobs and yield
+    (campaign id, user ids, contents), in the order the jobs arrive.
+    """
+    first = next(jobs, None)
+    second = next(jobs, None) if first is not None else None
+    if workers < 2 or second is None:
+        # Not worth starting processes for a single batch
+        for campaign_id, template, user_ids, columns in itertools.chain(
+            [job for job in (first, second) if job is not None], jobs
+        ):
+            yield campaign_id, user_ids, template.render_batch(columns, len(user_ids))
+        return
+
+    # Keep a second batch queued per worker, so workers stay busy while
+    # finished batches are written
+    pending = deque()
+    pool = None
+    for campaign_id, template, user_ids, columns in itertools.chain(
+        [first, second], jobs
+    ):
+        if template.is_static:
+            future = Future()
+            future.set_result(template.render_batch(columns, len(user_ids)))
+        else:
+            if pool is None:
+                pool = _get_pool()
+            future = pool.submit(
+                render_batch,
+                template.source,
+                {field: columns[field] for field in template.fields},
+                len(user_ids),
+            )
+        pending.append((campaign_id, user_ids, future))
+        if len(pending) >= 2 * workers:
+            done_id, done_ids, future = pending.popleft()
+            yield done_id, done_ids, future.result()
+    while pending:
+        done_id, done_ids, future = pending.popleft()
+        yield done_id, done_ids, future.result()
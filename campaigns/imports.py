@@ -0,0 +1,202 @@
+# campaigns/imports.py
+import csv
+import io
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from .models import (
+    Campaign,
+    CampaignHistory,
+    CampaignPracticeAssociation,
+    CampaignSchedule,
+)
+from .cache import invalidate_campaign_lists
+from .serializers import CampaignImportRowSerializer
+from authentication.models import User
+from practices.models import Practice
+from rest_framework.exceptions import ValidationError
+
+
+MAX_IMPORT_ROWS = 5000
+
+# Multi-valued CSV cells hold their values separated by semicolons
+CSV_LIST_FIELDS = ("target_roles", "target_practices")
+CSV_LIST_SEPARATOR = ";"
+
+
+def parse_csv(upload) -> List[Dict[str, Any]]:
+    """Read an uploaded CSV file into import rows"""
+    try:
+        text = io.StringIO(upload.read().decode("utf-8-sig"))
+        rows = []
+        for record in csv.DictReader(text):
+            row = {
+                key: value
+                for key, value in record.items()
+                if key is not None and value not in ("", None)
+            }
+            for field in CSV_LIST_FIELDS:
+                if field in row:
+                    row[field] = [
+                        value.strip()
+                        for value in row[field].split(CSV_LIST_SEPARATOR)
+                        if value.strip()
+                    ]
+            rows.append(row)
+        return rows
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ValidationError(f"Invalid CSV file: {str(e)}")
+
+
+class CampaignImportService:
+    """
+    Creates many DEFAULT campaigns in one transaction.
+
+    Every row is validated before anything is written; database checks run
+    once for the whole import rather than once per row, and campaigns,
+    associations, schedules and history are written with multi-row inserts.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def import_campaigns(
+        self, rows: List[Dict[str, Any]], user: User
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Returns the created campaigns as {"id", "name"} and the per-row
+        errors as {"row", "errors"}, with rows numbered from 1. Nothing is
+        written unless every row is valid.
+        """
+        if not rows:
+            raise ValidationError("No campaigns to import")
+        if len(rows) > MAX_IMPORT_ROWS:
+            raise ValidationError(
+                f"Cannot import more than {MAX_IMPORT_ROWS} campaigns at once"
+            )
+
+        validated, errors = self._validate(rows)
+        if errors:
+            return [], errors
+
+        try:
+            created = self._insert(validated, user)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise ValidationError(f"Failed to import campaigns: {str(e)}")
+
+        invalidate_campaign_lists()
+        return created, []
+
+    def _validate(
+        self, rows: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        validated = []
+        errors: Dict[int, Dict[str, List[str]]] = {}
+        for index, row in enumerate(rows):
+            serializer = CampaignImportRowSerializer(data=row)
+            if serializer.is_valid():
+                validated.append(serializer.validated_data)
+            else:
+                validated.append(None)
+                errors[index] = serializer.errors
+
+        valid = [data for data in validated if data is not None]
+        names = {data["name"] for data in valid}
+        practice_ids = {pid for data in valid for pid in data["target_practices"]}
+
+        duplicates = Counter(data["name"] for data in valid)
+        existing_names = {
+            name
+            for (name,) in self.db.query(Campaign.name).filter(
+                Campaign.name.in_(names)
+            )
+        }
+        existing_practices = {
+            pid
+            for (pid,) in self.db.query(Practice.id).filter(
+                Practice.id.in_(practice_ids)
+            )
+        }
+
+        for index, data in enumerate(validated):
+            if data is None:
+                continue
+            row_errors = {}
+            if data["name"] in existing_names:
+                row_errors["name"] = ["Campaign with this name already exists"]
+            elif duplicates[data["name"]] > 1:
+                row_errors["name"] = ["Campaign name is repeated in this import"]
+            missing = sorted(set(data["target_practices"]) - existing_practices)
+            if missing:
+                row_errors["target_practices"] = [
+                    f"Practice with id {pid} does not exist" for pid in missing
+                ]
+            if row_errors:
+                errors[index] = row_errors
+
+        return valid, [
+            {"row": index + 1, "errors": errors[index]} for index in sorted(errors)
+        ]
+
+    def _insert(self, rows: List[Dict[str, Any]], user: User) -> List[Dict[str, Any]]:
+        now = datetime.now(timezone.utc)
+        created = self.db.execute(
+            insert(Campaign).returning(
+                Campaign.id, Campaign.name, sort_by_parameter_order=True
+            ),
+            [
+                {
+                    "name": data["name"],
+                    "content": data["content"],
+                    "description": data.get("description"),
+                    "campaign_type": "DEFAULT",
+                    "delivery_type": data["delivery_type"],
+                    "status": "DRAFT",
+                    "created_by": user.id,
+                    "target_roles": data["target_roles"],
+                }
+                for data in rows
+            ],
+        ).all()
+
+        associations = [
+            {"campaign_id": campaign_id, "practice_id": practice_id}
+            for (campaign_id, _), data in zip(created, rows)
+            for practice_id in dict.fromkeys(data["target_practices"])
+        ]
+        self.db.execute(insert(CampaignPracticeAssociation), associations)
+
+        schedules = [
+            {
+                "campaign_id": campaign_id,
+                "scheduled_date": data["scheduled_date"],
+                "status": "PENDING",
+                "created_at": now,
+            }
+            for (campaign_id, _), data in zip(created, rows)
+            if data["delivery_type"] == "SCHEDULED"
+        ]
+        if schedules:
+            self.db.execute(insert(CampaignSchedule), schedules)
+
+        self.db.execute(
+            insert(CampaignHistory),
+            [
+                {
+                    "campaign_id": campaign_id,
+                    "action": "CREATED",
+                    "details": (
+                        "Campaign imported with type: DEFAULT, "
+                        f"delivery: {data['delivery_type']}"
+                    ),
+                    "performed_by": user.id,
+                }
+                for (campaign_id, _), data in zip(created, rows)
+            ],
+        )
+
+        return [{"id": campaign_id, "name": name} for campaign_id, name in created]
@@ -0,0 +1,42 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from campaigns.exports import stream_csv, stream_parquet
+
+
+class Command(BaseCommand):
+    help = "Export per-recipient delivery and read status of a campaign"
+
+    def add_arguments(self, parser):
+        parser.add_argument("campaign_id", type=int)
+        parser.add_argument(
+            "--output-format", choices=["csv", "parquet"], default="csv"
+        )
+        parser.add_argument(
+            "--file", help="Destination path, defaults to stdout for CSV"
+        )
+
+    def handle(self, *args, **options):
+        campaign_id = options["campaign_id"]
+        output_format = options["output_format"]
+        path = options.get("file")
+
+        if output_format == "parquet" and not path:
+            raise CommandError("--file is required for Parquet exports")
+
+        try:
+            if output_format == "parquet":
+                with open(path, "wb") as destination:
+                    for chunk in stream_parquet(campaign_id):
+                        destination.write(chunk)
+            elif path:
+                with open(path, "w", newline="") as destination:
+                    for chunk in stream_csv(campaign_id):
+                        destination.write(chunk)
+            else:
+                for chunk in stream_csv(campaign_id):
+                    sys.stdout.write(chunk)
+        except Exception as e:
+            raise CommandError(f"Export failed: {str(e)}")
+
+        if path:
+            self.stderr.write(f"Exported campaign {campaign_id} to {path}")
@@ -7,6 +7,7 @@ from sqlalchemy import (
     ForeignKey,
     Text,
     Boolean,
+    Integer,
     JSON,
 )
 from sqlalchemy.orm import relationship
@@ -72,7 +73,8 @@ class CampaignHistory(Base):
     __tablename__ = "campaign_history"
 
     id = Column(BigInteger, primary_key=True)
-    campaign_id = Column(BigInteger, ForeignKey("campaigns.id", ondelete="CASCADE"))
+    # Not a foreign key: the audit trail outlives deleted campaigns
+    campaign_id = Column(BigInteger, nullable=False)
     action = Column(String(50))  # 'CREATED', 'UPDATED', 'SENT', 'SCHEDULED'
     details = Column(Text, nullable=True)
     performed_by = Column(BigInteger, ForeignKey("users.id"))
@@ -97,3 +99,60 @@ class CampaignPracticeAssociation(Base):
     # Relationships
     campaign = relationship("Campaign", back_populates="practice_associations")
     practice = relationship("Practice")
+
+
+class CampaignStats(Base):
+    """Per-campaign delivery and engagement rollup"""
+
+    __tablename__ = "campaign_stats"
+
+    campaign_id = Column(
+        BigInteger, ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True
+    )
+    delivered_count = Column(BigInteger, nullable=False, default=0)
+    read_count = Column(BigInteger, nullable=False, default=0)
+    deleted_count = Column(BigInteger, nullable=False, default=0)
+    last_delivered_at = Column(DateTime(timezone=True), nullable=True)
+    reconciled_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class CampaignReadLatency(Base):
+    """Histogram of first-read latency per campaign, one row per bucket"""
+
+    __tablename__ = "campaign_read_latency"
+
+    campaign_id = Column(
+        BigInteger, ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Upper bound of the bucket in seconds, -1 for the overflow bucket
+    bucket = Column(Integer, primary_key=True)
+    reads = Column(BigInteger, nullable=False, default=0)
+
+
+class CampaignReadActivity(Base):
+    """Reads per campaign, pre-aggregated into hourly and daily buckets"""
+
+    __tablename__ = "campaign_read_activity"
+
+    campaign_id = Column(
+        BigInteger, ForeignKey("campaigns.id", ondelete="CASCADE"), primary_key=True
+    )
+    granularity = Column(String(10), primary_key=True)  # 'HOUR' or 'DAY'
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    reads = Column(BigInteger, nullable=False, default=0)
+
+
+class PracticeReadActivity(Base):
+    """Reads of campaign messages per practice, in hourly and daily buckets"""
+
+    __tablename__ = "practice_read_activity"
+
+    practice_id = Column(
+        BigInteger, ForeignKey("practices.id", ondelete="CASCADE"), primary_key=True
+    )
+    granularity = Column(String(10), primary_key=True)  # 'HOUR' or 'DAY'
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    reads = Column(BigInteger, nullable=False, default=0)
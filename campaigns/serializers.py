@@ -2,10 +2,13 @@
 from rest_framework import serializers
 from utils.db_session import get_db_session
 from .models import Campaign, CampaignPracticeAssociation
-from practices.models import PracticeUserAssignment
+from .templating import compile_template
+from authentication.models import UserRoles
+from authentication.principal import assigned_practice_id
 from authentication.serializers import UserSerializer
+from utils.pagination import KeysetQuerySerializer
 from practices.serializers import PracticeSerializer
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 
 class CampaignPracticeAssociationSerializer(serializers.Serializer):
@@ -13,6 +16,8 @@ class CampaignPracticeAssociationSerializer(serializers.Serializer):
     Serializer for displaying practice associations with basic practice details
     """
 
+    eager_load = ("practice",)
+
     practice_id = serializers.IntegerField()
     practice = serializers.SerializerMethodField()
 
@@ -29,6 +34,8 @@ class CampaignSerializer(serializers.Serializer):
     Main campaign serializer with full validation and relationship handling
     """
 
+    eager_load = ("creator", "schedules")
+
     id = serializers.IntegerField(read_only=True)
     name = serializers.CharField(max_length=255)
     content = serializers.CharField()
@@ -56,6 +63,21 @@ class CampaignSerializer(serializers.Serializer):
             "role": obj.creator.role,
         }
 
+    def validate_content(self, value):
+        compile_template(value)
+        return value
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # scheduled_date is not a campaign column, report the latest schedule
+        schedules = getattr(instance, "schedules", None)
+        if schedules:
+            latest = max(schedules, key=lambda schedule: schedule.scheduled_date)
+            data["scheduled_date"] = self.fields["scheduled_date"].to_representation(
+                latest.scheduled_date
+            )
+        return data
+
     def validate(self, data):
         """
         Custom validation to enforce business rules around campaign creation and handle role format conversion
@@ -100,18 +122,13 @@ class CampaignSerializer(serializers.Serializer):
                     "Admins can only target Practice Users"
                 )
 
-            # Get admin's practice ID from practice_user_assignments
-            practice_assignment = (
-                db_session.query(PracticeUserAssignment)  # Use db_session from context
-                .filter(PracticeUserAssignment.user_id == request.user.id)
-                .first()
-            )
+            # Admin's practice, carried by the request principal
+            practice_id = assigned_practice_id(db_session, request.user)
 
-            if not practice_assignment:
+            if not practice_id:
                 raise serializers.ValidationError("Admin not assigned to any practice")
 
             # Admins must target their own practice
-            practice_id = practice_assignment.practice_id
             if data.get("target_practices") and (
                 len(data["target_practices"]) != 1
                 or data["target_practices"][0] != practice_id
@@ -147,6 +164,8 @@ class CampaignListSerializer(serializers.Serializer):
     Simplified serializer for list views with essential fields
     """
 
+    eager_load = ("practice_associations.practice",)
+
     id = serializers.IntegerField()
     name = serializers.CharField()
     campaign_type = serializers.CharField()
@@ -167,6 +186,8 @@ class CampaignHistorySerializer(serializers.Serializer):
     Serializer for campaign history entries
     """
 
+    eager_load = ("performer",)
+
     action = serializers.CharField()
     details = serializers.CharField()
     performed_by = serializers.SerializerMethodField()
@@ -182,3 +203,174 @@ class CampaignHistorySerializer(serializers.Serializer):
             if obj.performer
             else None
         )
+
+
+class CampaignStatsSerializer(serializers.Serializer):
+    """
+    Serializer for the per-campaign delivery and engagement rollup
+    """
+
+    campaign_id = serializers.IntegerField()
+    delivered_count = serializers.IntegerField()
+    read_count = serializers.IntegerField()
+    deleted_count = serializers.IntegerField()
+    read_rate = serializers.FloatField()
+    first_read_latency = serializers.DictField(
+        child=serializers.IntegerField(allow_null=True)
+    )
+    last_delivered_at = serializers.DateTimeField(allow_null=True)
+    reconciled_at = serializers.DateTimeField(allow_null=True)
+
+
+class ReadActivityQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the read activity endpoints
+    """
+
+    granularity = serializers.ChoiceField(choices=["HOUR", "DAY"], default="DAY")
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+
+    def to_internal_value(self, data):
+        data = data.copy()
+        if "granularity" in data:
+            data["granularity"] = str(data["granularity"]).upper()
+        return super().to_internal_value(data)
+
+    def validate(self, data):
+        end = data.get("end") or datetime.now(timezone.utc)
+        default_span = (
+            timedelta(days=2) if data["granularity"] == "HOUR" else timedelta(days=30)
+        )
+        data["end"] = end
+        data["start"] = data.get("start") or end - default_span
+        if data["start"] > data["end"]:
+            raise serializers.ValidationError(
+                {"start": "Start of the range must be before its end"}
+            )
+        return data
+
+
+class ReadActivityPointSerializer(serializers.Serializer):
+    """
+    Serializer for one bucket of a read activity series
+    """
+
+    bucket_start = serializers.DateTimeField()
+    reads = serializers.IntegerField()
+
+
+class CampaignListQuerySerializer(KeysetQuerySerializer):
+    """
+    Validates the filter, sort and pagination parameters of campaign listings
+    """
+
+    sort = serializers.ChoiceField(
+        choices=["created_at", "-created_at", "name", "-name"], default="-created_at"
+    )
+    status = serializers.ChoiceField(
+        choices=["DRAFT", "IN_PROGRESS", "COMPLETED", "FAILED"], required=False
+    )
+    delivery_type = serializers.ChoiceField(
+        choices=["IMMEDIATE", "SCHEDULED"], required=False
+    )
+    campaign_type = serializers.ChoiceField(
+        choices=["DEFAULT", "CUSTOM"], required=False
+    )
+    practice_id = serializers.IntegerField(required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    name_prefix = serializers.CharField(max_length=255, required=False)
+
+
+class CampaignHistoryQuerySerializer(KeysetQuerySerializer):
+    """
+    Validates the filter and pagination parameters of the campaign history
+    """
+
+    action = serializers.ChoiceField(
+        choices=["CREATED", "UPDATED", "SENT", "DELETED"], required=False
+    )
+
+
+class CampaignImportRowSerializer(serializers.Serializer):
+    """
+    Validates the fields of one row of a bulk campaign import. Checks that
+    need the database (name clashes, practice ids) run once per import.
+    """
+
+    name = serializers.CharField(max_length=255)
+    content = serializers.CharField()
+    description = serializers.CharField(
+        required=False, allow_null=True, allow_blank=True
+    )
+    delivery_type = serializers.ChoiceField(choices=["IMMEDIATE", "SCHEDULED"])
+    target_roles = serializers.ListField(
+        child=serializers.ChoiceField(
+            choices=[UserRoles.SUPER_ADMIN, UserRoles.ADMIN, UserRoles.PRACTICE_USER]
+        ),
+        allow_empty=False,
+    )
+    target_practices = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False
+    )
+    scheduled_date = serializers.DateTimeField(required=False, allow_null=True)
+
+    def validate_content(self, value):
+        compile_template(value)
+        return value
+
+    def validate(self, data):
+        if data["delivery_type"] == "SCHEDULED" and not data.get("scheduled_date"):
+            raise serializers.ValidationError(
+                {"scheduled_date": "Scheduled date is required for SCHEDULED campaigns"}
+            )
+
+        if data.get("scheduled_date") and data["delivery_type"] != "SCHEDULED":
+            raise serializers.ValidationError(
+                {
+                    "scheduled_date": "Scheduled date should only be provided for SCHEDULED campaigns"
+                }
+            )
+
+        if data.get("scheduled_date") and data["scheduled_date"] <= datetime.now(
+            timezone.utc
+        ):
+            raise serializers.ValidationError(
+                {"scheduled_date": "Scheduled date must be in the future"}
+            )
+
+        return data
+
+
+class CampaignCloneSerializer(serializers.Serializer):
+    """
+    Validates the options of a campaign clone
+    """
+
+    practice_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        max_length=1000,
+    )
+    name = serializers.CharField(max_length=255, required=False)
+    include_schedule = serializers.BooleanField(default=False)
+    scheduled_date = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        if data.get("scheduled_date") and not data["include_schedule"]:
+            raise serializers.ValidationError(
+                {"scheduled_date": "Scheduled date requires include_schedule"}
+            )
+        return data
+
+
+class CampaignBulkSendSerializer(serializers.Serializer):
+    """
+    Validates the campaigns of a bulk send
+    """
+
+    campaign_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=100
+    )
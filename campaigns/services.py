@@ -1,7 +1,19 @@
 # campaigns/services.py
-from datetime import datetime
-from typing import List, Optional, Dict, Any
-from sqlalchemy import or_, and_
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any, Tuple, Iterable
+from sqlalchemy import (
+    or_,
+    and_,
+    true,
+    false,
+    insert,
+    delete,
+    select,
+    literal,
+    BigInteger,
+    DateTime,
+    String,
+)
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 from .models import (
@@ -10,10 +22,28 @@ from .models import (
     CampaignPracticeAssociation,
     CampaignSchedule,
 )
-from usermessages.models import UserMessage
+from .analytics import CampaignStatsService
+from .delivery import CampaignDeliveryService
+from .cache import invalidate_campaign_lists
 from authentication.models import User, UserRoles
-from practices.models import Practice, PracticeUserAssignment
+from authentication.principal import assigned_practice_id
+from practices.models import Practice
 from rest_framework.exceptions import ValidationError
+from utils.pagination import (
+    paginate_keyset,
+    merge_keyset_pages,
+    DEFAULT_PAGE_SIZE,
+)
+from utils.eager_loading import eager_load_options
+
+
+# Sort options of the campaign listings: (column, descending)
+CAMPAIGN_SORTS = {
+    "created_at": (Campaign.created_at, False),
+    "-created_at": (Campaign.created_at, True),
+    "name": (Campaign.name, False),
+    "-name": (Campaign.name, True),
+}
 
 
 class CampaignService:
@@ -43,26 +73,19 @@ class CampaignService:
             )
 
             if user.role == UserRoles.SUPER_ADMIN:
-                for practice_id in data["target_practices"]:
-                    if not self._practice_exists(practice_id):
-                        raise ValidationError(
-                            f"Practice with id {practice_id} does not exist"
-                        )
-                    association = CampaignPracticeAssociation(practice_id=practice_id)
-                    campaign.practice_associations.append(association)
-            else:
-                practice_assignment = (
-                    self.db.query(PracticeUserAssignment)
-                    .filter(PracticeUserAssignment.user_id == user.id)
-                    .first()
+                practice_ids = list(dict.fromkeys(data["target_practices"]))
+                self._validate_practices(practice_ids)
+                campaign.practice_associations.extend(
+                    CampaignPracticeAssociation(practice_id=practice_id)
+                    for practice_id in practice_ids
                 )
+            else:
+                practice_id = assigned_practice_id(self.db, user)
 
-                if not practice_assignment:
+                if not practice_id:
                     raise ValidationError("Admin user is not assigned to any practice")
 
-                association = CampaignPracticeAssociation(
-                    practice_id=practice_assignment.practice_id
-                )
+                association = CampaignPracticeAssociation(practice_id=practice_id)
                 campaign.practice_associations.append(association)
 
             self.db.add(campaign)
@@ -82,9 +105,6 @@ class CampaignService:
                 )
                 self.db.add(schedule)
 
-            self.db.commit()
-            self.db.refresh(campaign)
-
             # Record history
             self._record_history(
                 campaign.id,
@@ -98,6 +118,10 @@ class CampaignService:
                 user.id,
             )
 
+            self.db.commit()
+            invalidate_campaign_lists()
+            self.db.refresh(campaign)
+
             return campaign
 
         except Exception as e:
@@ -105,9 +129,8 @@ class CampaignService:
             raise ValidationError(f"Failed to create campaign: {str(e)}")
 
 
-    def send_immediate_campaign(
-        self, campaign_id: int, user: User
-    ) -> List[UserMessage]:
+    def send_immediate_campaign(self, campaign_id: int, user: User) -> int:
+        """Deliver a DRAFT IMMEDIATE campaign and return the recipient count"""
         campaign = self._get_campaign(campaign_id)
         if not campaign:
             raise ValidationError("Campaign not found")
@@ -117,43 +140,104 @@ class CampaignService:
         try:
             campaign.status = "IN_PROGRESS"
             self.db.commit()
-
-            target_users = self._get_target_users(campaign)
-            if not target_users:
-                raise ValidationError("No eligible users found for this campaign")
+            invalidate_campaign_lists()
 
             current_time = datetime.utcnow()
-            messages = []
-            for target_user in target_users:
-                message = UserMessage(
-                    user_id=target_user.id,
-                    campaign_id=campaign.id,
-                    content=campaign.content,
-                    created_at=current_time,
-                )
-                messages.append(message)
+            delivered = CampaignDeliveryService(self.db).deliver(campaign, current_time)
+            if not delivered:
+                raise ValidationError("No eligible users found for this campaign")
 
-            
-            self.db.bulk_save_objects(messages)
+            CampaignStatsService(self.db).record_delivery(
+                campaign.id, delivered, current_time
+            )
             campaign.status = "COMPLETED"
-            self.db.commit()
 
             # Record successful send in history
             self._record_history(
                 campaign.id,
                 "SENT",
-                f"Campaign sent successfully to {len(messages)} users",
+                f"Campaign sent successfully to {delivered} users",
                 user.id,
             )
 
-            return messages
+            self.db.commit()
+            invalidate_campaign_lists()
+
+            return delivered
 
         except Exception as e:
             self.db.rollback()
             campaign.status = "FAILED"
             self.db.commit()
+            invalidate_campaign_lists()
             raise ValidationError(f"Failed to send campaign: {str(e)}")
-    
+
+    def send_campaigns(self, campaign_ids: List[int], user: User) -> Dict[int, int]:
+        """
+        Deliver several DRAFT IMMEDIATE campaigns together and return the
+        recipient count per campaign. Every campaign must be sendable or
+        none is sent; campaigns without recipients end up FAILED.
+        """
+        campaign_ids = list(dict.fromkeys(campaign_ids))
+        campaigns = (
+            self.db.query(Campaign)
+            .filter(Campaign.id.in_(campaign_ids))
+            .options(*eager_load_options(Campaign, ("practice_associations",)))
+            .all()
+        )
+        found = {campaign.id: campaign for campaign in campaigns}
+        errors = []
+        for campaign_id in campaign_ids:
+            if campaign_id not in found:
+                errors.append(f"Campaign {campaign_id}: Campaign not found")
+                continue
+            try:
+                self._validate_campaign_send(found[campaign_id], user)
+            except ValidationError as e:
+                errors.append(f"Campaign {campaign_id}: {e.detail[0]}")
+        if errors:
+            raise ValidationError(errors)
+
+        campaigns = [found[campaign_id] for campaign_id in campaign_ids]
+        try:
+            for campaign in campaigns:
+                campaign.status = "IN_PROGRESS"
+            self.db.commit()
+            invalidate_campaign_lists()
+
+            current_time = datetime.utcnow()
+            delivered = CampaignDeliveryService(self.db).deliver_many(
+                campaigns, current_time
+            )
+
+            stats = CampaignStatsService(self.db)
+            for campaign in campaigns:
+                count = delivered[campaign.id]
+                if not count:
+                    campaign.status = "FAILED"
+                    continue
+                stats.record_delivery(campaign.id, count, current_time)
+                campaign.status = "COMPLETED"
+                self._record_history(
+                    campaign.id,
+                    "SENT",
+                    f"Campaign sent successfully to {count} users",
+                    user.id,
+                )
+
+            self.db.commit()
+            invalidate_campaign_lists()
+
+            return delivered
+
+        except Exception as e:
+            self.db.rollback()
+            for campaign in campaigns:
+                campaign.status = "FAILED"
+            self.db.commit()
+            invalidate_campaign_lists()
+            raise ValidationError(f"Failed to send campaigns: {str(e)}")
+
     def update_campaign(self, campaign_id: int, data: Dict[str, Any], user: User) -> Campaign:
         try:
             campaign = self._get_campaign(campaign_id)
@@ -181,31 +265,10 @@ class CampaignService:
                     updated_fields.append(field)
 
             if user.role == "Practice by Numbers Support" and "target_practices" in data:
-                for assoc in list(campaign.practice_associations):
-                    self.db.delete(assoc)
-                
-                for practice_id in data["target_practices"]:
-                    if not self._practice_exists(practice_id):
-                        raise ValidationError(f"Practice {practice_id} does not exist")
-                    
-                    existing_assoc = (
-                        self.db.query(CampaignPracticeAssociation)
-                        .filter_by(campaign_id=campaign_id, practice_id=practice_id)
-                        .first()
-                    )
-                    
-                    if not existing_assoc:
-                        association = CampaignPracticeAssociation(
-                            campaign_id=campaign_id, 
-                            practice_id=practice_id
-                        )
-                        self.db.add(association)
-                
+                self._sync_practice_associations(campaign, data["target_practices"])
                 updated_fields.append("target_practices")
 
             campaign.updated_at = func.now()
-            self.db.commit()
-            self.db.refresh(campaign)
 
             self._record_history(
                 campaign.id,
@@ -214,6 +277,10 @@ class CampaignService:
                 user.id
             )
 
+            self.db.commit()
+            invalidate_campaign_lists()
+            self.db.refresh(campaign)
+
             return campaign
 
         except Exception as e:
@@ -232,63 +299,302 @@ class CampaignService:
             raise ValidationError("Not authorized to delete this campaign")
 
         try:
-            self._record_history(campaign.id, "DELETED", "Campaign deleted", user.id)
+            # The history row has no foreign key to the campaign, so the
+            # audit record survives the delete committed with it
+            self._record_history(
+                campaign.id, "DELETED", f"Campaign '{campaign.name}' deleted", user.id
+            )
 
             self.db.delete(campaign)
             self.db.commit()
+            invalidate_campaign_lists()
             return True
 
         except Exception as e:
             self.db.rollback()
             raise ValidationError(f"Failed to delete campaign: {str(e)}")
 
-    def list_campaigns(self, user: User) -> List[Campaign]:
+    def clone_campaign(
+        self,
+        campaign_id: int,
+        user: User,
+        practice_ids: Optional[List[int]] = None,
+        name: Optional[str] = None,
+        include_schedule: bool = False,
+        scheduled_date: Optional[datetime] = None,
+    ) -> List[int]:
+        """
+        Copy a campaign in SQL, with INSERT ... SELECT statements, and return
+        the ids of the copies.
+
+        With `practice_ids`, one copy per practice is made, named after it
+        and targeting only that practice. Otherwise a single copy keeps the
+        source's practices. With `include_schedule` the copies are
+        SCHEDULED for `scheduled_date`, or for the source's latest schedule.
+        """
+        source = self.get_campaign(campaign_id, user)
+        if not source:
+            raise ValidationError("Campaign not found")
+
+        practice_ids = list(dict.fromkeys(practice_ids or []))
+        campaign_type = "DEFAULT" if user.role == UserRoles.SUPER_ADMIN else "CUSTOM"
+        own_practice_id = None
+        if user.role == UserRoles.ADMIN:
+            if any(role != UserRoles.PRACTICE_USER for role in source.target_roles):
+                raise ValidationError("Admins can only target Practice Users")
+            own_practice_id = assigned_practice_id(self.db, user)
+            if not own_practice_id:
+                raise ValidationError("Admin user is not assigned to any practice")
+            if practice_ids and practice_ids != [own_practice_id]:
+                raise ValidationError("Admins can only target their own practice")
+
+        if include_schedule:
+            if scheduled_date is None and source.schedules:
+                scheduled_date = max(s.scheduled_date for s in source.schedules)
+            if scheduled_date is None:
+                raise ValidationError("Scheduled date is required to copy a schedule")
+            if scheduled_date.tzinfo is None:
+                scheduled_date = scheduled_date.replace(tzinfo=timezone.utc)
+            if scheduled_date <= datetime.now(timezone.utc):
+                raise ValidationError("Scheduled date must be in the future")
+
+        base_name = name or f"Copy of {source.name}"
+        if practice_ids:
+            practice_names = dict(
+                self.db.query(Practice.id, Practice.name).filter(
+                    Practice.id.in_(practice_ids)
+                )
+            )
+            missing = [pid for pid in practice_ids if pid not in practice_names]
+            if missing:
+                raise ValidationError(f"Practice with id {missing[0]} does not exist")
+            prefix = f"{base_name} - "
+            names = [prefix + practice_names[pid] for pid in practice_ids]
+        else:
+            names = [base_name]
+
+        too_long = [n for n in names if len(n) > Campaign.name.type.length]
+        if too_long:
+            raise ValidationError(f"Campaign name '{too_long[0]}' is too long")
+        taken = self.db.query(Campaign.name).filter(Campaign.name.in_(names)).first()
+        if taken:
+            raise ValidationError(f"Campaign with name '{taken[0]}' already exists")
 
         try:
-            query = self.db.query(Campaign)
-
-            if user.role == "Practice by Numbers Support":
-                return query.all()
-            elif user.role == "Admin":
-                return query.filter(
-                    or_(
-                        Campaign.campaign_type == "DEFAULT",
-                        and_(
-                            Campaign.campaign_type == "CUSTOM",
-                            Campaign.created_by == user.id,
-                        ),
+            copies = select(
+                (
+                    literal(prefix, String) + Practice.name
+                    if practice_ids
+                    else literal(base_name, String)
+                ),
+                Campaign.content,
+                Campaign.description,
+                literal(campaign_type, String),
+                literal("SCHEDULED" if include_schedule else "IMMEDIATE", String),
+                literal("DRAFT", String),
+                literal(user.id, BigInteger),
+                Campaign.target_roles,
+                Campaign.id,
+            ).where(Campaign.id == source.id)
+            if practice_ids:
+                copies = copies.join(Practice, Practice.id.in_(practice_ids))
+
+            clone_ids = (
+                self.db.execute(
+                    insert(Campaign)
+                    .from_select(
+                        [
+                            "name",
+                            "content",
+                            "description",
+                            "campaign_type",
+                            "delivery_type",
+                            "status",
+                            "created_by",
+                            "target_roles",
+                            "copied_from",
+                        ],
+                        copies,
+                    )
+                    .returning(Campaign.id)
+                )
+                .scalars()
+                .all()
+            )
+            clones = select(Campaign.id).where(Campaign.id.in_(clone_ids))
+
+            if practice_ids:
+                # Each copy targets the practice it is named after
+                associations = (
+                    select(Campaign.id, Practice.id)
+                    .join(
+                        Practice,
+                        Campaign.name == literal(prefix, String) + Practice.name,
                     )
-                ).all()
+                    .where(Campaign.id.in_(clone_ids))
+                )
+            elif own_practice_id is not None:
+                associations = clones.add_columns(literal(own_practice_id, BigInteger))
             else:
-                return []
+                associations = select(
+                    literal(clone_ids[0], BigInteger),
+                    CampaignPracticeAssociation.practice_id,
+                ).where(CampaignPracticeAssociation.campaign_id == source.id)
+            self.db.execute(
+                insert(CampaignPracticeAssociation).from_select(
+                    ["campaign_id", "practice_id"], associations
+                )
+            )
+
+            if include_schedule:
+                self.db.execute(
+                    insert(CampaignSchedule).from_select(
+                        ["campaign_id", "scheduled_date", "status", "created_at"],
+                        clones.add_columns(
+                            literal(scheduled_date, DateTime(timezone=True)),
+                            literal("PENDING", String),
+                            func.now(),
+                        ),
+                    )
+                )
+
+            self.db.execute(
+                insert(CampaignHistory).from_select(
+                    ["campaign_id", "action", "details", "performed_by"],
+                    clones.add_columns(
+                        literal("CREATED", String),
+                        literal(f"Campaign cloned from campaign {source.id}", String),
+                        literal(user.id, BigInteger),
+                    ),
+                )
+            )
+
+            self.db.commit()
+            invalidate_campaign_lists()
+            return clone_ids
 
+        except Exception as e:
+            self.db.rollback()
+            raise ValidationError(f"Failed to clone campaign: {str(e)}")
+
+    def list_campaigns(
+        self,
+        user: User,
+        params: Optional[Dict[str, Any]] = None,
+        load: Iterable[str] = (),
+    ) -> Tuple[List[Campaign], Optional[str]]:
+        """
+        One page of the campaigns visible to the user, filtered and sorted
+        per `params`, with the relationship paths in `load` eager-loaded.
+        Returns the page and the cursor of the next one.
+        """
+        try:
+            return self._page_scopes(self.list_scopes(user), params or {}, load)
+        except ValidationError:
+            raise
         except Exception as e:
             raise ValidationError(f"Failed to fetch campaigns: {str(e)}")
 
-    def _get_target_users(self, campaign: Campaign) -> List[User]:
-        practice_ids = [assoc.practice_id for assoc in campaign.practice_associations]
-        target_roles = [
-            (
-                "Admin"
-                if role == "Admin"
-                else "Practice User" if role == "Practice User" else role
+    def list_scopes(self, user: User) -> List[Tuple[str, Any]]:
+        """
+        Disjoint (name, predicate) parts of the campaigns a user may list.
+
+        Admins see the DEFAULT campaigns shared by everyone plus their own
+        CUSTOM ones, so the shared part can be cached once for all admins.
+        """
+        if user.role == UserRoles.SUPER_ADMIN:
+            return [("all", true())]
+        if user.role == UserRoles.ADMIN:
+            return [
+                ("default", Campaign.campaign_type == "DEFAULT"),
+                self._custom_scope(user.id),
+            ]
+        return []
+
+    def user_campaign_scopes(self, user_id: int) -> List[Tuple[str, Any]]:
+        """Parts of the campaigns listed by my_campaign"""
+        if self.user.role == UserRoles.SUPER_ADMIN:
+            # Super admins see all campaigns
+            return [("all", true())]
+        if self.user.role == UserRoles.ADMIN:
+            return [self._custom_scope(user_id)]
+        return []
+
+    def page_scope(
+        self, predicate, params: Dict[str, Any], load: Iterable[str] = ()
+    ) -> Tuple[List[Tuple[List[Any], Campaign]], bool]:
+        """
+        First page after the cursor of one listing part, as (sort values,
+        campaign) pairs, and whether the part has more rows.
+        """
+        order = self._sort_order(params)
+        query = (
+            self._filter_listing(self.db.query(Campaign).filter(predicate), params)
+            .options(*eager_load_options(Campaign, load))
+        )
+        campaigns, next_cursor = paginate_keyset(
+            query,
+            order,
+            cursor=params.get("cursor"),
+            limit=params.get("limit") or DEFAULT_PAGE_SIZE,
+        )
+        return (
+            [
+                ([getattr(campaign, column.key) for column, _ in order], campaign)
+                for campaign in campaigns
+            ],
+            next_cursor is not None,
+        )
+
+    def get_campaign(
+        self, campaign_id: int, user: User, load: Iterable[str] = ()
+    ) -> Optional[Campaign]:
+        """
+        Fetch one campaign by primary key if the user may see it, with the
+        relationship paths in `load` joined into the same query.
+        """
+        try:
+            return (
+                self.db.query(Campaign)
+                .filter(Campaign.id == campaign_id, self._visibility_filter(user))
+                .options(*eager_load_options(Campaign, load, single=True))
+                .one_or_none()
             )
-            for role in campaign.target_roles
-        ]
-        
-        users = (
-            self.db.query(User)
-            .join(PracticeUserAssignment, User.id == PracticeUserAssignment.user_id)
-            .filter(
-                PracticeUserAssignment.practice_id.in_(practice_ids),
-                User.role.in_(target_roles),
-                User.is_active == True,
-                User.is_approved == True,  # Add this condition
+
+        except Exception as e:
+            raise ValidationError(f"Failed to fetch campaign: {str(e)}")
+
+    def get_history(
+        self,
+        campaign_id: int,
+        params: Optional[Dict[str, Any]] = None,
+        load: Iterable[str] = (),
+    ) -> Tuple[List[CampaignHistory], Optional[str]]:
+        """
+        One page of a campaign's history, newest first, served from the
+        (campaign_id, created_at, id) index. Returns the page and the cursor
+        of the next one.
+        """
+        params = params or {}
+        try:
+            query = (
+                self.db.query(CampaignHistory)
+                .filter(CampaignHistory.campaign_id == campaign_id)
+                .options(*eager_load_options(CampaignHistory, load))
             )
-            .distinct()
-            .all()
-        )
-        return users
+            if params.get("action"):
+                query = query.filter(CampaignHistory.action == params["action"])
+
+            return paginate_keyset(
+                query,
+                [(CampaignHistory.created_at, True), (CampaignHistory.id, True)],
+                cursor=params.get("cursor"),
+                limit=params.get("limit") or DEFAULT_PAGE_SIZE,
+            )
+        except ValidationError:
+            raise
+        except Exception as e:
+            raise ValidationError(f"Failed to fetch campaign history: {str(e)}")
 
     def _validate_campaign_send(self, campaign: Campaign, user: User):
         if campaign.status != "DRAFT":
@@ -307,14 +613,66 @@ class CampaignService:
             return campaign.created_by == user.id
         return False
 
+    def _visibility_filter(self, user: User):
+        """SQL predicate selecting the campaigns a user may see"""
+        scopes = self.list_scopes(user)
+        if not scopes:
+            return false()
+        return or_(*[predicate for _, predicate in scopes])
+
     def _campaign_name_exists(self, name: str) -> bool:
         return self.db.query(Campaign).filter(Campaign.name == name).first() is not None
 
-    def _practice_exists(self, practice_id: int) -> bool:
-        return (
-            self.db.query(Practice).filter(Practice.id == practice_id).first()
-            is not None
-        )
+    def _validate_practices(self, practice_ids: Iterable[int]) -> None:
+        """Check that every practice exists, with one IN query"""
+        practice_ids = set(practice_ids)
+        existing = {
+            practice_id
+            for (practice_id,) in self.db.query(Practice.id).filter(
+                Practice.id.in_(practice_ids)
+            )
+        }
+        missing = sorted(practice_ids - existing)
+        if missing:
+            raise ValidationError(
+                "Practices do not exist: " + ", ".join(str(pid) for pid in missing)
+            )
+
+    def _sync_practice_associations(
+        self, campaign: Campaign, practice_ids: Iterable[int]
+    ) -> None:
+        """
+        Make the campaign target exactly `practice_ids`, deleting and
+        inserting only the associations that differ, each with one statement.
+        """
+        requested = set(practice_ids)
+        self._validate_practices(requested)
+
+        current = {
+            practice_id
+            for (practice_id,) in self.db.query(
+                CampaignPracticeAssociation.practice_id
+            ).filter(CampaignPracticeAssociation.campaign_id == campaign.id)
+        }
+        removed = current - requested
+        added = requested - current
+
+        if removed:
+            self.db.execute(
+                delete(CampaignPracticeAssociation).where(
+                    CampaignPracticeAssociation.campaign_id == campaign.id,
+                    CampaignPracticeAssociation.practice_id.in_(removed),
+                )
+            )
+        if added:
+            self.db.execute(
+                insert(CampaignPracticeAssociation),
+                [
+                    {"campaign_id": campaign.id, "practice_id": practice_id}
+                    for practice_id in sorted(added)
+                ],
+            )
+        self.db.expire(campaign, ["practice_associations"])
 
     def _get_campaign(self, campaign_id: int) -> Optional[Campaign]:
         return self.db.query(Campaign).filter(Campaign.id == campaign_id).first()
@@ -322,6 +680,10 @@ class CampaignService:
     def _record_history(
         self, campaign_id: int, action: str, details: str, user_id: int
     ):
+        """
+        Stage a history entry in the current transaction. It is written by
+        the caller's commit, together with the change it describes.
+        """
         history = CampaignHistory(
             campaign_id=campaign_id,
             action=action,
@@ -329,31 +691,62 @@ class CampaignService:
             performed_by=user_id,
         )
         self.db.add(history)
-        self.db.commit()
 
-    def get_user_campaigns(self, user_id: int) -> List[Campaign]:
+    def get_user_campaigns(
+        self,
+        user_id: int,
+        params: Optional[Dict[str, Any]] = None,
+        load: Iterable[str] = (),
+    ) -> Tuple[List[Campaign], Optional[str]]:
         try:
-            query = self.db.query(Campaign)
+            return self._page_scopes(
+                self.user_campaign_scopes(user_id), params or {}, load
+            )
+        except ValidationError:
+            raise
+        except Exception as e:
+            error_msg = f"Failed to fetch user campaigns: {str(e)}"
+            raise ValidationError(error_msg)
 
-            if self.user.role == UserRoles.SUPER_ADMIN:
-                # Super admins see all campaigns
-                campaigns = query.order_by(Campaign.created_at.desc()).all()
+    def _custom_scope(self, user_id: int) -> Tuple[str, Any]:
+        return (
+            f"custom:{user_id}",
+            and_(Campaign.campaign_type == "CUSTOM", Campaign.created_by == user_id),
+        )
 
-            elif self.user.role == UserRoles.ADMIN:
-                campaigns = (
-                    query.filter(
-                        Campaign.created_by == user_id,
-                        Campaign.campaign_type == "CUSTOM",
-                    )
-                    .order_by(Campaign.created_at.desc())
-                    .all()
-                )
+    def _page_scopes(
+        self, scopes: List[Tuple[str, Any]], params: Dict[str, Any], load
+    ) -> Tuple[List[Campaign], Optional[str]]:
+        pages = [self.page_scope(predicate, params, load) for _, predicate in scopes]
+        return merge_keyset_pages(
+            pages, params.get("limit") or DEFAULT_PAGE_SIZE, self.sort_descending(params)
+        )
 
-            else:
-                campaigns = []
+    def sort_descending(self, params: Dict[str, Any]) -> bool:
+        _, descending = CAMPAIGN_SORTS[params.get("sort") or "-created_at"]
+        return descending
 
-            return campaigns
+    def _sort_order(self, params: Dict[str, Any]) -> List[Tuple[Any, bool]]:
+        column, descending = CAMPAIGN_SORTS[params.get("sort") or "-created_at"]
+        return [(column, descending), (Campaign.id, descending)]
 
-        except Exception as e:
-            error_msg = f"Failed to fetch user campaigns: {str(e)}"
-            raise ValidationError(error_msg)
\ No newline at end of file
+    def _filter_listing(self, query, params: Dict[str, Any]):
+        for field in ("status", "delivery_type", "campaign_type"):
+            if params.get(field):
+                query = query.filter(getattr(Campaign, field) == params[field])
+
+        if params.get("practice_id"):
+            query = query.filter(
+                Campaign.practice_associations.any(
+                    CampaignPracticeAssociation.practice_id == params["practice_id"]
+                )
+            )
+        if params.get("created_after"):
+            query = query.filter(Campaign.created_at >= params["created_after"])
+        if params.get("created_before"):
+            query = query.filter(Campaign.created_at < params["created_before"])
+        if params.get("name_prefix"):
+            query = query.filter(
+                Campaign.name.startswith(params["name_prefix"], autoescape=True)
+            )
+        return query
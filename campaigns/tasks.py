@@ -3,7 +3,9 @@ from datetime import datetime, timezone
 from utils.db_session import get_db_session
 from .models import Campaign, CampaignSchedule
 from .services import CampaignService
-from usermessages.models import UserMessage
+from .analytics import CampaignStatsService
+from .delivery import CampaignDeliveryService
+from .cache import invalidate_campaign_lists
 from sqlalchemy import and_
 
 
@@ -50,24 +52,17 @@ def process_scheduled_campaign(schedule_id: int):
 
             campaign.status = "IN_PROGRESS"
             session.commit()
+            invalidate_campaign_lists()
 
-            target_users = service._get_target_users(campaign)
+            current_time = datetime.now(timezone.utc)
+            delivered = CampaignDeliveryService(session).deliver(campaign, current_time)
 
-            if not target_users:
+            if not delivered:
                 raise ValueError("No eligible users found for this campaign")
 
-            current_time = datetime.now(timezone.utc)
-            messages = []
-            for target_user in target_users:
-                message = UserMessage(
-                    user_id=target_user.id,
-                    campaign_id=campaign.id,
-                    content=campaign.content,
-                    created_at=current_time,
-                )
-                messages.append(message)
-
-            session.bulk_save_objects(messages)
+            CampaignStatsService(session).record_delivery(
+                campaign.id, delivered, current_time
+            )
 
             schedule.status = "PROCESSED"
             schedule.execution_time = current_time
@@ -76,11 +71,12 @@ def process_scheduled_campaign(schedule_id: int):
             service._record_history(
                 campaign.id,
                 "SENT",
-                f"Scheduled campaign sent successfully to {len(messages)} users",
+                f"Scheduled campaign sent successfully to {delivered} users",
                 user.id,
             )
 
             session.commit()
+            invalidate_campaign_lists()
 
         except Exception as e:
             if campaign:
@@ -88,4 +84,16 @@ def process_scheduled_campaign(schedule_id: int):
                 schedule.status = "FAILED"
                 schedule.error_message = str(e)
                 session.commit()
+                invalidate_campaign_lists()
             print(f"Error processing scheduled campaign {schedule_id}: {str(e)}")
+
+
+@app.task
+def reconcile_campaign_stats():
+    """Rebuild the campaign stats rollup from user messages"""
+    with get_db_session() as session:
+        try:
+            reconciled = CampaignStatsService(session).reconcile()
+            print(f"Reconciled stats for {reconciled} campaigns")
+        except Exception as e:
+            print(f"Error reconciling campaign stats: {str(e)}")
@@ -0,0 +1,77 @@
+# campaigns/templating.py
+import re
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+from rest_framework.exceptions import ValidationError
+
+
+# Placeholders look like {{ user.full_name }}
+PLACEHOLDER = re.compile(r"\{\{\s*([a-z_]+\.[a-z_]+)\s*\}\}")
+TEMPLATE_FIELDS = ("user.full_name", "user.username", "user.email", "practice.name")
+
+
+class CompiledTemplate:
+    """
+    Campaign content parsed once into a str.format pattern with one
+    positional slot per distinct placeholder.
+
+    Rendering works on column-oriented recipient data: `columns` maps each
+    field in `fields` to a sequence of values, one per recipient. Content
+    without placeholders skips rendering altogether.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        fields: List[str] = []
+        parts: List[str] = []
+        position = 0
+        for match in PLACEHOLDER.finditer(source):
+            field = match.group(1)
+            if field not in TEMPLATE_FIELDS:
+                raise ValidationError(
+                    f"Unknown placeholder '{match.group(0)}', expected one of: "
+                    + ", ".join(TEMPLATE_FIELDS)
+                )
+            if field not in fields:
+                fields.append(field)
+            parts.append(_escape(source[position : match.start()]))
+            parts.append(f"{{{fields.index(field)}}}")
+            position = match.end()
+        parts.append(_escape(source[position:]))
+
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self._format = "".join(parts).format
+
+    @property
+    def is_static(self) -> bool:
+        return not self.fields
+
+    def render(self, values: Dict[str, str]) -> str:
+        if self.is_static:
+            return self.source
+        return self._format(*[values[field] for field in self.fields])
+
+    def render_batch(self, columns: Dict[str, Sequence[str]], count: int) -> List[str]:
+        if self.is_static:
+            return [self.source] * count
+        return [
+            self._format(*row)
+            for row in zip(*[columns[field] for field in self.fields])
+        ]
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str) -> CompiledTemplate:
+    """Compile campaign content, reusing the result for identical content"""
+    return CompiledTemplate(source)
+
+
+def render_batch(
+    source: str, columns: Dict[str, Sequence[str]], count: int
+) -> List[str]:
+    """Render one batch in a worker process, compiling once per process"""
+    return compile_template(source).render_batch(columns, count)
+
+
+def _escape(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
@@ -1,16 +1,31 @@
 # campaigns/views.py
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .services import CampaignService
-from .models import CampaignHistory,Campaign
+from .cache import CampaignListCache
+from .analytics import CampaignStatsService, ReadActivityService
+from .exports import stream_csv, stream_parquet, parquet_available
+from .imports import CampaignImportService, parse_csv
+from .models import Campaign
 from .serializers import (
     CampaignSerializer,
     CampaignListSerializer,
     CampaignHistorySerializer,
+    CampaignStatsSerializer,
+    CampaignListQuerySerializer,
+    CampaignHistoryQuerySerializer,
+    CampaignCloneSerializer,
+    CampaignBulkSendSerializer,
+    ReadActivityQuerySerializer,
+    ReadActivityPointSerializer,
 )
+from authentication.models import UserRoles
+from authentication.principal import assigned_practice_id
 from utils.db_session import get_db_session
+from utils.eager_loading import load_plan, eager_load_options
 
 
 class CampaignViewSet(viewsets.ViewSet):
@@ -18,11 +33,17 @@ class CampaignViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
 
     def list(self, request):
+        query = CampaignListQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
         with get_db_session() as session:
             service = CampaignService(session)
             try:
-                campaigns = service.list_campaigns(request.user)
-                return Response(CampaignListSerializer(campaigns, many=True).data)
+                results, next_cursor = CampaignListCache(
+                    service, CampaignListSerializer, load_plan(CampaignListSerializer)
+                ).page(service.list_scopes(request.user), query.validated_data)
+                return Response({"results": results, "next_cursor": next_cursor})
             except Exception as e:
                 return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -56,8 +77,9 @@ class CampaignViewSet(viewsets.ViewSet):
         with get_db_session() as session:
             service = CampaignService(session)
             try:
-                campaigns = service.list_campaigns(request.user)
-                campaign = next((c for c in campaigns if str(c.id) == pk), None)
+                campaign = service.get_campaign(
+                    int(pk), request.user, load=load_plan(CampaignSerializer)
+                )
                 if not campaign:
                     return Response(
                         {"error": "Campaign not found"},
@@ -125,48 +147,307 @@ class CampaignViewSet(viewsets.ViewSet):
         try:
             with get_db_session() as session:
                 service = CampaignService(session)
-                messages = service.send_immediate_campaign(int(pk), request.user)
+                recipients = service.send_immediate_campaign(int(pk), request.user)
+                return Response(
+                    {
+                        "message": f"Campaign sent successfully to {recipients} users",
+                        "recipients_count": recipients,
+                    }
+                )
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+    @action(detail=False, methods=["post"], url_path="send")
+    def bulk_send(self, request):
+        """
+        Send several immediate campaigns together, resolving each distinct
+        audience once
+        """
+        serializer = CampaignBulkSendSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with get_db_session() as session:
+                service = CampaignService(session)
+                delivered = service.send_campaigns(
+                    serializer.validated_data["campaign_ids"], request.user
+                )
                 return Response(
                     {
-                        "message": f"Campaign sent successfully to {len(messages)} users",
-                        "recipients_count": len(messages),
+                        "results": [
+                            {
+                                "campaign_id": campaign_id,
+                                "status": "COMPLETED" if count else "FAILED",
+                                "recipients_count": count,
+                            }
+                            for campaign_id, count in delivered.items()
+                        ]
                     }
                 )
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=["post"], url_path="import")
+    def bulk_import(self, request):
+        """
+        Create many DEFAULT campaigns at once from a JSON array or an
+        uploaded CSV file. Nothing is created if any row is invalid.
+        """
+        if request.user.role != UserRoles.SUPER_ADMIN:
+            return Response(
+                {"error": "Only super admins can import campaigns"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        with get_db_session() as session:
+            try:
+                if "file" in request.FILES:
+                    rows = parse_csv(request.FILES["file"])
+                elif isinstance(request.data, list):
+                    rows = request.data
+                else:
+                    return Response(
+                        {"error": "Expected a JSON array or a CSV file upload"},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+
+                created, errors = CampaignImportService(session).import_campaigns(
+                    rows, request.user
+                )
+                if errors:
+                    return Response(
+                        {"errors": errors}, status=status.HTTP_400_BAD_REQUEST
+                    )
+                return Response(
+                    {"created": len(created), "campaigns": created},
+                    status=status.HTTP_201_CREATED,
+                )
+            except Exception as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=True, methods=["post"])
+    def clone(self, request, pk=None):
+        """
+        Copy a campaign, optionally once per practice in `practice_ids`
+        """
+        serializer = CampaignCloneSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        with get_db_session() as session:
+            try:
+                service = CampaignService(session)
+                clone_ids = service.clone_campaign(
+                    int(pk), request.user, **serializer.validated_data
+                )
+                clones = (
+                    session.query(Campaign)
+                    .filter(Campaign.id.in_(clone_ids))
+                    .options(
+                        *eager_load_options(Campaign, load_plan(CampaignListSerializer))
+                    )
+                    .order_by(Campaign.id)
+                    .all()
+                )
+                return Response(
+                    CampaignListSerializer(clones, many=True).data,
+                    status=status.HTTP_201_CREATED,
+                )
+            except Exception as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=False, methods=["GET"])
     def my_campaign(self, request):
+        query = CampaignListQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
         with get_db_session() as session:
             try:
                 service = CampaignService(session, request.user)
-                campaigns = service.get_user_campaigns(request.user.id)
-                return Response(CampaignListSerializer(campaigns, many=True).data)
+                results, next_cursor = CampaignListCache(
+                    service, CampaignListSerializer, load_plan(CampaignListSerializer)
+                ).page(
+                    service.user_campaign_scopes(request.user.id), query.validated_data
+                )
+                return Response({"results": results, "next_cursor": next_cursor})
             except Exception as e:
                 return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=True, methods=["get"])
     def history(self, request, pk=None):
+        query = CampaignHistoryQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
 
         with get_db_session() as session:
             try:
-                # Get campaign
-                campaign = session.query(Campaign).get(int(pk))
+                service = CampaignService(session)
+                campaign = service.get_campaign(int(pk), request.user)
                 if not campaign:
                     return Response(
                         {"error": "Campaign not found"},
                         status=status.HTTP_404_NOT_FOUND,
                     )
 
-                # Get campaign history with user data
-                history = (
-                    session.query(CampaignHistory)
-                    .filter(CampaignHistory.campaign_id == pk)
-                    .order_by(CampaignHistory.created_at.desc())
-                    .all()
+                # Performers are loaded with the page, not per entry
+                history, next_cursor = service.get_history(
+                    campaign.id,
+                    query.validated_data,
+                    load=load_plan(CampaignHistorySerializer),
+                )
+                return Response(
+                    {
+                        "results": CampaignHistorySerializer(history, many=True).data,
+                        "next_cursor": next_cursor,
+                    }
                 )
+            except Exception as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-                return Response(CampaignHistorySerializer(history, many=True).data)
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        """
+        Delivery and engagement rollup for a campaign
+        """
+        with get_db_session() as session:
+            try:
+                service = CampaignService(session)
+                campaign = service.get_campaign(int(pk), request.user)
+                if not campaign:
+                    return Response(
+                        {"error": "Campaign not found"},
+                        status=status.HTTP_404_NOT_FOUND,
+                    )
+
+                stats = CampaignStatsService(session).get_stats(campaign.id)
+                return Response(CampaignStatsSerializer(stats).data)
+            except Exception as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=True, methods=["get"])
+    def read_activity(self, request, pk=None):
+        """
+        Reads per hour or day for a campaign across a date range
+        """
+        query = ReadActivityQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        with get_db_session() as session:
+            try:
+                service = CampaignService(session)
+                campaign = service.get_campaign(int(pk), request.user)
+                if not campaign:
+                    return Response(
+                        {"error": "Campaign not found"},
+                        status=status.HTTP_404_NOT_FOUND,
+                    )
+
+                series = ReadActivityService(session).campaign_series(
+                    campaign.id,
+                    query.validated_data["granularity"],
+                    query.validated_data["start"],
+                    query.validated_data["end"],
+                )
+                return Response(
+                    {
+                        "campaign_id": campaign.id,
+                        "granularity": query.validated_data["granularity"],
+                        "series": ReadActivityPointSerializer(series, many=True).data,
+                    }
+                )
+            except Exception as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=["get"])
+    def practice_read_activity(self, request):
+        """
+        Reads per hour or day of all campaigns in a practice across a date range
+        """
+        query = ReadActivityQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            practice_id = int(request.query_params.get("practice_id"))
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "practice_id is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with get_db_session() as session:
+            try:
+                if request.user.role == UserRoles.ADMIN:
+                    if assigned_practice_id(session, request.user) != practice_id:
+                        return Response(
+                            {"error": "Admins can only view their own practice"},
+                            status=status.HTTP_403_FORBIDDEN,
+                        )
+                elif request.user.role != UserRoles.SUPER_ADMIN:
+                    return Response(
+                        {"error": "Insufficient permissions"},
+                        status=status.HTTP_403_FORBIDDEN,
+                    )
+
+                series = ReadActivityService(session).practice_series(
+                    practice_id,
+                    query.validated_data["granularity"],
+                    query.validated_data["start"],
+                    query.validated_data["end"],
+                )
+                return Response(
+                    {
+                        "practice_id": practice_id,
+                        "granularity": query.validated_data["granularity"],
+                        "series": ReadActivityPointSerializer(series, many=True).data,
+                    }
+                )
             except Exception as e:
                 return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=True, methods=["get"])
+    def export(self, request, pk=None):
+        """
+        Stream per-recipient delivery and read status as CSV or Parquet
+        """
+        output = request.query_params.get("output", "csv").lower()
+        if output not in ("csv", "parquet"):
+            return Response(
+                {"error": "output must be one of: csv, parquet"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if output == "parquet" and not parquet_available():
+            return Response(
+                {"error": "Parquet export requires the pyarrow package"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with get_db_session() as session:
+            try:
+                service = CampaignService(session)
+                campaign = service.get_campaign(int(pk), request.user)
+                if not campaign:
+                    return Response(
+                        {"error": "Campaign not found"},
+                        status=status.HTTP_404_NOT_FOUND,
+                    )
+                campaign_id = campaign.id
+            except Exception as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if output == "parquet":
+            response = StreamingHttpResponse(
+                stream_parquet(campaign_id), content_type="application/vnd.apache.parquet"
+            )
+        else:
+            response = StreamingHttpResponse(
+                stream_csv(campaign_id), content_type="text/csv"
+            )
+        response["Content-Disposition"] = (
+            f'attachment; filename="campaign_{campaign_id}_recipients.{output}"'
+        )
+        return response
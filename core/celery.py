@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.schedules import crontab
 from django.conf import settings
 import os
 from dotenv import load_dotenv
@@ -32,6 +33,14 @@ app.conf.beat_schedule = {
         "task": "campaigns.tasks.check_scheduled_campaigns",
         "schedule": 30.0,  # Run every minute
     },
+    "reconcile-campaign-stats": {
+        "task": "campaigns.tasks.reconcile_campaign_stats",
+        "schedule": crontab(hour=2, minute=0),  # Nightly
+    },
+    "sweep-expired-sessions": {
+        "task": "authentication.tasks.sweep_expired_sessions",
+        "schedule": crontab(minute=15),  # Hourly
+    },
 }
 
 # Auto-discover tasks in all installed apps
@@ -101,6 +101,33 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+if config.get("redis.host"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://{}:{}/{}".format(
+                config.get("redis.host"),
+                config.get("redis.port", 6379),
+                config.get("redis.db", 0),
+            ),
+        }
+    }
+else:
+    # Only usable where REQUIRE_SHARED_CACHE is off, see utils.cache
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Versioned cache namespaces are invalidated in the shared cache, startup
+# fails on a per-process one unless this is turned off
+REQUIRE_SHARED_CACHE = config.get("cache.require_shared", True)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -160,9 +187,17 @@ REST_FRAMEWORK = {
 
 
 # Session settings
-SESSION_ENGINE = "django.contrib.sessions.backends.db"
+if config.get("redis.host"):
+    SESSION_ENGINE = "authentication.session_store"
+else:
+    # A per-process cache would only hold the sessions its own process
+    # wrote, the database keeps them visible to every worker
+    SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
 SESSION_COOKIE_AGE = 86400
 SESSION_SAVE_EVERY_REQUEST = True
+# Seconds an unchanged session, and a user's session expiry, may go without
+# being extended; shorter extensions are not written
+SESSION_REFRESH_THRESHOLD = config.get("session.refresh_threshold", 300)
 
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
@@ -201,3 +236,15 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "UTC"
+
+# Campaign delivery
+# Processes rendering personalised campaign content; unset uses every
+# available core, 0 or 1 renders in the delivering process
+CAMPAIGN_RENDER_WORKERS = config.get("delivery.render_workers")
+
+# Passwords
+# bcrypt work factor of new hashes; hashes with another factor are
+# replaced on the user's next login
+BCRYPT_ROUNDS = config.get("auth.bcrypt_rounds", 12)
+# Threads verifying passwords at login; unset uses every available core
+PASSWORD_HASHING_WORKERS = config.get("auth.hashing_workers")
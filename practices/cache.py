@@ -0,0 +1,80 @@
+# practices/cache.py
+import hashlib
+import json
+import time
+from typing import Callable, Dict, List, Tuple
+from django.core.cache import cache
+from utils.cache import get_version, bump_version, versioned_key
+
+PRACTICE_LIST_NAMESPACE = "practice-list"
+PRACTICE_LIST_TTL = 3600
+# How long browsers and CDNs may reuse the public list without revalidating
+PRACTICE_LIST_MAX_AGE = 60
+# How long one worker may hold the rebuild, others wait up to as long
+PRACTICE_LIST_LOCK_TIMEOUT = 5
+
+# Lists already built by this worker, by variant: (version, data, etag)
+_local: Dict[bool, Tuple[int, List[dict], str]] = {}
+
+
+def invalidate_practice_lists() -> None:
+    """
+    Drop every cached practice list, in all workers. Call after the change
+    is committed.
+    """
+    bump_version(PRACTICE_LIST_NAMESPACE)
+
+
+def get_practice_list(
+    include_inactive: bool, build: Callable[[], List[dict]]
+) -> Tuple[List[dict], str]:
+    """
+    The serialized practice list and its ETag.
+
+    Served from this worker's memory while the namespace version in the
+    shared cache is unchanged, then from the shared cache; `build` only
+    runs, and only queries the database, after an invalidation, and then
+    in a single worker at a time.
+    """
+    # Read the version before the rows, a concurrent write then only ever
+    # lands fresh data under an already obsolete version
+    version = get_version(PRACTICE_LIST_NAMESPACE)
+    local = _local.get(include_inactive)
+    if local and local[0] == version:
+        return local[1], local[2]
+
+    key = versioned_key(PRACTICE_LIST_NAMESPACE, version, include_inactive)
+    entry = cache.get(key)
+    if entry is None:
+        entry = _build_once(key, build)
+
+    _local[include_inactive] = (version, entry[0], entry[1])
+    return entry
+
+
+def _build_once(key: str, build: Callable[[], List[dict]]) -> Tuple[List[dict], str]:
+    # The worker that takes the lock builds the list, the others poll the
+    # shared cache for it and only build themselves when it never shows up
+    lock = f"{key}:lock"
+    locked = cache.add(lock, True, PRACTICE_LIST_LOCK_TIMEOUT)
+    if not locked:
+        deadline = time.monotonic() + PRACTICE_LIST_LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry
+
+    try:
+        data = build()
+        entry = (data, _etag(data))
+        cache.set(key, entry, PRACTICE_LIST_TTL)
+        return entry
+    finally:
+        if locked:
+            cache.delete(lock)
+
+
+def _etag(data: List[dict]) -> str:
+    body = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+    return '"{}"'.format(hashlib.md5(body).hexdigest())
@@ -21,6 +21,6 @@ class PracticeUserAssignment(Base):
     __tablename__ = "practice_user_assignments"
 
     id = Column(BigInteger, primary_key=True)
-    practice_id = Column(BigInteger, ForeignKey("practices.id"))
+    practice_id = Column(BigInteger, ForeignKey("practices.id", ondelete="CASCADE"))
     user_id = Column(BigInteger, ForeignKey("users.id"))
     assigned_at = Column(DateTime(timezone=True), server_default=func.now())
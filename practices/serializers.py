@@ -1,7 +1,9 @@
 from rest_framework import serializers
-from .models import Practice, PracticeUserAssignment
+from .models import Practice
+from .services import PracticeService
 from utils.db_session import get_db_session
-from authentication.models import User
+from utils.pagination import KeysetQuerySerializer
+from authentication.models import UserRoles
 
 class PracticeSerializer(serializers.Serializer):
     id = serializers.IntegerField(read_only=True)
@@ -21,8 +23,26 @@ class PracticeDetailSerializer(PracticeSerializer):
     users = serializers.SerializerMethodField()
 
     def get_users(self, obj):
+        """
+        The practice's members. Views pass the page they fetched with
+        PracticeService.get_practice_members as the `members` context;
+        without it the first page is fetched here with the same query.
+        """
         from authentication.serializers import UserSerializer
-        with get_db_session() as session:
-            assignments = session.query(PracticeUserAssignment).filter_by(practice_id=obj.id).all()
-            users = [session.query(User).get(a.user_id) for a in assignments]
-            return UserSerializer(users, many=True).data
+        members = self.context.get("members")
+        if members is None:
+            with get_db_session() as session:
+                members, _ = PracticeService(session).get_practice_members(obj.id)
+        return UserSerializer(members, many=True).data
+
+
+class PracticeMemberQuerySerializer(KeysetQuerySerializer):
+    """
+    Validates the filter and pagination parameters of a practice's members
+    """
+
+    role = serializers.ChoiceField(
+        choices=[UserRoles.SUPER_ADMIN, UserRoles.ADMIN, UserRoles.PRACTICE_USER],
+        required=False,
+    )
+    is_active = serializers.BooleanField(required=False, allow_null=True)
@@ -1,9 +1,13 @@
 # practices/services.py
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple, Union
 from sqlalchemy.orm import Session
 from .models import Practice, PracticeUserAssignment
 from authentication.models import User
+from authentication.principal import assigned_practice_id, invalidate_principal
+from campaigns.cache import invalidate_campaign_lists
+from .cache import invalidate_practice_lists
 from rest_framework.exceptions import ValidationError
+from utils.pagination import DEFAULT_PAGE_SIZE, paginate_keyset
 
 
 class PracticeService:
@@ -18,6 +22,7 @@ class PracticeService:
         practice = Practice(name=name, description=description)
         self.db.add(practice)
         self.db.commit()
+        invalidate_practice_lists()
         self.db.refresh(practice)
         return practice
 
@@ -51,16 +56,54 @@ class PracticeService:
         if assignment:
             self.db.delete(assignment)
             self.db.commit()
+            invalidate_principal(user_id)
             return True
         return False
 
+    def get_member_ids(self, practice_id: int) -> List[int]:
+        """Ids of the users assigned to a practice, read from the index alone"""
+        return [
+            user_id
+            for (user_id,) in self.db.query(PracticeUserAssignment.user_id).filter(
+                PracticeUserAssignment.practice_id == practice_id
+            )
+        ]
+
     def get_practice_users(self, practice_id: int) -> List[User]:
-        assignments = (
-            self.db.query(PracticeUserAssignment)
-            .filter_by(practice_id=practice_id)
-            .all()
+        return self._members_query(practice_id, {}).order_by(User.id).all()
+
+    def get_practice_members(
+        self, practice_id: int, params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[User], Optional[str]]:
+        """
+        One page of a practice's users in id order, optionally filtered by
+        role and active flag. Users are joined to their assignments in one
+        query paginated along the (practice_id, user_id) index.
+        """
+        params = params or {}
+        try:
+            return paginate_keyset(
+                self._members_query(practice_id, params),
+                [(User.id, False)],
+                cursor=params.get("cursor"),
+                limit=params.get("limit") or DEFAULT_PAGE_SIZE,
+            )
+        except ValidationError:
+            raise
+        except Exception as e:
+            raise ValidationError(f"Failed to fetch practice members: {str(e)}")
+
+    def _members_query(self, practice_id: int, params: Dict[str, Any]):
+        query = (
+            self.db.query(User)
+            .join(PracticeUserAssignment, PracticeUserAssignment.user_id == User.id)
+            .filter(PracticeUserAssignment.practice_id == practice_id)
         )
-        return [self.db.query(User).get(a.user_id) for a in assignments]
+        if params.get("role"):
+            query = query.filter(User.role == params["role"])
+        if params.get("is_active") is not None:
+            query = query.filter(User.is_active == params["is_active"])
+        return query
 
     def update_practice(self, practice_id: int, **kwargs) -> Optional[Practice]:
         try:
@@ -87,26 +130,34 @@ class PracticeService:
                     setattr(practice, key, value)
 
             self.db.commit()
+            # Practice names are part of the cached campaign listings
+            invalidate_campaign_lists()
+            invalidate_practice_lists()
             self.db.refresh(practice)
             return practice
         except Exception as e:
             self.db.rollback()
             raise ValidationError(f"Failed to update practice: {str(e)}")
         
-    def get_user_practice(self, user_id: int) -> Optional[Practice]:
+    def get_user_practice(self, user: Union[User, int]) -> Optional[Practice]:
+        """The practice of a user, given as a User (such as the request
+        principal, which carries its assignments) or as a user id"""
         try:
-            # Find the practice assignment for this user
-            assignment = (
-                self.db.query(PracticeUserAssignment)
-                .filter(PracticeUserAssignment.user_id == user_id)
-                .first()
-            )
-            
-            if assignment:
+            if isinstance(user, User):
+                practice_id = assigned_practice_id(self.db, user)
+            else:
+                # Find the practice assignment for this user
+                assignment = (
+                    self.db.query(PracticeUserAssignment)
+                    .filter(PracticeUserAssignment.user_id == user)
+                    .first()
+                )
+                practice_id = assignment.practice_id if assignment else None
+
+            if practice_id:
                 # Get the practice details
-                practice = self.get_practice(assignment.practice_id)
-                return practice
-                
+                return self.get_practice(practice_id)
+
             return None
         except Exception as e:
-            raise ValidationError(f"Failed to fetch user's practice: {str(e)}")
\ No newline at end of file
+            raise ValidationError(f"Failed to fetch user's practice: {str(e)}")
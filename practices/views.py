@@ -1,4 +1,5 @@
 # Create your views here.
+from django.utils.cache import get_conditional_response
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -8,9 +9,17 @@ from .serializers import (
     PracticeSerializer,
     PracticeDetailSerializer,
     PracticeUserAssignmentSerializer,
+    PracticeMemberQuerySerializer,
 )
 from utils.db_session import get_db_session
 from authentication.models import UserRoles
+from authentication.principal import invalidate_principals
+from campaigns.cache import invalidate_campaign_lists
+from .cache import (
+    PRACTICE_LIST_MAX_AGE,
+    get_practice_list,
+    invalidate_practice_lists,
+)
 from rest_framework.exceptions import ValidationError
 
 
@@ -29,21 +38,35 @@ class PracticeViewSet(viewsets.ViewSet):
         - Authenticated users: see all active practices
         - Unauthenticated users: see all active practices
         """
-        with get_db_session() as session:
-            service = PracticeService(session)
-
-            # Determine if we should include inactive practices
-            if (
-                request.user.is_authenticated
-                and request.user.role == UserRoles.SUPER_ADMIN
-            ):
-                # Super admin sees everything
-                practices = service.get_all_practices(include_inactive=True)
-            else:
-                # Everyone else only sees active practices
-                practices = service.get_all_practices(include_inactive=False)
+        # Super admin sees everything, everyone else only active practices
+        include_inactive = (
+            request.user.is_authenticated
+            and request.user.role == UserRoles.SUPER_ADMIN
+        )
 
-            return Response(PracticeSerializer(practices, many=True).data)
+        def build():
+            with get_db_session() as session:
+                practices = PracticeService(session).get_all_practices(
+                    include_inactive=include_inactive
+                )
+                return [
+                    dict(practice)
+                    for practice in PracticeSerializer(practices, many=True).data
+                ]
+
+        # Built lists are kept per worker and in the shared cache, so this
+        # only reaches the database after a practice changed
+        data, etag = get_practice_list(include_inactive, build)
+        response = Response(data)
+        response["ETag"] = etag
+        response["Cache-Control"] = (
+            "private, no-cache"
+            if include_inactive
+            else f"public, max-age={PRACTICE_LIST_MAX_AGE}"
+        )
+        # A 304 carrying the same headers when If-None-Match lists the ETag,
+        # weak or strong
+        return get_conditional_response(request, etag=etag, response=response)
 
     permission_classes = [IsAuthenticated]
 
@@ -74,6 +97,10 @@ class PracticeViewSet(viewsets.ViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def retrieve(self, request, pk=None):
+        query = PracticeMemberQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
         with get_db_session() as session:
             service = PracticeService(session)
             practice = service.get_practice(int(pk))
@@ -81,7 +108,18 @@ class PracticeViewSet(viewsets.ViewSet):
                 return Response(
                     {"error": "Practice not found"}, status=status.HTTP_404_NOT_FOUND
                 )
-            return Response(PracticeDetailSerializer(practice).data)
+            try:
+                members, next_cursor = service.get_practice_members(
+                    practice.id, query.validated_data
+                )
+            except ValidationError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            data = PracticeDetailSerializer(
+                practice, context={"members": members}
+            ).data
+            data["users_next_cursor"] = next_cursor
+            return Response(data)
 
     @action(detail=True, methods=["post"])
     def approve_user_assignment(self, request, pk=None):
@@ -157,9 +195,15 @@ class PracticeViewSet(viewsets.ViewSet):
                         status=status.HTTP_404_NOT_FOUND
                     )
                 
-                # Delete practicea
+                # Members' cached principals list the practice
+                member_ids = service.get_member_ids(practice.id)
+
+                # Delete practice
                 session.delete(practice)
                 session.commit()
+                invalidate_principals(member_ids)
+                invalidate_campaign_lists()
+                invalidate_practice_lists()
                 return Response(status=status.HTTP_204_NO_CONTENT)
         except Exception as e:
             return Response(
@@ -172,7 +216,7 @@ class PracticeViewSet(viewsets.ViewSet):
         try:
             with get_db_session() as session:
                 service = PracticeService(session)
-                practice = service.get_user_practice(request.user.id)
+                practice = service.get_user_practice(request.user)
                 
                 if not practice:
                     return Response(
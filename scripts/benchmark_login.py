@@ -0,0 +1,85 @@
+"""
+Login throughput under concurrent load.
+
+Runs bursts of concurrent logins on one event loop, as an ASGI worker
+would, once verifying passwords inline and once on the bounded bcrypt
+pool. Alongside the logins, a stream of cheap requests measures how long
+the event loop is held up.
+
+    python scripts/benchmark_login.py --logins 64 --concurrency 16 --rounds 12
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def run(verify, hashed: str, logins: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    delays = []
+    done = asyncio.Event()
+
+    async def login():
+        async with semaphore:
+            assert await verify("secret", hashed)
+
+    async def ping():
+        # A cheap request every 10ms; its lateness is the time the event
+        # loop spent blocked
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            delays.append(time.perf_counter() - started - 0.01)
+
+    pinger = asyncio.create_task(ping())
+    started = time.perf_counter()
+    await asyncio.gather(*[login() for _ in range(logins)])
+    elapsed = time.perf_counter() - started
+    done.set()
+    await pinger
+
+    delays.sort()
+    p95 = delays[int(len(delays) * 0.95) - 1] if delays else 0.0
+    return logins / elapsed, p95 * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    from django.conf import settings
+
+    settings.configure(
+        BCRYPT_ROUNDS=args.rounds, PASSWORD_HASHING_WORKERS=args.workers
+    )
+    from authentication import passwords
+
+    hashed = passwords.hash_password("secret")
+
+    async def inline(raw_password, hashed):
+        return passwords.check_password(raw_password, hashed)
+
+    print(
+        f"{args.logins} logins, {args.concurrency} concurrent, "
+        f"cost {args.rounds}, {passwords.hashing_workers()} hashing threads"
+    )
+    for name, verify in (("inline", inline), ("pool", passwords.averify_password)):
+        throughput, p95 = asyncio.run(
+            run(verify, hashed, args.logins, args.concurrency)
+        )
+        print(
+            f"{name:>6}: {throughput:8.1f} logins/s, "
+            f"p95 event loop delay {p95:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
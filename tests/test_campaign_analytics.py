@@ -0,0 +1,273 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIRequestFactory, force_authenticate
+from authentication.models import User, UserRoles
+from practices.models import Practice, PracticeUserAssignment
+from campaigns import analytics
+from campaigns.analytics import (
+    MAX_SERIES_POINTS,
+    OVERFLOW_BUCKET,
+    CampaignStatsService,
+    ReadActivityService,
+    bucket_start,
+    latency_bucket,
+    latency_percentiles,
+)
+from campaigns.models import (
+    Campaign,
+    CampaignPracticeAssociation,
+    CampaignReadActivity,
+    CampaignReadLatency,
+    CampaignStats,
+    PracticeReadActivity,
+)
+from campaigns.views import CampaignViewSet
+from usermessages.models import UserMessage
+from tests.utils.database import (  # noqa: F401
+    db_session_scope,
+    engine,
+    session_factory,
+)
+
+DELIVERED_AT = datetime(2026, 3, 4, 9, 0, tzinfo=timezone.utc)
+
+
+class TestReadLatencyHistogram:
+    def test_latency_bucket(self):
+        assert latency_bucket(0) == 60
+        assert latency_bucket(60) == 60
+        assert latency_bucket(61) == 300
+        assert latency_bucket(30 * 24 * 60 * 60) == OVERFLOW_BUCKET
+
+    def test_percentiles_without_reads(self):
+        assert latency_percentiles({}) == {"p50": None, "p90": None, "p99": None}
+
+    def test_percentiles_from_histogram(self):
+        histogram = {60: 50, 300: 40, 3600: 9, OVERFLOW_BUCKET: 1}
+
+        percentiles = latency_percentiles(histogram)
+
+        assert percentiles["p50"] == 60
+        assert percentiles["p90"] == 300
+        assert percentiles["p99"] == 3600
+
+    def test_percentile_in_overflow_bucket(self):
+        percentiles = latency_percentiles({60: 1, OVERFLOW_BUCKET: 9}, (50,))
+        assert percentiles == {"p50": None}
+
+
+class TestReadActivityBuckets:
+    def test_bucket_start_hour(self):
+        value = datetime(2025, 3, 4, 15, 42, 10, tzinfo=timezone.utc)
+        assert bucket_start(value, "HOUR") == datetime(
+            2025, 3, 4, 15, tzinfo=timezone.utc
+        )
+
+    def test_bucket_start_day_normalises_timezone(self):
+        value = datetime(2025, 3, 4, 1, 30, tzinfo=timezone(timedelta(hours=5)))
+        assert bucket_start(value, "DAY") == datetime(
+            2025, 3, 3, tzinfo=timezone.utc
+        )
+
+
+@pytest.fixture
+def session(session_factory, db_session_scope, monkeypatch):
+    monkeypatch.setattr("campaigns.views.get_db_session", db_session_scope)
+    session = session_factory()
+    session.add_all(
+        [
+            User(
+                id=1,
+                username="superadmin",
+                email="superadmin@example.com",
+                password="x",
+                role=UserRoles.SUPER_ADMIN,
+            ),
+            User(
+                id=2,
+                username="admin",
+                email="admin@example.com",
+                password="x",
+                role=UserRoles.ADMIN,
+            ),
+            Practice(id=1, name="North"),
+            Practice(id=2, name="South"),
+        ]
+    )
+    for user_id in range(3, 7):
+        session.add(
+            User(
+                id=user_id,
+                username=f"user{user_id}",
+                email=f"user{user_id}@example.com",
+                password="x",
+            )
+        )
+        session.add(PracticeUserAssignment(user_id=user_id, practice_id=1 + user_id % 2))
+    for campaign_id in (10, 11, 12):
+        session.add(
+            Campaign(
+                id=campaign_id,
+                name=f"Campaign {campaign_id}",
+                content="Hello",
+                # Campaign 12 is another user's CUSTOM campaign for admins
+                campaign_type="CUSTOM" if campaign_id == 12 else "DEFAULT",
+                delivery_type="IMMEDIATE",
+                status="COMPLETED" if campaign_id < 12 else "DRAFT",
+                created_by=1,
+                target_roles=[UserRoles.PRACTICE_USER],
+                practice_associations=[CampaignPracticeAssociation(practice_id=1)],
+            )
+        )
+    session.commit()
+    yield session
+    session.close()
+
+
+def call(action, user_id, query="", pk=10):
+    view = CampaignViewSet.as_view({"get": action})
+    request = APIRequestFactory().get(f"/api/campaign/{pk}/{action}/{query}")
+    role = UserRoles.SUPER_ADMIN if user_id == 1 else UserRoles.ADMIN
+    force_authenticate(request, user=User(id=user_id, role=role))
+    return view(request, pk=str(pk))
+
+
+def test_record_methods_upsert_the_rollup(session):
+    stats = CampaignStatsService(session)
+    stats.record_delivery(10, 3, DELIVERED_AT)
+    stats.record_delivery(10, 1, DELIVERED_AT + timedelta(hours=1))
+    stats.record_delivery(10, 0, DELIVERED_AT + timedelta(hours=2))
+    stats.record_read(10, DELIVERED_AT, DELIVERED_AT + timedelta(seconds=30))
+    stats.record_read(10, DELIVERED_AT, DELIVERED_AT + timedelta(seconds=45))
+    stats.record_read(10, DELIVERED_AT, DELIVERED_AT + timedelta(hours=2))
+    stats.record_read(10, None, DELIVERED_AT)
+    stats.record_delete(10)
+    session.commit()
+
+    assert session.query(CampaignStats).count() == 1
+    assert dict(
+        session.query(CampaignReadLatency.bucket, CampaignReadLatency.reads)
+    ) == {60: 2, 3 * 60 * 60: 1}
+    result = stats.get_stats(10)
+    assert result["delivered_count"] == 4
+    assert result["read_count"] == 4
+    assert result["deleted_count"] == 1
+    assert result["read_rate"] == 1.0
+    assert result["first_read_latency"] == {"p50": 60, "p90": 10800, "p99": 10800}
+    assert result["last_delivered_at"].hour == 10
+    assert stats.get_stats(11)["delivered_count"] == 0
+
+
+def test_reconcile_rebuilds_completed_campaigns_in_batches(session, monkeypatch):
+    monkeypatch.setattr(analytics, "RECONCILE_BATCH_SIZE", 1)
+    for campaign_id in (10, 11, 12):
+        for user_id in range(3, 7):
+            read = user_id % 2 == 1
+            session.add(
+                UserMessage(
+                    user_id=user_id,
+                    campaign_id=campaign_id,
+                    content="Hello",
+                    created_at=DELIVERED_AT,
+                    is_read=read,
+                    read_at=DELIVERED_AT + timedelta(minutes=user_id**2) if read else None,
+                    is_deleted=user_id == 6,
+                )
+            )
+    # Drifted counters and a stale histogram bucket are overwritten
+    stats = CampaignStatsService(session)
+    stats.record_delivery(10, 99, DELIVERED_AT)
+    stats.record_read(10, DELIVERED_AT, DELIVERED_AT + timedelta(days=30))
+    session.commit()
+    commits = []
+    monkeypatch.setattr(session, "commit", lambda: commits.append(1))
+
+    assert stats.reconcile() == 2
+    assert len(commits) == 2
+    assert session.get(CampaignStats, 12) is None
+    for campaign_id in (10, 11):
+        result = stats.get_stats(campaign_id)
+        assert (result["delivered_count"], result["read_count"]) == (4, 2)
+        assert result["deleted_count"] == 1
+        assert result["reconciled_at"] is not None
+    assert dict(
+        session.query(CampaignReadLatency.bucket, CampaignReadLatency.reads).filter_by(
+            campaign_id=10
+        )
+    ) == {15 * 60: 1, 30 * 60: 1}
+
+
+def test_stats_endpoint(session):
+    CampaignStatsService(session).record_delivery(10, 4, DELIVERED_AT)
+    CampaignStatsService(session).record_read(10, DELIVERED_AT, DELIVERED_AT)
+    session.commit()
+
+    response = call("stats", 1)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["delivered_count"] == 4
+    assert response.data["read_rate"] == 0.25
+
+    assert call("stats", 2, pk=12).status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_record_read_fills_hour_and_day_buckets(session):
+    activity = ReadActivityService(session)
+    activity.record_read(10, 3, datetime(2026, 3, 4, 9, 5, tzinfo=timezone.utc))
+    activity.record_read(10, 5, datetime(2026, 3, 4, 9, 55, tzinfo=timezone.utc))
+    activity.record_read(10, 4, datetime(2026, 3, 4, 11, 0, tzinfo=timezone.utc))
+    session.commit()
+
+    campaign_rows = {
+        (row.granularity, row.bucket_start.hour): row.reads
+        for row in session.query(CampaignReadActivity)
+    }
+    assert campaign_rows == {("HOUR", 9): 2, ("HOUR", 11): 1, ("DAY", 0): 3}
+    # Only user 4 is assigned to the campaign's practice
+    assert {
+        (row.practice_id, row.granularity): row.reads
+        for row in session.query(PracticeReadActivity)
+    } == {(1, "HOUR"): 1, (1, "DAY"): 1}
+
+    series = activity.campaign_series(
+        10,
+        "HOUR",
+        datetime(2026, 3, 4, 8, 30, tzinfo=timezone.utc),
+        datetime(2026, 3, 4, 11, 10, tzinfo=timezone.utc),
+    )
+    assert [point["reads"] for point in series] == [0, 2, 0, 1]
+
+
+def test_series_is_capped(session):
+    activity = ReadActivityService(session)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    last = start + timedelta(hours=MAX_SERIES_POINTS - 1)
+
+    assert len(activity.campaign_series(10, "HOUR", start, last)) == MAX_SERIES_POINTS
+    with pytest.raises(ValidationError, match="Range too large"):
+        activity.campaign_series(10, "HOUR", start, last + timedelta(hours=1))
+
+
+def test_read_activity_endpoint_validates_the_range(session):
+    ReadActivityService(session).record_read(10, 4, DELIVERED_AT)
+    session.commit()
+
+    response = call(
+        "read_activity",
+        1,
+        "?granularity=day&start=2026-03-03T00:00:00Z&end=2026-03-05T12:00:00Z",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["granularity"] == "DAY"
+    assert [point["reads"] for point in response.data["series"]] == [0, 1, 0]
+
+    response = call(
+        "read_activity", 1, "?start=2026-03-05T00:00:00Z&end=2026-03-04T00:00:00Z"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "start" in response.data
+
+    response = call("read_activity", 1, "?granularity=HOUR&start=2020-01-01T00:00:00Z")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "Range too large" in response.data["error"]
@@ -0,0 +1,128 @@
+import pytest
+from datetime import datetime, timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIRequestFactory, force_authenticate
+from authentication.models import User, UserRoles
+from practices.models import Practice
+from campaigns.models import (
+    Campaign,
+    CampaignHistory,
+    CampaignPracticeAssociation,
+    CampaignSchedule,
+)
+from campaigns.services import CampaignService
+from campaigns.views import CampaignViewSet
+from tests.utils.database import (  # noqa: F401
+    db_session_scope,
+    engine,
+    session_factory,
+)
+
+
+@pytest.fixture
+def session(session_factory):
+    session = session_factory()
+    session.add(
+        User(
+            id=1,
+            username="superadmin",
+            email="superadmin@example.com",
+            password="x",
+            role=UserRoles.SUPER_ADMIN,
+            is_active=True,
+        )
+    )
+    session.add_all(
+        Practice(id=practice_id, name=f"Practice {practice_id}")
+        for practice_id in range(1, 6)
+    )
+    session.add(
+        Campaign(
+            id=10,
+            name="Reminder",
+            content="See you soon",
+            campaign_type="DEFAULT",
+            delivery_type="SCHEDULED",
+            status="COMPLETED",
+            created_by=1,
+            target_roles=[UserRoles.PRACTICE_USER],
+            practice_associations=[
+                CampaignPracticeAssociation(practice_id=1),
+                CampaignPracticeAssociation(practice_id=2),
+            ],
+            schedules=[
+                CampaignSchedule(
+                    scheduled_date=datetime(2099, 1, 1, tzinfo=timezone.utc)
+                )
+            ],
+        )
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_clone_into_many_practices(session):
+    user = session.query(User).get(1)
+
+    clone_ids = CampaignService(session).clone_campaign(
+        10, user, practice_ids=[3, 4, 5], include_schedule=True
+    )
+
+    clones = session.query(Campaign).filter(Campaign.id.in_(clone_ids)).all()
+    assert sorted(c.name for c in clones) == [
+        "Copy of Reminder - Practice 3",
+        "Copy of Reminder - Practice 4",
+        "Copy of Reminder - Practice 5",
+    ]
+    for clone in clones:
+        assert clone.copied_from == 10
+        assert clone.status == "DRAFT"
+        assert clone.content == "See you soon"
+        assert clone.target_roles == [UserRoles.PRACTICE_USER]
+        assert [a.practice.name for a in clone.practice_associations] == [
+            clone.name.split(" - ")[1]
+        ]
+        assert len(clone.schedules) == 1
+    assert session.query(CampaignHistory).count() == 3
+
+
+def test_single_clone_keeps_source_practices(session):
+    user = session.query(User).get(1)
+
+    [clone_id] = CampaignService(session).clone_campaign(10, user, name="Again")
+
+    clone = session.query(Campaign).get(clone_id)
+    assert clone.name == "Again"
+    assert clone.delivery_type == "IMMEDIATE"
+    assert sorted(a.practice_id for a in clone.practice_associations) == [1, 2]
+    assert clone.schedules == []
+
+
+def test_clone_rejects_taken_name(session):
+    user = session.query(User).get(1)
+
+    with pytest.raises(ValidationError):
+        CampaignService(session).clone_campaign(10, user, name="Reminder")
+
+
+def test_clone_endpoint_returns_the_copies(session, db_session_scope, monkeypatch):
+    monkeypatch.setattr("campaigns.views.get_db_session", db_session_scope)
+    request = APIRequestFactory().post(
+        "/api/campaign/10/clone/", {"practice_ids": [3, 4]}, format="json"
+    )
+    force_authenticate(request, user=session.query(User).get(1))
+
+    response = CampaignViewSet.as_view({"post": "clone"})(request, pk="10")
+
+    assert response.status_code == status.HTTP_201_CREATED, response.data
+    assert [clone["name"] for clone in response.data] == [
+        "Copy of Reminder - Practice 3",
+        "Copy of Reminder - Practice 4",
+    ]
+    assert [clone["target_practices"] for clone in response.data] == [
+        [{"id": 3, "name": "Practice 3"}],
+        [{"id": 4, "name": "Practice 4"}],
+    ]
+    assert all(clone["status"] == "DRAFT" for clone in response.data)
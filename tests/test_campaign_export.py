@@ -0,0 +1,176 @@
+import csv
+import io
+import sys
+from datetime import datetime, timezone
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+from authentication.models import User, UserRoles
+from practices.models import Practice, PracticeUserAssignment
+from campaigns.exports import EXPORT_COLUMNS, RecipientExportService
+from campaigns.models import Campaign, CampaignPracticeAssociation
+from campaigns.views import CampaignViewSet
+from usermessages.models import UserMessage
+from tests.utils.database import (  # noqa: F401
+    db_session_scope,
+    engine,
+    session_factory,
+)
+
+DELIVERED_AT = datetime(2026, 1, 1, 9, 0)
+READ_AT = datetime(2026, 1, 1, 10, 30)
+
+
+@pytest.fixture(autouse=True)
+def seeded(db_session_scope, monkeypatch):
+    monkeypatch.setattr("campaigns.views.get_db_session", db_session_scope)
+    monkeypatch.setattr("campaigns.exports.get_db_session", db_session_scope)
+    with db_session_scope() as session:
+        session.add_all(
+            [
+                User(
+                    id=1,
+                    username="superadmin",
+                    email="superadmin@example.com",
+                    password="x",
+                    role=UserRoles.SUPER_ADMIN,
+                ),
+                User(
+                    id=2,
+                    username="admin",
+                    email="admin@example.com",
+                    password="x",
+                    role=UserRoles.ADMIN,
+                ),
+                Practice(id=1, name="North"),
+                Practice(id=2, name="South"),
+            ]
+        )
+        for user_id in range(3, 8):
+            session.add(
+                User(
+                    id=user_id,
+                    username=f"user{user_id}",
+                    email=f"user{user_id}@example.com",
+                    full_name=f"User {user_id}",
+                    password="x",
+                )
+            )
+            session.add(
+                PracticeUserAssignment(user_id=user_id, practice_id=1 + user_id % 2)
+            )
+        session.add(
+            Campaign(
+                id=10,
+                name="Private",
+                content="Hello",
+                campaign_type="CUSTOM",
+                delivery_type="IMMEDIATE",
+                created_by=1,
+                target_roles=[UserRoles.PRACTICE_USER],
+                practice_associations=[
+                    CampaignPracticeAssociation(practice_id=1),
+                    CampaignPracticeAssociation(practice_id=2),
+                ],
+            )
+        )
+        session.flush()
+        session.add_all(
+            UserMessage(
+                user_id=user_id,
+                campaign_id=10,
+                content="Hello",
+                created_at=DELIVERED_AT,
+                is_read=user_id == 4,
+                read_at=READ_AT if user_id == 4 else None,
+            )
+            for user_id in range(3, 8)
+        )
+
+
+def export(user_id, query=""):
+    view = CampaignViewSet.as_view({"get": "export"})
+    request = APIRequestFactory().get(f"/api/campaign/10/export/{query}")
+    force_authenticate(request, user=User(id=user_id, role=role_of(user_id)))
+    return view(request, pk="10")
+
+
+def role_of(user_id):
+    return {1: UserRoles.SUPER_ADMIN, 2: UserRoles.ADMIN}.get(
+        user_id, UserRoles.PRACTICE_USER
+    )
+
+
+def read_csv(text):
+    return list(csv.reader(io.StringIO(text)))
+
+
+def test_csv_export_streams_every_recipient(session_factory):
+    response = export(1)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "text/csv"
+    assert "campaign_10_recipients.csv" in response["Content-Disposition"]
+    rows = read_csv(b"".join(response.streaming_content).decode())
+    assert rows[0] == EXPORT_COLUMNS
+    assert [row[1] for row in rows[1:]] == ["3", "4", "5", "6", "7"]
+    # The recipient's practice comes from the campaign's targeted practices
+    assert [row[5] for row in rows[1:3]] == ["South", "North"]
+    assert rows[2][7].startswith("2026-01-01T10:30")
+    assert rows[1][7] == ""
+
+    batches = list(
+        RecipientExportService(session_factory()).iter_batches(10, batch_size=2)
+    )
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_export_hides_campaigns_the_user_may_not_see():
+    # Admins only see DEFAULT campaigns and their own CUSTOM ones
+    assert export(2).status_code == status.HTTP_404_NOT_FOUND
+    assert export(3).status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_parquet_export_without_pyarrow(monkeypatch):
+    # A None entry makes the import raise ImportError
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    response = export(1, "?output=parquet")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "pyarrow" in response.data["error"]
+
+    assert export(1, "?output=xlsx").status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_command_writes_csv_to_stdout(capsys):
+    call_command("export_campaign_recipients", 10)
+
+    rows = read_csv(capsys.readouterr().out)
+    assert rows[0] == EXPORT_COLUMNS
+    assert len(rows) == 6
+
+
+def test_command_writes_csv_to_file(tmp_path):
+    path = tmp_path / "recipients.csv"
+    stderr = io.StringIO()
+
+    call_command("export_campaign_recipients", 10, file=str(path), stderr=stderr)
+
+    assert len(read_csv(path.read_text())) == 6
+    assert str(path) in stderr.getvalue()
+
+
+def test_command_parquet_needs_a_file_and_pyarrow(tmp_path, monkeypatch):
+    with pytest.raises(CommandError, match="--file is required"):
+        call_command("export_campaign_recipients", 10, output_format="parquet")
+
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(CommandError, match="requires the pyarrow package"):
+        call_command(
+            "export_campaign_recipients",
+            10,
+            output_format="parquet",
+            file=str(tmp_path / "recipients.parquet"),
+        )
@@ -0,0 +1,104 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import event
+from authentication.models import User, UserRoles
+from practices.models import Practice
+from campaigns.models import Campaign, CampaignHistory
+from campaigns.services import CampaignService
+from tests.utils.database import engine, session_factory  # noqa: F401
+
+
+@pytest.fixture
+def session(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def super_admin(session):
+    user = User(
+        id=1,
+        username="superadmin",
+        email="superadmin@example.com",
+        password="x",
+        role=UserRoles.SUPER_ADMIN,
+        is_active=True,
+    )
+    session.add_all([user, Practice(id=1, name="Practice 1")])
+    session.commit()
+    return user
+
+
+def create(session, user):
+    return CampaignService(session).create_campaign(
+        {
+            "name": "Welcome",
+            "content": "Hello",
+            "delivery_type": "IMMEDIATE",
+            "target_roles": [UserRoles.PRACTICE_USER],
+            "target_practices": [1],
+        },
+        user,
+    )
+
+
+def count_commits(session):
+    commits = []
+    event.listen(session, "after_commit", lambda s: commits.append(s))
+    return commits
+
+
+def test_create_commits_once_with_its_history(session, super_admin):
+    commits = count_commits(session)
+
+    campaign = create(session, super_admin)
+
+    assert len(commits) == 1
+    actions = [
+        h.action
+        for h in session.query(CampaignHistory).filter_by(campaign_id=campaign.id)
+    ]
+    assert actions == ["CREATED"]
+
+
+def test_delete_keeps_audit_record(session, super_admin):
+    campaign = create(session, super_admin)
+    campaign_id = campaign.id
+    commits = count_commits(session)
+
+    CampaignService(session).delete_campaign(campaign_id, super_admin)
+
+    assert len(commits) == 1
+    assert session.query(Campaign).get(campaign_id) is None
+    actions = [
+        h.action
+        for h in session.query(CampaignHistory)
+        .filter_by(campaign_id=campaign_id)
+        .order_by(CampaignHistory.id)
+    ]
+    assert actions == ["CREATED", "DELETED"]
+
+
+def test_history_pages_newest_first(session, super_admin):
+    # Explicit timestamps, SQLite's CURRENT_TIMESTAMP only has seconds
+    session.add_all(
+        CampaignHistory(
+            campaign_id=7,
+            action="UPDATED",
+            details=f"edit {index}",
+            performed_by=super_admin.id,
+            created_at=datetime(2025, 1, 1, minute=index % 3),
+        )
+        for index in range(5)
+    )
+    session.commit()
+    service = CampaignService(session)
+
+    first, cursor = service.get_history(7, {"limit": 3}, load=("performer",))
+    rest, last_cursor = service.get_history(7, {"limit": 3, "cursor": cursor})
+
+    details = [h.details for h in first + rest]
+    assert details == ["edit 2", "edit 4", "edit 1", "edit 3", "edit 0"]
+    assert first[0].performer.id == super_admin.id
+    assert last_cursor is None
@@ -0,0 +1,105 @@
+import io
+import pytest
+from authentication.models import User, UserRoles
+from practices.models import Practice
+from campaigns.models import Campaign, CampaignPracticeAssociation, CampaignSchedule
+from campaigns.imports import CampaignImportService, parse_csv
+from tests.utils.database import engine, session_factory  # noqa: F401
+
+
+@pytest.fixture
+def session(session_factory):
+    session = session_factory()
+    session.add_all(
+        [
+            User(
+                id=1,
+                username="superadmin",
+                email="superadmin@example.com",
+                password="x",
+                role=UserRoles.SUPER_ADMIN,
+                is_active=True,
+            ),
+            Practice(id=1, name="Practice 1"),
+            Practice(id=2, name="Practice 2"),
+            Campaign(
+                name="Existing",
+                content="Hi",
+                campaign_type="DEFAULT",
+                delivery_type="IMMEDIATE",
+                created_by=1,
+                target_roles=[UserRoles.PRACTICE_USER],
+            ),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def row(name, **overrides):
+    data = {
+        "name": name,
+        "content": "Hello",
+        "delivery_type": "IMMEDIATE",
+        "target_roles": [UserRoles.PRACTICE_USER],
+        "target_practices": [1, 2],
+    }
+    data.update(overrides)
+    return data
+
+
+def test_import_creates_campaigns_in_one_transaction(session):
+    user = session.query(User).get(1)
+    rows = [row(f"Campaign {index}") for index in range(20)]
+    rows.append(
+        row(
+            "Scheduled",
+            delivery_type="SCHEDULED",
+            scheduled_date="2099-01-01T09:00:00Z",
+        )
+    )
+
+    created, errors = CampaignImportService(session).import_campaigns(rows, user)
+
+    assert errors == []
+    assert [c["name"] for c in created] == [r["name"] for r in rows]
+    assert session.query(Campaign).count() == 22
+    assert session.query(CampaignPracticeAssociation).count() == 42
+    assert session.query(CampaignSchedule).count() == 1
+
+
+def test_import_reports_row_errors_and_writes_nothing(session):
+    user = session.query(User).get(1)
+    rows = [
+        row("New"),
+        row("Existing"),
+        row("Twice"),
+        row("Twice"),
+        row("Bad practice", target_practices=[1, 99]),
+        row("Missing content", content=""),
+    ]
+
+    created, errors = CampaignImportService(session).import_campaigns(rows, user)
+
+    assert created == []
+    assert [error["row"] for error in errors] == [2, 3, 4, 5, 6]
+    assert "practice" in errors[3]["errors"]["target_practices"][0].lower()
+    assert session.query(Campaign).count() == 1
+
+
+def test_parse_csv_splits_list_cells():
+    upload = io.BytesIO(
+        b"name,content,delivery_type,target_roles,target_practices\r\n"
+        b"Reminder,Hello,IMMEDIATE,Practice User,1;2\r\n"
+    )
+
+    assert parse_csv(upload) == [
+        {
+            "name": "Reminder",
+            "content": "Hello",
+            "delivery_type": "IMMEDIATE",
+            "target_roles": ["Practice User"],
+            "target_practices": ["1", "2"],
+        }
+    ]
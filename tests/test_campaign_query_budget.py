@@ -0,0 +1,135 @@
+import pytest
+from datetime import datetime, timezone
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+from authentication.models import User, UserRoles
+from practices.models import Practice
+from campaigns.models import Campaign, CampaignPracticeAssociation, CampaignSchedule
+from campaigns.views import CampaignViewSet
+from campaigns.cache import invalidate_campaign_lists
+from utils.cache import require_shared_cache
+from tests.utils.query_counter import QueryCounter
+from tests.utils.database import (  # noqa: F401
+    db_session_scope,
+    engine,
+    session_factory,
+)
+
+
+# Statements each endpoint may issue, whatever the number of campaigns
+QUERY_BUDGET = {"list": 2, "my_campaign": 2, "retrieve": 1}
+
+
+@pytest.fixture(autouse=True)
+def views_on_test_database(db_session_scope, monkeypatch):
+    monkeypatch.setattr("campaigns.views.get_db_session", db_session_scope)
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def seed(session_factory, campaign_count):
+    session = session_factory()
+    user = User(
+        id=1,
+        username="superadmin",
+        email="superadmin@example.com",
+        password="x",
+        role=UserRoles.SUPER_ADMIN,
+        is_active=True,
+    )
+    session.add(user)
+    session.add_all(
+        Practice(id=practice_id, name=f"Practice {practice_id}")
+        for practice_id in range(1, 4)
+    )
+    for campaign_id in range(1, campaign_count + 1):
+        session.add(
+            Campaign(
+                id=campaign_id,
+                name=f"Campaign {campaign_id}",
+                content="Hello",
+                campaign_type="DEFAULT",
+                delivery_type="SCHEDULED",
+                created_by=user.id,
+                target_roles=[UserRoles.PRACTICE_USER],
+                practice_associations=[
+                    CampaignPracticeAssociation(
+                        id=campaign_id * 10 + practice_id, practice_id=practice_id
+                    )
+                    for practice_id in (1, 2)
+                ],
+                schedules=[
+                    CampaignSchedule(
+                        id=campaign_id,
+                        scheduled_date=datetime(2030, 1, 1, tzinfo=timezone.utc),
+                    )
+                ],
+            )
+        )
+    session.commit()
+    session.close()
+    return user
+
+
+def call(action, user, pk=None):
+    view = CampaignViewSet.as_view({"get": action})
+    path = f"/api/campaign/{pk}/" if pk else "/api/campaign/"
+    request = APIRequestFactory().get(path)
+    force_authenticate(request, user=user)
+    return view(request, pk=pk) if pk else view(request)
+
+
+@pytest.mark.parametrize("campaign_count", [3, 40])
+@pytest.mark.parametrize("action", ["list", "my_campaign"])
+def test_listing_query_budget(engine, session_factory, campaign_count, action):
+    user = seed(session_factory, campaign_count)
+
+    with QueryCounter(engine) as queries:
+        response = call(action, user)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == campaign_count
+    assert all(len(c["target_practices"]) == 2 for c in response.data["results"])
+    assert queries.count == QUERY_BUDGET[action], queries.statements
+
+
+def test_retrieve_query_budget(engine, session_factory):
+    user = seed(session_factory, 5)
+
+    with QueryCounter(engine) as queries:
+        response = call("retrieve", user, pk="3")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["creator"]["id"] == user.id
+    assert response.data["scheduled_date"].startswith("2030-01-01")
+    assert len(response.data["practice_associations"]) == 2
+    assert queries.count == QUERY_BUDGET["retrieve"], queries.statements
+
+
+def test_listing_served_from_cache_until_invalidated(engine, session_factory):
+    user = seed(session_factory, 3)
+    call("list", user)
+
+    with QueryCounter(engine) as queries:
+        response = call("list", user)
+    assert queries.count == 0, queries.statements
+    assert len(response.data["results"]) == 3
+
+    invalidate_campaign_lists()
+    with QueryCounter(engine) as queries:
+        response = call("list", user)
+    assert queries.count == QUERY_BUDGET["list"], queries.statements
+
+
+def test_versioned_caches_need_a_shared_backend():
+    with override_settings(REQUIRE_SHARED_CACHE=True):
+        with pytest.raises(ImproperlyConfigured, match="not shared"):
+            require_shared_cache()
+
+        redis = {"BACKEND": "django.core.cache.backends.redis.RedisCache"}
+        with override_settings(CACHES={"default": redis}):
+            require_shared_cache()
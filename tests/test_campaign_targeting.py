@@ -0,0 +1,108 @@
+import pytest
+from rest_framework.exceptions import ValidationError
+from authentication.models import User, UserRoles
+from practices.models import Practice, PracticeUserAssignment
+from campaigns.models import Campaign, CampaignPracticeAssociation
+from campaigns.services import CampaignService
+from tests.utils.query_counter import QueryCounter
+from tests.utils.database import engine, session_factory  # noqa: F401
+
+
+@pytest.fixture
+def session(session_factory):
+    session = session_factory()
+    session.add(
+        User(
+            id=1,
+            username="superadmin",
+            email="superadmin@example.com",
+            password="x",
+            role=UserRoles.SUPER_ADMIN,
+            is_active=True,
+        )
+    )
+    session.add_all(
+        Practice(id=practice_id, name=f"Practice {practice_id}")
+        for practice_id in range(1, 501)
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_update_diffs_associations_in_a_few_queries(engine, session):
+    user = session.query(User).get(1)
+    service = CampaignService(session)
+    campaign = service.create_campaign(
+        {
+            "name": "Reminder",
+            "content": "Hello",
+            "delivery_type": "IMMEDIATE",
+            "target_roles": [UserRoles.PRACTICE_USER],
+            "target_practices": list(range(1, 301)),
+        },
+        user,
+    )
+    kept = {
+        a.id: a.practice_id
+        for a in campaign.practice_associations
+        if a.practice_id >= 200
+    }
+
+    with QueryCounter(engine) as queries:
+        service.update_campaign(
+            campaign.id, {"target_practices": list(range(200, 501))}, user
+        )
+
+    assert queries.count <= 10, queries.statements
+    associations = session.query(CampaignPracticeAssociation).all()
+    assert sorted(a.practice_id for a in associations) == list(range(200, 501))
+    assert {a.id: a.practice_id for a in associations if a.id in kept} == kept
+
+
+def test_unknown_practices_are_reported_together(session):
+    user = session.query(User).get(1)
+
+    with pytest.raises(ValidationError, match="998, 999"):
+        CampaignService(session).create_campaign(
+            {
+                "name": "Reminder",
+                "content": "Hello",
+                "delivery_type": "IMMEDIATE",
+                "target_roles": [UserRoles.PRACTICE_USER],
+                "target_practices": [1, 999, 998],
+            },
+            user,
+        )
+    assert session.query(Campaign).count() == 0
+
+
+def test_admin_create_uses_the_principal_practice(engine, session):
+    session.add(
+        User(
+            id=2,
+            username="admin",
+            email="admin@example.com",
+            password="x",
+            role=UserRoles.ADMIN,
+            is_active=True,
+        )
+    )
+    session.add(PracticeUserAssignment(user_id=2, practice_id=7))
+    session.commit()
+    # The request principal carries the admin's assignments
+    admin = User(id=2, role=UserRoles.ADMIN, assigned_practice_ids=[7])
+
+    with QueryCounter(engine) as queries:
+        campaign = CampaignService(session).create_campaign(
+            {
+                "name": "Reminder",
+                "content": "Hello",
+                "delivery_type": "IMMEDIATE",
+                "target_roles": [UserRoles.PRACTICE_USER],
+            },
+            admin,
+        )
+
+    assert not [s for s in queries.statements if "practice_user_assignments" in s]
+    assert [a.practice_id for a in campaign.practice_associations] == [7]
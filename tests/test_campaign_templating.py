@@ -0,0 +1,145 @@
+import pytest
+from datetime import datetime, timezone
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from authentication.models import User, UserRoles
+from practices.models import Practice, PracticeUserAssignment
+from campaigns.models import Campaign, CampaignPracticeAssociation
+from campaigns import delivery
+from campaigns.delivery import CampaignDeliveryService
+from campaigns.templating import compile_template
+from usermessages.models import UserMessage
+from tests.utils.query_counter import QueryCounter
+from tests.utils.database import engine, session_factory  # noqa: F401
+
+
+class TestCompiledTemplate:
+    def test_static_content_is_not_rendered(self):
+        template = compile_template("Hello {there}")
+
+        assert template.is_static
+        assert template.render_batch({}, 2) == ["Hello {there}", "Hello {there}"]
+
+    def test_render_batch_from_columns(self):
+        template = compile_template(
+            "Hi {{ user.full_name }} of {{practice.name}}, {ok} {{ user.full_name }}"
+        )
+
+        assert template.fields == ("user.full_name", "practice.name")
+        assert template.render_batch(
+            {"user.full_name": ["Ann", "Bo"], "practice.name": ["North", "South"]}, 2
+        ) == ["Hi Ann of North, {ok} Ann", "Hi Bo of South, {ok} Bo"]
+
+    def test_unknown_placeholder(self):
+        with pytest.raises(ValidationError):
+            compile_template("Hi {{ user.password }}")
+
+
+@pytest.fixture
+def session(session_factory):
+    session = session_factory()
+    session.add_all(
+        [Practice(id=1, name="North"), Practice(id=2, name="South")]
+        + [
+            User(
+                id=user_id,
+                username=f"user{user_id}",
+                email=f"user{user_id}@example.com",
+                full_name=None if user_id == 3 else f"User {user_id}",
+                password="x",
+                role=UserRoles.PRACTICE_USER,
+                is_active=True,
+                is_approved=True,
+            )
+            for user_id in range(1, 5)
+        ]
+        + [
+            PracticeUserAssignment(user_id=user_id, practice_id=1 + user_id % 2)
+            for user_id in range(1, 5)
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def add_campaign(session, campaign_id, content, practice_id=2):
+    campaign = Campaign(
+        id=campaign_id,
+        name=f"Campaign {campaign_id}",
+        content=content,
+        campaign_type="DEFAULT",
+        delivery_type="IMMEDIATE",
+        created_by=1,
+        target_roles=[UserRoles.PRACTICE_USER],
+        practice_associations=[CampaignPracticeAssociation(practice_id=practice_id)],
+    )
+    session.add(campaign)
+    session.commit()
+    return campaign
+
+
+def contents(session, campaign_id):
+    return [
+        m.content
+        for m in session.query(UserMessage)
+        .filter(UserMessage.campaign_id == campaign_id)
+        .order_by(UserMessage.user_id)
+    ]
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_deliver_personalised_messages(session, workers):
+    campaign = add_campaign(
+        session, 1, "Hi {{ user.full_name }} at {{ practice.name }}"
+    )
+
+    delivered = CampaignDeliveryService(session).deliver(
+        campaign, datetime.now(timezone.utc), batch_size=1, workers=workers
+    )
+    session.commit()
+
+    assert delivered == 2
+    assert contents(session, 1) == ["Hi User 1 at South", "Hi  at South"]
+
+
+def test_deliver_many_shares_identical_audiences(engine, session):
+    campaigns = [
+        add_campaign(session, 1, "Hi {{ user.username }}"),
+        add_campaign(session, 2, "Plain"),
+        add_campaign(session, 3, "At {{ practice.name }}", practice_id=1),
+    ]
+
+    with QueryCounter(engine) as queries:
+        delivered = CampaignDeliveryService(session).deliver_many(
+            campaigns, datetime.now(timezone.utc), workers=0
+        )
+    session.commit()
+
+    audience_queries = [
+        sql for sql in queries.statements if sql.lstrip().startswith("SELECT users.id")
+    ]
+    assert len(audience_queries) == 2
+    assert delivered == {1: 2, 2: 2, 3: 2}
+    assert contents(session, 1) == ["Hi user1", "Hi user3"]
+    assert contents(session, 2) == ["Plain", "Plain"]
+    assert contents(session, 3) == ["At North", "At North"]
+
+
+def test_render_pool_starts_for_personalised_batches_only(session, monkeypatch):
+    monkeypatch.setattr(delivery, "_pool", None)
+    monkeypatch.setattr(settings, "CAMPAIGN_RENDER_WORKERS", 2)
+    service = CampaignDeliveryService(session)
+    now = datetime.now(timezone.utc)
+
+    service.deliver(add_campaign(session, 1, "Plain"), now, batch_size=1, workers=2)
+    assert delivery._pool is None
+
+    personalised = add_campaign(session, 2, "Hi {{ user.username }}")
+    service.deliver(personalised, now, batch_size=1, workers=2)
+    pool = delivery._pool
+    # A different worker count keeps the running pool rather than replacing it
+    service.deliver(personalised, now, batch_size=1, workers=3)
+    assert pool is not None and delivery._pool is pool
+    assert contents(session, 2) == ["Hi user1", "Hi user1", "Hi user3", "Hi user3"]
+    pool.shutdown()
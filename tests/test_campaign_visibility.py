@@ -0,0 +1,97 @@
+import pytest
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+from authentication.models import User, UserRoles
+from practices.models import Practice, PracticeUserAssignment
+from campaigns.models import Campaign, CampaignPracticeAssociation
+from campaigns.services import CampaignService
+from campaigns.views import CampaignViewSet
+from tests.utils.database import (  # noqa: F401
+    db_session_scope,
+    engine,
+    session_factory,
+)
+
+SUPER_ADMIN = User(id=1, role=UserRoles.SUPER_ADMIN)
+ADMIN = User(id=2, role=UserRoles.ADMIN)
+OTHER_ADMIN = User(id=3, role=UserRoles.ADMIN)
+PRACTICE_USER = User(id=4, role=UserRoles.PRACTICE_USER)
+
+
+@pytest.fixture
+def session(session_factory, db_session_scope, monkeypatch):
+    monkeypatch.setattr("campaigns.views.get_db_session", db_session_scope)
+    session = session_factory()
+    session.add_all(Practice(id=i, name=f"Practice {i}") for i in (1, 2))
+    for user in (SUPER_ADMIN, ADMIN, OTHER_ADMIN, PRACTICE_USER):
+        session.add(
+            User(
+                id=user.id,
+                username=f"user{user.id}",
+                email=f"user{user.id}@example.com",
+                password="x",
+                role=user.role,
+            )
+        )
+    session.add_all(
+        PracticeUserAssignment(user_id=user_id, practice_id=1) for user_id in (2, 4)
+    )
+    session.add(PracticeUserAssignment(user_id=3, practice_id=2))
+    # Every campaign targets practice users of practice 1
+    for campaign_id, campaign_type, created_by in (
+        (10, "DEFAULT", 1),
+        (11, "CUSTOM", 2),
+        (12, "CUSTOM", 3),
+    ):
+        session.add(
+            Campaign(
+                id=campaign_id,
+                name=f"Campaign {campaign_id}",
+                content="Hello",
+                campaign_type=campaign_type,
+                delivery_type="IMMEDIATE",
+                created_by=created_by,
+                target_roles=[UserRoles.PRACTICE_USER],
+                practice_associations=[CampaignPracticeAssociation(practice_id=1)],
+            )
+        )
+    session.commit()
+    yield session
+    session.close()
+
+
+def visible(session, user):
+    service = CampaignService(session)
+    return [
+        campaign_id
+        for campaign_id in (10, 11, 12)
+        if service.get_campaign(campaign_id, user) is not None
+    ]
+
+
+def retrieve(user, pk):
+    view = CampaignViewSet.as_view({"get": "retrieve"})
+    request = APIRequestFactory().get(f"/api/campaign/{pk}/")
+    force_authenticate(request, user=user)
+    return view(request, pk=str(pk))
+
+
+def test_super_admin_sees_every_campaign(session):
+    assert visible(session, SUPER_ADMIN) == [10, 11, 12]
+
+
+def test_admin_sees_default_and_own_custom_campaigns(session):
+    assert visible(session, ADMIN) == [10, 11]
+    assert visible(session, OTHER_ADMIN) == [10, 12]
+
+    assert retrieve(ADMIN, 11).status_code == status.HTTP_200_OK
+    # Another admin's CUSTOM campaign is hidden, even for the admin's practice
+    assert retrieve(ADMIN, 12).status_code == status.HTTP_404_NOT_FOUND
+    assert retrieve(OTHER_ADMIN, 11).status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_practice_users_see_no_campaigns(session):
+    # Practice users receive messages, campaigns themselves stay hidden even
+    # when they target the user's role and practice
+    assert visible(session, PRACTICE_USER) == []
+    assert retrieve(PRACTICE_USER, 10).status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,64 @@
+import json
+import bcrypt
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import RequestFactory
+from authentication import views
+from authentication.models import User, UserRoles
+from authentication.session_store import SessionStore
+from tests.utils.database import (  # noqa: F401
+    db_session_scope,
+    engine,
+    session_factory,
+)
+
+
+@pytest.fixture(autouse=True)
+def seeded(db_session_scope, monkeypatch):
+    monkeypatch.setattr(views, "get_db_session", db_session_scope)
+    with db_session_scope() as session:
+        session.add(
+            User(
+                id=1,
+                username="admin",
+                email="admin@example.com",
+                # Hashed with a higher work factor than configured
+                password=bcrypt.hashpw(b"secret", bcrypt.gensalt(5)).decode(),
+                role=UserRoles.ADMIN,
+                is_approved=True,
+                is_active=True,
+            )
+        )
+    cache.clear()
+
+
+def post_login(username, password):
+    request = RequestFactory().post(
+        "/api/auth/login/",
+        json.dumps({"username": username, "password": password}),
+        content_type="application/json",
+    )
+    request.session = SessionStore()
+    return request, async_to_sync(views.login)(request)
+
+
+def test_login_rehashes_outdated_password(session_factory):
+    request, response = post_login("admin", "secret")
+
+    assert response.status_code == 200
+    assert json.loads(response.content)["username"] == "admin"
+    assert request.session["user_id"] == 1
+
+    user = session_factory().query(User).get(1)
+    assert user.password.startswith("$2b$04$")
+    assert user.check_password("secret")
+    assert user.session_expires_at is not None
+
+
+def test_login_rejects_wrong_password(session_factory):
+    request, response = post_login("admin", "wrong")
+
+    assert response.status_code == 401
+    assert "user_id" not in request.session
+    assert session_factory().query(User).get(1).password.startswith("$2b$05$")
@@ -0,0 +1,66 @@
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import declarative_base
+from rest_framework.exceptions import ValidationError
+from utils.pagination import encode_cursor, decode_cursor, merge_keyset_pages, _after
+
+PaginationBase = declarative_base()
+
+
+class Row(PaginationBase):
+    __tablename__ = "pagination_rows"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50))
+    created_at = Column(DateTime(timezone=True))
+
+
+class TestKeysetCursor:
+    def test_cursor_round_trip(self):
+        created_at = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        cursor = encode_cursor([created_at, 42])
+
+        values = decode_cursor(cursor, [Row.created_at, Row.id])
+
+        assert values == [created_at, 42]
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValidationError):
+            decode_cursor("not-a-cursor", [Row.id])
+
+    def test_cursor_for_other_sort_is_rejected(self):
+        with pytest.raises(ValidationError):
+            decode_cursor(encode_cursor(["a", 1]), [Row.id])
+
+    def test_same_direction_uses_row_value_comparison(self):
+        clause = _after([(Row.created_at, True), (Row.id, True)], [None, 5])
+        sql = str(clause.compile(dialect=postgresql.dialect()))
+
+        assert sql.startswith("(pagination_rows.created_at, pagination_rows.id) <")
+
+    def test_mixed_directions_expand_to_or_chain(self):
+        clause = _after([(Row.name, False), (Row.id, True)], ["b", 5])
+        sql = str(clause.compile(dialect=postgresql.dialect()))
+
+        assert "pagination_rows.name >" in sql
+        assert "pagination_rows.name =" in sql
+        assert "pagination_rows.id <" in sql
+
+
+class TestMergeKeysetPages:
+    def test_merges_scopes_in_sort_order(self):
+        default = ([([5, 5], "d5"), ([2, 2], "d2")], False)
+        custom = ([([4, 4], "c4"), ([3, 3], "c3")], True)
+
+        items, next_cursor = merge_keyset_pages([default, custom], 3, True)
+
+        assert items == ["d5", "c4", "c3"]
+        assert decode_cursor(next_cursor, [Row.id, Row.id]) == [3, 3]
+
+    def test_last_page_has_no_cursor(self):
+        items, next_cursor = merge_keyset_pages([([([1, 1], "a")], False)], 3, True)
+
+        assert items == ["a"]
+        assert next_cursor is None
@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta
+import pytest
+from authentication.models import (
+    RoleChangeRequest,
+    User,
+    UserRegistrationRequest,
+    UserRoles,
+)
+from authentication.serializers import (
+    RoleChangeRequestSerializer,
+    UserRegistrationRequestSerializer,
+)
+from authentication.services import UserRegistrationRequestService
+from practices.models import Practice, PracticeUserAssignment
+from rest_framework.exceptions import ValidationError
+from tests.utils.query_counter import QueryCounter
+from utils.eager_loading import load_plan
+from tests.utils.database import engine, session_factory  # noqa: F401
+
+
+@pytest.fixture
+def session(session_factory):
+    session = session_factory()
+    start = datetime(2026, 1, 1)
+    session.add_all(Practice(id=i, name=f"Practice {i}") for i in (1, 2))
+    for i in range(1, 8):
+        session.add(
+            User(id=i, username=f"user{i}", email=f"user{i}@example.com", password="x")
+        )
+        session.add(
+            UserRegistrationRequest(
+                user_id=i,
+                desired_practice_id=1 + i % 2,
+                requested_role=UserRoles.ADMIN,
+                created_at=start + timedelta(minutes=i),
+            )
+        )
+        session.add(
+            RoleChangeRequest(
+                user_id=i,
+                practice_id=1,
+                current_role=UserRoles.PRACTICE_USER,
+                requested_role=UserRoles.PRACTICE_USER if i % 2 else UserRoles.ADMIN,
+                requested_at=start + timedelta(minutes=i),
+            )
+        )
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_super_admin_queue_pages_in_constant_queries(engine, session):
+    service = UserRegistrationRequestService(session)
+    load = load_plan(UserRegistrationRequestSerializer)
+    seen = []
+    cursor = None
+    while True:
+        session.expunge_all()
+        with QueryCounter(engine) as queries:
+            page = service.get_super_admin_pending_requests(
+                {"limit": 2, "registration_cursor": cursor}, load
+            )
+            data = UserRegistrationRequestSerializer(
+                page["registration_requests"], many=True
+            ).data
+            RoleChangeRequestSerializer(page["role_change_requests"], many=True).data
+        assert queries.count == 2, queries.statements
+        assert all(row["user"]["username"] and row["practice"]["name"] for row in data)
+        seen.extend(row["user_id"] for row in data)
+        cursor = page["registration_next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == list(range(1, 8))
+    assert [r.user_id for r in page["role_change_requests"]] == [2, 4]
+
+
+def test_admin_queue_is_limited_to_the_practice(session):
+    page = UserRegistrationRequestService(session).get_admin_pending_requests(1, {})
+
+    # Practice admins only see practice user requests
+    assert page["registration_requests"] == []
+    assert [r.user_id for r in page["role_change_requests"]] == [1, 3, 5, 7]
+    assert page["role_change_next_cursor"] is None
+
+
+def test_bulk_approval_is_set_based(engine, session):
+    for i in range(8, 508):
+        session.add(
+            User(id=i, username=f"user{i}", email=f"user{i}@example.com", password="x")
+        )
+        session.add(
+            UserRegistrationRequest(
+                user_id=i, desired_practice_id=2, requested_role=UserRoles.PRACTICE_USER
+            )
+        )
+    session.commit()
+    ids = [r.id for r in session.query(UserRegistrationRequest.id).filter_by(user_id=8)]
+    ids = list(range(ids[0], ids[0] + 500))
+    admin = User(id=1, role=UserRoles.ADMIN, assigned_practice_ids=[2])
+
+    with QueryCounter(engine) as queries:
+        approved = UserRegistrationRequestService(session).approve_requests(
+            "registration", ids, admin
+        )
+
+    assert queries.count <= 5, queries.statements
+    assert {r.status for r in approved} == {"APPROVED"}
+    assert session.query(PracticeUserAssignment).filter_by(practice_id=2).count() == 500
+    assert {
+        role for (role,) in session.query(User.role).filter(User.id >= 8)
+    } == {UserRoles.PRACTICE_USER}
+
+
+def test_bulk_review_is_all_or_nothing(session):
+    admin = User(id=1, role=UserRoles.ADMIN, assigned_practice_ids=[1])
+    service = UserRegistrationRequestService(session)
+    in_practice = [r.id for r in session.query(RoleChangeRequest).filter_by(
+        requested_role=UserRoles.PRACTICE_USER
+    )]
+    admin_request = session.query(RoleChangeRequest).filter_by(
+        requested_role=UserRoles.ADMIN
+    ).first()
+
+    with pytest.raises(ValidationError, match=f"not found: {admin_request.id}"):
+        service.reject_requests(
+            "role_change", in_practice + [admin_request.id], admin, "No"
+        )
+    assert {r.status for r in session.query(RoleChangeRequest)} == {"PENDING"}
+
+    service.reject_requests("role_change", in_practice, admin, "No")
+    with pytest.raises(ValidationError, match="already reviewed"):
+        service.approve_requests("role_change", in_practice[:1], admin)
+
+
+def test_bulk_approval_invalidates_every_principal(session, monkeypatch):
+    invalidated = []
+    monkeypatch.setattr(
+        "authentication.services.invalidate_principals",
+        lambda user_ids: invalidated.extend(user_ids),
+    )
+    session.query(UserRegistrationRequest).filter_by(user_id=2).update(
+        {"requested_role": UserRoles.PRACTICE_USER}
+    )
+    session.commit()
+    ids = [
+        r.id
+        for r in session.query(UserRegistrationRequest).filter(
+            UserRegistrationRequest.user_id.in_([1, 2])
+        )
+    ]
+    # Reviewed by a seeded user, reviewed_by references users
+    super_admin = User(id=7, role=UserRoles.SUPER_ADMIN)
+
+    UserRegistrationRequestService(session).approve_requests(
+        "registration", ids, super_admin
+    )
+
+    assert sorted(invalidated) == [1, 2]
+    assert dict(session.query(User.id, User.role).filter(User.id.in_([1, 2]))) == {
+        1: UserRoles.ADMIN,
+        2: UserRoles.PRACTICE_USER,
+    }
@@ -0,0 +1,122 @@
+import threading
+import pytest
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+from authentication.models import User, UserRoles
+from practices import cache as practice_cache
+from practices.models import Practice
+from practices.serializers import PracticeSerializer
+from practices.services import PracticeService
+from practices.views import PracticeViewSet
+from utils.cache import get_version, versioned_key
+from tests.utils.query_counter import QueryCounter
+from tests.utils.database import (  # noqa: F401
+    db_session_scope,
+    engine,
+    session_factory,
+)
+
+
+@pytest.fixture
+def session(session_factory, db_session_scope, monkeypatch):
+    monkeypatch.setattr("practices.views.get_db_session", db_session_scope)
+    cache.clear()
+    practice_cache._local.clear()
+    session = session_factory()
+    session.add_all(Practice(id=i, name=f"Practice {i}") for i in (1, 2))
+    session.commit()
+    yield session
+    session.close()
+    practice_cache._local.clear()
+
+
+def build_from(session, calls):
+    def build():
+        calls.append(1)
+        practices = PracticeService(session).get_all_practices()
+        return [dict(p) for p in PracticeSerializer(practices, many=True).data]
+
+    return build
+
+
+def test_warm_list_does_not_query(engine, session):
+    calls = []
+    data, etag = practice_cache.get_practice_list(False, build_from(session, calls))
+    assert [p["name"] for p in data] == ["Practice 1", "Practice 2"]
+
+    with QueryCounter(engine) as queries:
+        again, again_etag = practice_cache.get_practice_list(
+            False, build_from(session, calls)
+        )
+    assert queries.count == 0
+    assert len(calls) == 1
+    assert (again, again_etag) == (data, etag)
+
+
+def test_practice_changes_invalidate_the_list(session):
+    calls = []
+    _, etag = practice_cache.get_practice_list(False, build_from(session, calls))
+
+    PracticeService(session).create_practice(name="Practice 3")
+    data, new_etag = practice_cache.get_practice_list(
+        False, build_from(session, calls)
+    )
+    assert len(calls) == 2
+    assert new_etag != etag
+    assert "Practice 3" in [p["name"] for p in data]
+
+
+def test_other_workers_reuse_the_shared_entry(session):
+    calls = []
+    _, etag = practice_cache.get_practice_list(False, build_from(session, calls))
+
+    # A fresh worker has nothing in memory yet
+    practice_cache._local.clear()
+    _, shared_etag = practice_cache.get_practice_list(
+        False, build_from(session, calls)
+    )
+    assert len(calls) == 1
+    assert shared_etag == etag
+
+
+def test_concurrent_miss_waits_for_the_rebuilding_worker(session):
+    calls = []
+    key = versioned_key(
+        practice_cache.PRACTICE_LIST_NAMESPACE,
+        get_version(practice_cache.PRACTICE_LIST_NAMESPACE),
+        False,
+    )
+    # Another worker holds the rebuild and stores its result shortly
+    cache.add(f"{key}:lock", True, practice_cache.PRACTICE_LIST_LOCK_TIMEOUT)
+    entry = ([{"id": 1, "name": "Practice 1"}], '"built-elsewhere"')
+    threading.Timer(0.1, cache.set, (key, entry)).start()
+
+    data, etag = practice_cache.get_practice_list(False, build_from(session, calls))
+
+    assert calls == []
+    assert etag == '"built-elsewhere"'
+
+
+def list_practices(**headers):
+    request = APIRequestFactory().get("/api/practices/", **headers)
+    force_authenticate(request, user=User(id=1, role=UserRoles.ADMIN))
+    return PracticeViewSet.as_view({"get": "list"})(request)
+
+
+def test_list_honours_if_none_match(session):
+    response = list_practices()
+    etag = response["ETag"]
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Cache-Control"] == (
+        f"public, max-age={practice_cache.PRACTICE_LIST_MAX_AGE}"
+    )
+
+    # CDNs send lists of tags and weaken them
+    for header in (etag, f'"other", {etag}', f"W/{etag}", "*"):
+        response = list_practices(HTTP_IF_NONE_MATCH=header)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED, header
+        assert response["ETag"] == etag
+
+    response = list_practices(HTTP_IF_NONE_MATCH='"other"')
+    assert response.status_code == status.HTTP_200_OK
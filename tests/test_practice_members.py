@@ -0,0 +1,84 @@
+import pytest
+from authentication.models import User, UserRoles
+from practices.models import Practice, PracticeUserAssignment
+from practices.serializers import PracticeDetailSerializer
+from practices.services import PracticeService
+from practices.views import PracticeViewSet
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+from tests.utils.query_counter import QueryCounter
+from tests.utils.database import (  # noqa: F401
+    db_session_scope,
+    engine,
+    session_factory,
+)
+
+
+@pytest.fixture
+def session(session_factory):
+    session = session_factory()
+    session.add_all(Practice(id=i, name=f"Practice {i}") for i in (1, 2))
+    for i in range(1, 301):
+        session.add(
+            User(
+                id=i,
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="x",
+                role=UserRoles.ADMIN if i % 10 == 0 else UserRoles.PRACTICE_USER,
+                is_active=i % 7 != 0,
+            )
+        )
+        session.add(PracticeUserAssignment(user_id=i, practice_id=1 + i % 2))
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_member_pages_take_one_query_each(engine, session):
+    service = PracticeService(session)
+    practice = service.get_practice(2)
+    seen = []
+    params = {"limit": 40, "role": UserRoles.PRACTICE_USER, "is_active": True}
+    while True:
+        session.expunge_all()
+        with QueryCounter(engine) as queries:
+            members, cursor = service.get_practice_members(2, params)
+            data = PracticeDetailSerializer(
+                practice, context={"members": members}
+            ).data
+        assert queries.count == 1, queries.statements
+        seen.extend(user["id"] for user in data["users"])
+        if not cursor:
+            break
+        params["cursor"] = cursor
+
+    assert seen == [
+        i for i in range(1, 301) if i % 2 and i % 10 and i % 7
+    ]
+
+
+def test_practice_users_are_joined(engine, session):
+    with QueryCounter(engine) as queries:
+        users = PracticeService(session).get_practice_users(1)
+
+    assert queries.count == 1
+    assert [user.id for user in users] == list(range(2, 301, 2))
+
+
+def test_deleting_a_practice_invalidates_its_members(
+    session, db_session_scope, monkeypatch
+):
+    invalidated = []
+    monkeypatch.setattr("practices.views.get_db_session", db_session_scope)
+    monkeypatch.setattr(
+        "practices.views.invalidate_principals",
+        lambda user_ids: invalidated.extend(user_ids),
+    )
+    request = APIRequestFactory().delete("/api/practices/2/")
+    force_authenticate(request, user=User(id=1, role=UserRoles.SUPER_ADMIN))
+
+    response = PracticeViewSet.as_view({"delete": "destroy"})(request, pk="2")
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert sorted(invalidated) == list(range(1, 301, 2))
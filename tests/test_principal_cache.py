@@ -0,0 +1,104 @@
+from datetime import timedelta
+from types import SimpleNamespace
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from authentication import principal
+from authentication.backends import SessionAuthentication
+from authentication.models import User, UserRoles
+from authentication.session_store import REFRESHED_AT_KEY, SessionStore
+from tests.utils.query_counter import QueryCounter
+from tests.utils.database import (  # noqa: F401
+    db_session_scope,
+    engine,
+    session_factory,
+)
+
+
+@pytest.fixture(autouse=True)
+def principal_database(engine, db_session_scope, monkeypatch):
+    # SQLite returns naive datetimes
+    overridden = override_settings(USE_TZ=False)
+    overridden.enable()
+    monkeypatch.setattr(principal, "get_db_session", db_session_scope)
+    with db_session_scope() as session:
+        session.add(
+            User(
+                id=1,
+                username="admin",
+                email="admin@example.com",
+                password="x",
+                role=UserRoles.ADMIN,
+                is_approved=True,
+                is_active=True,
+                session_expires_at=timezone.now() + timedelta(hours=1),
+            )
+        )
+    cache.clear()
+    yield
+    overridden.disable()
+
+
+def make_request():
+    return SimpleNamespace(session={"user_id": 1})
+
+
+def test_warm_principal_needs_no_queries(engine):
+    with QueryCounter(engine) as queries:
+        request = make_request()
+        user, _ = SessionAuthentication().authenticate(request)
+        assert principal.resolve_principal(request) is user
+        assert user.role == UserRoles.ADMIN
+        assert user.assigned_practice_ids == []
+    assert queries.count == 1
+
+    with QueryCounter(engine) as queries:
+        user, _ = SessionAuthentication().authenticate(make_request())
+        assert user.id == 1
+    assert queries.count == 0
+
+
+def test_invalidation_reloads_the_principal(engine):
+    principal.load_principal(1)
+    with engine.begin() as connection:
+        connection.execute(
+            User.__table__.update().values(session_expires_at=None)
+        )
+
+    assert SessionAuthentication().authenticate(make_request()) is not None
+    principal.invalidate_principal(1)
+    assert SessionAuthentication().authenticate(make_request()) is None
+
+
+def test_session_expiry_extension_is_coalesced(engine):
+    user = principal.load_principal(1)
+    with QueryCounter(engine) as queries:
+        principal.extend_session(user)
+    assert queries.count == 1
+
+    with QueryCounter(engine) as queries:
+        principal.extend_session(principal.load_principal(1))
+    assert queries.count == 0
+
+
+def test_unchanged_session_is_written_once_per_threshold(engine):
+    store = SessionStore()
+    store["user_id"] = 1
+    store.save()
+    refreshed_at = store[REFRESHED_AT_KEY]
+
+    with QueryCounter(engine) as queries:
+        reloaded = SessionStore(store.session_key)
+        reloaded["user_id"]
+        reloaded.save()
+    assert queries.count == 0
+    assert cache.get(reloaded.cache_key)[REFRESHED_AT_KEY] == refreshed_at
+
+    # Last written longer ago than the threshold
+    stale = dict(cache.get(store.cache_key), **{REFRESHED_AT_KEY: refreshed_at - 3600})
+    cache.set(store.cache_key, stale)
+    reloaded = SessionStore(store.session_key)
+    reloaded["user_id"]
+    reloaded.save()
+    assert cache.get(reloaded.cache_key)[REFRESHED_AT_KEY] >= refreshed_at
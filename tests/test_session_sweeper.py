@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import text
+from authentication.models import User
+from authentication.sweeper import SessionSweepService
+from tests.utils.database import engine, session_factory  # noqa: F401
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+@pytest.fixture
+def session(session_factory):
+    session = session_factory()
+    session.execute(
+        text(
+            "CREATE TABLE django_session (session_key varchar(40) PRIMARY KEY, "
+            "session_data text, expire_date datetime)"
+        )
+    )
+    for i in range(30):
+        # 25 expired sessions, 5 live ones
+        session.execute(
+            text("INSERT INTO django_session VALUES (:key, '', :expire_date)"),
+            {"key": f"s{i}", "expire_date": NOW + timedelta(minutes=i - 25, seconds=30)},
+        )
+    for i in range(12):
+        session.add(
+            User(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password="x",
+                # 9 expired, 2 live, 1 logged out
+                session_expires_at=NOW + timedelta(hours=i - 10, minutes=30)
+                if i
+                else None,
+            )
+        )
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_sweep_removes_expired_rows_in_batches(session):
+    swept = SessionSweepService(session).sweep(NOW, batch_size=10)
+
+    assert swept == {"sessions_deleted": 25, "expiries_cleared": 9, "batches": 4}
+    assert session.execute(text("SELECT count(*) FROM django_session")).scalar() == 5
+    assert session.query(User).filter(User.session_expires_at.isnot(None)).count() == 2
+
+
+def test_sweep_stops_after_max_batches(session):
+    swept = SessionSweepService(session).sweep(NOW, batch_size=10, max_batches=1)
+
+    assert swept["sessions_deleted"] == 10
+    assert session.execute(text("SELECT count(*) FROM django_session")).scalar() == 20
@@ -7,5 +7,13 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+REQUIRE_SHARED_CACHE = False
+
 DEBUG = False
+BCRYPT_ROUNDS = 4
 CELERY_ALWAYS_EAGER = True
@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+import pytest
+from sqlalchemy.exc import IntegrityError
+from rest_framework.exceptions import ValidationError
+from authentication.models import User, UserRegistrationRequest, UserRoles
+from authentication.services import UserRegistrationRequestService
+from practices.models import Practice
+from tests.utils.query_counter import QueryCounter
+from tests.utils.database import engine, session_factory  # noqa: F401
+
+
+@pytest.fixture
+def session(session_factory):
+    session = session_factory()
+    session.add(Practice(id=1, name="Practice 1"))
+    session.add(User(username="taken", email="taken@example.com", password="x"))
+    session.commit()
+    yield session
+    session.close()
+
+
+def new_user(username="new", email="new@example.com"):
+    return User(username=username, email=email, password="x", is_active=True)
+
+
+def test_signup_checks_once_and_writes_together(engine, session):
+    with QueryCounter(engine) as queries:
+        request = UserRegistrationRequestService(session).register(
+            new_user(), 1, UserRoles.PRACTICE_USER
+        )
+
+    # One check, then the user and the request
+    assert queries.count == 3, queries.statements
+    assert request.user.id and request.status == "PENDING"
+
+
+def test_signup_reports_every_conflict(session):
+    with pytest.raises(ValidationError) as error:
+        UserRegistrationRequestService(session).register(
+            new_user("taken", "taken@example.com"), 2, UserRoles.PRACTICE_USER
+        )
+
+    assert set(error.value.detail) == {"username", "email", "desired_practice_id"}
+    assert session.query(User).count() == 1
+
+
+class UniqueViolation(Exception):
+    """Stands in for psycopg2's error, which names the violated constraint"""
+
+    def __init__(self, constraint_name, message):
+        super().__init__(message)
+        self.diag = SimpleNamespace(constraint_name=constraint_name)
+
+
+@pytest.mark.parametrize(
+    "constraint, field, message",
+    [
+        (
+            "uq_users_username",
+            "username",
+            "Key (username)=(email-practice) already exists.",
+        ),
+        ("uq_users_email", "email", "Key (email)=(x@practice.com) already exists."),
+    ],
+)
+def test_concurrent_duplicate_is_caught_by_the_constraint(
+    session, monkeypatch, constraint, field, message
+):
+    def commit_after_race():
+        # Another signup took the username or email after the check
+        raise IntegrityError(
+            "INSERT INTO users", {}, UniqueViolation(constraint, message)
+        )
+
+    monkeypatch.setattr(session, "commit", commit_after_race)
+
+    with pytest.raises(ValidationError) as error:
+        UserRegistrationRequestService(session).register(
+            new_user(), 1, UserRoles.PRACTICE_USER
+        )
+
+    # The conflicting value in the message does not add other fields
+    assert set(error.value.detail) == {field}
+    monkeypatch.undo()
+    assert session.query(UserRegistrationRequest).count() == 0
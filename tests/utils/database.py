@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from authentication.models import Base
+from tests.utils import sqlite  # noqa: F401 - autoincrementing BigInteger keys
+import usermessages.models  # noqa: F401 - registers user_messages on Base
+
+
+@pytest.fixture
+def engine():
+    """An in-memory SQLite database with every table, one per test"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    # As in tests/conftest.py, which these fixtures do not depend on
+    event.listen(
+        engine,
+        "connect",
+        lambda connection, _: connection.execute("PRAGMA foreign_keys=ON"),
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def session_factory(engine):
+    # Like get_db_session, keep loaded state after commits
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+@pytest.fixture
+def db_session_scope(session_factory):
+    """A stand-in for get_db_session on the test database, to patch into views"""
+
+    @contextmanager
+    def get_db_session():
+        session = session_factory()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    return get_db_session
@@ -1,7 +1,9 @@
+from datetime import datetime, timezone
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from rest_framework.exceptions import ValidationError
 from .models import UserMessage
+from campaigns.analytics import CampaignStatsService, ReadActivityService
 from sqlalchemy.sql import func
 
 
@@ -22,8 +24,15 @@ class MessageService:
         if not message:
             raise ValidationError("Message not found")
 
-        message.is_read = True
-        message.read_at = func.now()
+        if not message.is_read:
+            message.is_read = True
+            message.read_at = datetime.now(timezone.utc)
+            CampaignStatsService(self.db).record_read(
+                message.campaign_id, message.created_at, message.read_at
+            )
+            ReadActivityService(self.db).record_read(
+                message.campaign_id, user_id, message.read_at
+            )
         self.db.commit()
         return message
 
@@ -34,6 +43,7 @@ class MessageService:
 
         message.is_deleted = True
         message.deleted_at = func.now()
+        CampaignStatsService(self.db).record_delete(message.campaign_id)
         self.db.commit()
         return True
 
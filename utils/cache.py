@@ -0,0 +1,68 @@
+import hashlib
+import json
+import time
+from typing import Any
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+# Backends that keep entries in the process writing them
+PROCESS_LOCAL_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def require_shared_cache() -> None:
+    """
+    Refuse to start on a per-process cache: a namespace version bumped by
+    one worker would never reach the others, which would keep serving stale
+    entries until they expire.
+    """
+    if not settings.REQUIRE_SHARED_CACHE:
+        return
+    backend = settings.CACHES["default"]["BACKEND"]
+    if backend in PROCESS_LOCAL_BACKENDS:
+        raise ImproperlyConfigured(
+            f"The default cache ({backend}) is not shared between processes. "
+            "Configure redis.host, or set cache.require_shared to false for "
+            "a single process."
+        )
+
+
+def _version_key(namespace: str) -> str:
+    return f"{namespace}:version"
+
+
+def _fresh_version() -> int:
+    # Seeded from the clock so a version evicted from the cache is never
+    # reissued while entries stored under it may still exist
+    return int(time.time() * 1000)
+
+
+def get_version(namespace: str) -> int:
+    """Current version of a cache namespace"""
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        cache.add(_version_key(namespace), _fresh_version(), None)
+        version = cache.get(_version_key(namespace))
+    return version
+
+
+def bump_version(namespace: str) -> None:
+    """
+    Invalidate every entry of a namespace in O(1): keys embed the version, so
+    entries written under an older one are simply never read again and
+    expire on their own.
+    """
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        cache.set(_version_key(namespace), _fresh_version(), None)
+
+
+def versioned_key(namespace: str, version: int, *parts: Any) -> str:
+    digest = hashlib.md5(
+        json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return f"{namespace}:v{version}:{digest}"
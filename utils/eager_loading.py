@@ -0,0 +1,63 @@
+from typing import Iterable, List, Sequence, Tuple
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+from rest_framework import serializers
+
+
+def load_plan(serializer_class) -> Tuple[str, ...]:
+    """
+    Collect the relationship paths a serializer reads.
+
+    Serializers declare the relationships their method fields touch in an
+    `eager_load` attribute; nested serializer fields contribute their own
+    source plus their plan prefixed with it.
+    """
+    paths = list(getattr(serializer_class, "eager_load", ()))
+
+    for field in serializer_class().fields.values():
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if not isinstance(nested, serializers.BaseSerializer) or field.source == "*":
+            continue
+        paths.append(field.source)
+        paths.extend(f"{field.source}.{path}" for path in load_plan(type(nested)))
+
+    return tuple(dict.fromkeys(paths))
+
+
+def eager_load_options(model, paths: Iterable[str], single: bool = False) -> List:
+    """
+    Translate relationship paths into loader options for a query on `model`.
+
+    Collections are loaded with one batched SELECT ... IN per level and
+    many-to-one relationships are joined, so the number of queries depends
+    on the plan and not on the number of rows. When fetching a single row,
+    `single` joins everything into the one statement instead.
+    """
+    options = []
+    for path in _leaf_paths(paths):
+        option = None
+        mapper = inspect(model)
+        for name in path.split("."):
+            relationship = mapper.relationships[name]
+            attribute = getattr(mapper.class_, name)
+            strategy = (
+                selectinload if relationship.uselist and not single else joinedload
+            )
+            option = (
+                strategy(attribute)
+                if option is None
+                else getattr(option, strategy.__name__)(attribute)
+            )
+            mapper = relationship.mapper
+        options.append(option)
+    return options
+
+
+def _leaf_paths(paths: Iterable[str]) -> Sequence[str]:
+    """Drop paths that are a prefix of a longer one, which already loads them"""
+    paths = set(paths)
+    return sorted(
+        path
+        for path in paths
+        if not any(other.startswith(f"{path}.") for other in paths)
+    )
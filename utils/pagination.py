@@ -0,0 +1,127 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, or_, tuple_, DateTime
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class KeysetQuerySerializer(serializers.Serializer):
+    """Common query parameters of keyset-paginated endpoints"""
+
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(
+        required=False, min_value=1, max_value=MAX_PAGE_SIZE, default=DEFAULT_PAGE_SIZE
+    )
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else value for value in values
+    ]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match the sort order")
+        return [
+            (
+                datetime.fromisoformat(value)
+                if value is not None and isinstance(column.type, DateTime)
+                else value
+            )
+            for value, column in zip(values, columns)
+        ]
+    except (ValueError, TypeError, UnicodeError):
+        raise ValidationError("Invalid pagination cursor")
+
+
+def paginate_keyset(
+    query,
+    order: Sequence[Tuple[Any, bool]],
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    key=None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Apply keyset pagination to a query.
+
+    `order` lists (column, descending) pairs and must end with a unique
+    column so that every row has a distinct position. Rows after the cursor
+    are selected with a row-value predicate that the matching composite
+    index can satisfy, so the cost of a page does not grow with its offset.
+    `key` extracts the sort values from a result row, defaulting to
+    attribute access by column name.
+
+    Returns the page and the cursor of the next page, or None on the last one.
+    """
+    columns = [column for column, _ in order]
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        query = query.filter(_after(order, values))
+
+    query = query.order_by(
+        *[column.desc() if descending else column.asc() for column, descending in order]
+    )
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if key is None:
+            values = [getattr(last, column.key) for column in columns]
+        else:
+            values = key(last)
+        next_cursor = encode_cursor(values)
+    return rows, next_cursor
+
+
+def _after(order: Sequence[Tuple[Any, bool]], values: Sequence[Any]):
+    """(c1, c2) > (v1, v2) when directions agree, else the expanded OR chain"""
+    directions = {descending for _, descending in order}
+    if len(directions) == 1:
+        columns = tuple_(*[column for column, _ in order])
+        values = tuple_(*values)
+        return columns < values if directions.pop() else columns > values
+
+    clauses = []
+    for index, (column, descending) in enumerate(order):
+        equal = [order[i][0] == values[i] for i in range(index)]
+        step = column < values[index] if descending else column > values[index]
+        clauses.append(and_(*equal, step))
+    return or_(*clauses)
+
+
+def merge_keyset_pages(
+    pages: Sequence[Tuple[List[Tuple[Sequence[Any], Any]], bool]],
+    limit: int,
+    descending: bool,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Merge the pages of several disjoint queries that share one sort order.
+
+    Each page is a list of (sort values, item) pairs holding up to `limit`
+    entries after the same cursor, plus whether that query has more rows.
+    The first `limit` entries of the merged order form the combined page.
+    """
+    entries = []
+    has_more = False
+    for page_entries, more in pages:
+        entries.extend(page_entries)
+        has_more = has_more or more
+
+    entries.sort(key=lambda entry: tuple(entry[0]), reverse=descending)
+    page = entries[:limit]
+
+    next_cursor = None
+    if page and (has_more or len(entries) > limit):
+        next_cursor = encode_cursor(page[-1][0])
+    return [item for _, item in page], next_cursor